@@ -0,0 +1,258 @@
+"""
+Throughput and latency benchmarks for the render bridge queue protocol.
+
+Drives RenderBridge and GodotRenderBridge against the fake LocalRenderWorker
+in a temp directory, so the numbers cover only what the protocol costs us
+(job files, result scanning/parsing, wake-ups), not rendering.
+
+Benchmarks:
+    submit      per-job submit_job latency
+    serial      submit + wait_for_result, one job at a time (p50/p95/p99)
+    throughput  N jobs in flight at once, collected with as_completed;
+                per-job completion latency and jobs/second
+    listing     list_pending_jobs / list_completed_jobs with many files present
+                (directory scans, and the SQLite job index for RenderBridge)
+
+Usage:
+    python benchmarks/bench_bridge.py                    # full run, JSON to stdout
+    python benchmarks/bench_bridge.py --quick -o bench.json
+    python benchmarks/bench_bridge.py --only listing --list-files 10000
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from godot_render_bridge import GodotRenderBridge, GodotRenderJob  # noqa: E402
+from render_bridge.bridge import RenderBridge  # noqa: E402
+from render_bridge.index import JobIndex, default_index_path  # noqa: E402
+from render_bridge.job import RenderJob, queue_filename  # noqa: E402
+from render_bridge.watch import inotify_supported  # noqa: E402
+from render_bridge.worker import LocalRenderWorker  # noqa: E402
+
+
+BRIDGES = ("blender", "godot")
+BENCHMARKS = ("submit", "serial", "throughput", "listing")
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Summary statistics (milliseconds) for a list of durations in seconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        index = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[index] * 1000
+
+    return {
+        "count": len(ordered),
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": pct(50),
+        "p95_ms": pct(95),
+        "p99_ms": pct(99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def _make_bridge(kind: str, base_dir: Path, poll_interval: float, use_inotify) -> Any:
+    if kind == "blender":
+        return RenderBridge(base_dir=base_dir, timeout=120, poll_interval=poll_interval, use_inotify=use_inotify)
+    return GodotRenderBridge(base_dir=base_dir, timeout=120, poll_interval=poll_interval, use_inotify=use_inotify)
+
+
+def _job_factory(kind: str, base_dir: Path) -> Callable[[int], Any]:
+    if kind == "blender":
+        blend = base_dir / "bench.blend"
+        blend.write_bytes(b"BLENDER")
+        # output_format="blend" makes the fake worker write no files
+        return lambda i: RenderJob(blend_file=str(blend), output_format="blend", job_id=f"bench{i:06d}")
+
+    def make(i: int) -> GodotRenderJob:
+        job = GodotRenderJob.single_asset("res://bench.glb", "bench", output_width=8, output_height=8)
+        job.job_id = f"bench{i:06d}"
+        return job
+    return make
+
+
+def bench_submit(kind: str, jobs: int) -> Dict[str, Any]:
+    """Latency of submit_job with no consumer running."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        bridge = _make_bridge(kind, base, 0.1, None)
+        make_job = _job_factory(kind, base)
+        samples = []
+        for i in range(jobs):
+            job = make_job(i)
+            start = time.perf_counter()
+            bridge.submit_job(job)
+            samples.append(time.perf_counter() - start)
+    return {"benchmark": "submit", "bridge": kind, "params": {"jobs": jobs}, "metrics": percentiles(samples)}
+
+
+def bench_serial(kind: str, jobs: int, poll_interval: float, use_inotify) -> Dict[str, Any]:
+    """submit + wait_for_result latency, one job at a time."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        bridge = _make_bridge(kind, base, poll_interval, use_inotify)
+        make_job = _job_factory(kind, base)
+        samples = []
+        with LocalRenderWorker(kind=kind, base_dir=base, fake=True, poll_interval=poll_interval):
+            for i in range(jobs):
+                job = make_job(i)
+                start = time.perf_counter()
+                bridge.submit_job(job)
+                bridge.wait_for_result(job.job_id)
+                samples.append(time.perf_counter() - start)
+    return {
+        "benchmark": "serial",
+        "bridge": kind,
+        "params": {"jobs": jobs, "poll_interval": poll_interval, "inotify": bool(use_inotify)},
+        "metrics": percentiles(samples),
+    }
+
+
+def bench_throughput(kind: str, jobs: int, poll_interval: float, use_inotify, max_parallel: int) -> Dict[str, Any]:
+    """Submit jobs all at once and collect them with as_completed."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        bridge = _make_bridge(kind, base, poll_interval, use_inotify)
+        make_job = _job_factory(kind, base)
+        submitted: Dict[str, float] = {}
+        samples = []
+        with LocalRenderWorker(
+            kind=kind, base_dir=base, fake=True, poll_interval=poll_interval, max_parallel=max_parallel
+        ):
+            start = time.perf_counter()
+            for i in range(jobs):
+                job = make_job(i)
+                submitted[job.job_id] = time.perf_counter()
+                bridge.submit_job(job)
+            for result in bridge.as_completed(list(submitted)):
+                samples.append(time.perf_counter() - submitted[result.job_id])
+            elapsed = time.perf_counter() - start
+
+    metrics = percentiles(samples)
+    metrics["elapsed_s"] = elapsed
+    metrics["jobs_per_s"] = jobs / elapsed if elapsed else 0.0
+    return {
+        "benchmark": "throughput",
+        "bridge": kind,
+        "params": {
+            "jobs": jobs,
+            "poll_interval": poll_interval,
+            "inotify": bool(use_inotify),
+            "max_parallel": max_parallel,
+        },
+        "metrics": metrics,
+    }
+
+
+def _populate(kind: str, bridge: Any, files: int, pending: int):
+    """Create `files` result files and `pending` queue entries without going through a consumer."""
+    result_suffix = ".result.json" if kind == "blender" else "_result.json"
+    for i in range(files):
+        (bridge.output_dir / f"done{i:06d}{result_suffix}").write_text("{}")
+    for i in range(pending):
+        (bridge.queue_dir / queue_filename(f"pending{i:06d}")).write_text("{}")
+
+
+def bench_listing(kind: str, files: int, pending: int, repeats: int, use_index: bool = False) -> Dict[str, Any]:
+    """Cost of list_pending_jobs / list_completed_jobs with many files present."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        bridge = _make_bridge(kind, base, 0.1, None)
+        _populate(kind, bridge, files, pending)
+        if use_index:
+            # A new index is populated by one full rescan, then only pending jobs are checked
+            bridge = RenderBridge(base_dir=base, index=JobIndex(default_index_path(base)))
+        metrics = {}
+        for name, expected in (("list_pending_jobs", pending), ("list_completed_jobs", files)):
+            method = getattr(bridge, name)
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                listed = method()
+                samples.append(time.perf_counter() - start)
+            assert len(listed) == expected, (name, len(listed))
+            metrics[name] = percentiles(samples)
+    return {
+        "benchmark": "listing",
+        "bridge": kind,
+        "params": {"files": files, "pending": pending, "repeats": repeats, "index": use_index},
+        "metrics": metrics,
+    }
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    inotify_modes = [False, True] if inotify_supported() else [False]
+
+    results = []
+    for kind in args.bridges:
+        if "submit" in args.only:
+            results.append(bench_submit(kind, args.jobs[-1]))
+        for poll_interval in args.poll_intervals:
+            for use_inotify in inotify_modes:
+                if "serial" in args.only:
+                    results.append(bench_serial(kind, args.serial_jobs, poll_interval, use_inotify))
+                if "throughput" in args.only:
+                    for jobs in args.jobs:
+                        results.append(bench_throughput(kind, jobs, poll_interval, use_inotify, args.max_parallel))
+        if "listing" in args.only:
+            results.append(bench_listing(kind, args.list_files, args.list_pending, args.repeats))
+            if kind == "blender":
+                results.append(bench_listing(kind, args.list_files, args.list_pending, args.repeats, use_index=True))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "inotify": inotify_supported(),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the render bridge queue protocol")
+    parser.add_argument("--bridges", nargs="+", choices=BRIDGES, default=list(BRIDGES))
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--jobs", nargs="+", type=int, default=[10, 100, 1000], help="Throughput job counts")
+    parser.add_argument("--serial-jobs", type=int, default=50)
+    parser.add_argument("--poll-intervals", nargs="+", type=float, default=[0.01, 0.1, 0.5])
+    parser.add_argument("--max-parallel", type=int, default=8)
+    parser.add_argument("--list-files", type=int, default=10_000, help="Completed results present for listing")
+    parser.add_argument("--list-pending", type=int, default=100, help="Queued jobs present for listing")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Small job counts for a fast sanity run")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    if args.quick:
+        args.jobs = [10, 50]
+        args.serial_jobs = 10
+        args.poll_intervals = [0.01, 0.1]
+        args.list_files = 1000
+        args.repeats = 3
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        args.output.write_text(report)
+        print(f"[bench] Wrote {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
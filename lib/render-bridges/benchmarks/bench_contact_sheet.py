@@ -0,0 +1,150 @@
+"""
+Contact sheet benchmarks: Linux-side builder vs the in-Blender pixel loop.
+
+The watcher's contact sheet (render_watcher.ps1) reads each preview's
+float pixels into a Python list and copies them into the sheet one channel
+at a time. That loop is reproduced here on the same float data, without
+bpy, so it can be timed next to render_bridge.contact_sheet on any machine.
+Image loading by Blender is not included in the in-Blender numbers.
+
+Benchmarks:
+    blender_loop   the watcher's per-pixel copy (pixel decode excluded)
+    inline         build_contact_sheet with workers=1
+    pool           build_contact_sheet across a process pool (--workers)
+    gif            build_gif across the same pool
+
+Usage:
+    python benchmarks/bench_contact_sheet.py                  # JSON to stdout
+    python benchmarks/bench_contact_sheet.py --quick -o sheet.json
+    python benchmarks/bench_contact_sheet.py --images 18 --resolution 512 --workers 8
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from PIL import Image  # noqa: E402
+
+from bench_bridge import percentiles  # noqa: E402
+from render_bridge.contact_sheet import build_contact_sheet, build_gif  # noqa: E402
+
+
+BENCHMARKS = ("blender_loop", "inline", "pool", "gif")
+
+
+def _make_images(directory: Path, count: int, resolution: int) -> List[Path]:
+    """Noisy RGBA PNGs, so decode cost is closer to a real render than a flat colour."""
+    paths = []
+    for i in range(count):
+        image = Image.effect_noise((resolution, resolution), 32 + i).convert("RGBA")
+        path = directory / f"angle_{i:02d}.png"
+        image.save(path)
+        paths.append(path)
+    return paths
+
+
+def blender_loop(sources: List[List[float]], res: int):
+    """The watcher's contact sheet copy, minus bpy (see render_watcher.ps1)."""
+    n = len(sources)
+    cols = math.ceil(math.sqrt(n))
+    rows = math.ceil(n / cols)
+    sheet_pixels = [0.0] * (cols * res * rows * res * 4)
+    for i, src_pixels in enumerate(sources):
+        grid_x = i % cols
+        grid_y = rows - 1 - (i // cols)
+        for py in range(res):
+            for px in range(res):
+                src_idx = (py * res + px) * 4
+                dst_x = grid_x * res + px
+                dst_y = grid_y * res + py
+                dst_idx = (dst_y * cols * res + dst_x) * 4
+                for c in range(4):
+                    sheet_pixels[dst_idx + c] = src_pixels[src_idx + c]
+    return sheet_pixels
+
+
+def _time(fn, repeats: int) -> Dict[str, float]:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return percentiles(samples)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        paths = _make_images(base, args.images, args.resolution)
+        labels = [p.stem for p in paths]
+        params = {"images": args.images, "resolution": args.resolution, "repeats": args.repeats}
+
+        if "blender_loop" in args.only:
+            sources = [[v / 255.0 for v in Image.open(p).tobytes()] for p in paths]
+            results.append({
+                "benchmark": "blender_loop", "params": params,
+                "metrics": _time(lambda: blender_loop(sources, args.resolution), args.repeats),
+            })
+        if "inline" in args.only:
+            results.append({
+                "benchmark": "inline", "params": params,
+                "metrics": _time(lambda: build_contact_sheet(paths, labels, workers=1), args.repeats),
+            })
+        if "pool" in args.only:
+            results.append({
+                "benchmark": "pool", "params": dict(params, workers=args.workers),
+                "metrics": _time(lambda: build_contact_sheet(paths, labels, workers=args.workers), args.repeats),
+            })
+        if "gif" in args.only:
+            results.append({
+                "benchmark": "gif", "params": dict(params, workers=args.workers),
+                "metrics": _time(lambda: build_gif(paths, base / "bench.gif", workers=args.workers), args.repeats),
+            })
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark contact sheet / GIF building")
+    parser.add_argument("--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS))
+    parser.add_argument("--images", type=int, default=18, help="Preview angles per sheet")
+    parser.add_argument("--resolution", type=int, default=512)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--quick", action="store_true", help="Small images for a fast sanity run")
+    parser.add_argument("-o", "--output", type=Path, default=None, help="Write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.resolution = 64
+        args.repeats = 1
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        args.output.write_text(report)
+        print(f"[bench] Wrote {args.output}", file=sys.stderr)
+    else:
+        print(report)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
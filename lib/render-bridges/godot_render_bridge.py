@@ -20,6 +20,7 @@ Usage:
     print(f"Render time: {result.render_time_seconds}s")
 """
 
+import hashlib
 import json
 import os
 import time
@@ -27,7 +28,14 @@ import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Iterable, Iterator, Optional, Literal
+
+from render_bridge.cache import RenderCache
+from render_bridge.fileio import atomic_write_text, link_or_copy
+from render_bridge.job import PRIORITY_RANK, queue_filename, parse_queue_filename
+from render_bridge.liveness import GODOT_HEARTBEAT_FILE_NAME, WatcherStatus, watcher_liveness
+from render_bridge.metrics import RenderMetrics
+from render_bridge.watch import ResultWatcher
 
 
 # Project paths
@@ -53,6 +61,38 @@ def _output_dir_for(base_dir: Path) -> Path:
     return base_dir / "temp" / "godot-render-output"
 
 
+# Result files are written by the watcher as <job_id>_result.json
+RESULT_SUFFIX = "_result.json"
+
+# Job types whose output is fully determined by params (incl. seed)
+CACHEABLE_JOB_TYPES = ("biome_showcase", "single_asset")
+# How long a computed project fingerprint is reused before re-walking
+PROJECT_FINGERPRINT_TTL = 5.0
+
+
+def project_fingerprint(project_dir: Path) -> Optional[str]:
+    """
+    Cheap revision fingerprint of a Godot project's assets.
+
+    Combines the newest mtime and the file count, skipping hidden
+    directories such as the .godot/ import cache. Returns None if the
+    project isn't visible from here.
+    """
+    if not project_dir.is_dir():
+        return None
+    newest = 0
+    count = 0
+    for root, dirs, files in os.walk(project_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".")]
+        for name in files:
+            try:
+                newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+            except OSError:
+                continue
+            count += 1
+    return f"{newest}:{count}"
+
+
 @dataclass
 class GodotRenderJob:
     """Configuration for a Godot render job."""
@@ -60,6 +100,10 @@ class GodotRenderJob:
     job_type: Literal["biome_showcase", "single_asset", "animation_capture"]
     created_at: str
     params: dict = field(default_factory=dict)
+    # Scheduling class: "interactive", "normal" or "bulk" (see render_bridge.job)
+    priority: str = "normal"
+    # Set by submit_job; the watcher copies it into the result's timestamps
+    submitted_at: Optional[float] = None
 
     @classmethod
     def biome_showcase(
@@ -77,11 +121,13 @@ class GodotRenderJob:
         hero_enemy: str = "",
         output_width: int = 1024,
         output_height: int = 768,
+        priority: str = "normal",
     ) -> "GodotRenderJob":
         """Create a biome showcase render job."""
         return cls(
             job_id=str(uuid.uuid4())[:8],
             job_type="biome_showcase",
+            priority=priority,
             created_at=datetime.utcnow().isoformat() + "Z",
             params={
                 "biome": biome,
@@ -111,11 +157,13 @@ class GodotRenderJob:
         render_mode: str = "normal",
         output_width: int = 512,
         output_height: int = 512,
+        priority: str = "normal",
     ) -> "GodotRenderJob":
         """Create a single asset render job."""
         return cls(
             job_id=str(uuid.uuid4())[:8],
             job_type="single_asset",
+            priority=priority,
             created_at=datetime.utcnow().isoformat() + "Z",
             params={
                 "asset_path": asset_path,
@@ -138,6 +186,7 @@ class GodotRenderJob:
         output_width: int = 512,
         output_height: int = 512,
         camera: str = "front_34_elevated",
+        priority: str = "normal",
     ) -> "GodotRenderJob":
         """Create an animation capture job.
 
@@ -146,6 +195,7 @@ class GodotRenderJob:
         return cls(
             job_id=str(uuid.uuid4())[:8],
             job_type="animation_capture",
+            priority=priority,
             created_at=datetime.utcnow().isoformat() + "Z",
             params={
                 "asset_path": asset_path,
@@ -167,6 +217,8 @@ class GodotRenderResult:
     render_time_seconds: float = 0.0
     gpu_name: Optional[str] = None
     error: Optional[str] = None
+    # Phase name (see render_bridge.job.PHASES) -> unix timestamp
+    timestamps: dict = field(default_factory=dict)
 
 
 class GodotRenderBridge:
@@ -179,6 +231,11 @@ class GodotRenderBridge:
         base_dir: Optional[Path] = None,
         queue_dir: Optional[Path] = None,
         output_dir: Optional[Path] = None,
+        use_inotify: Optional[bool] = None,
+        cache: Optional[RenderCache] = None,
+        project_dir: Optional[Path] = None,
+        asset_revision: Optional[str] = None,
+        metrics: Optional[RenderMetrics] = None,
     ):
         """
         Initialize the Godot render bridge.
@@ -189,9 +246,18 @@ class GodotRenderBridge:
             base_dir: Optional base directory for queue/output
             queue_dir: Optional override for queue directory
             output_dir: Optional override for output directory
+            use_inotify: Wake on result-file events (None = auto-detect).
+                Polling every poll_interval is kept as a fallback.
+            cache: Opt-in on-disk cache for biome_showcase/single_asset renders
+            project_dir: Godot project used for the cache fingerprint
+                (default: <base_dir>/project)
+            asset_revision: Explicit asset revision (e.g. a git SHA) to key the
+                cache on instead of walking project_dir for mtimes
+            metrics: Optional RenderMetrics fed with each picked-up result
         """
         self.timeout = timeout
         self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
 
         # Ensure directories exist
         resolved_base = _resolve_base_dir(base_dir)
@@ -202,6 +268,80 @@ class GodotRenderBridge:
         self.queue_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # Shared per heartbeat file, so repeated checks hit the TTL cache
+        self.heartbeat_file = resolved_base / "temp" / GODOT_HEARTBEAT_FILE_NAME
+        self.liveness = watcher_liveness(self.heartbeat_file)
+
+        self.cache = cache
+        self.project_dir = Path(project_dir) if project_dir else resolved_base / "project"
+        self.asset_revision = asset_revision
+        self._fingerprint: Optional[str] = None
+        self._fingerprint_at = 0.0
+        self.metrics = metrics
+
+    def _project_fingerprint(self) -> Optional[str]:
+        if self.asset_revision:
+            return self.asset_revision
+        now = time.time()
+        if self._fingerprint is None or now - self._fingerprint_at > PROJECT_FINGERPRINT_TTL:
+            self._fingerprint = project_fingerprint(self.project_dir)
+            self._fingerprint_at = now
+        return self._fingerprint
+
+    def _cache_key(self, job: GodotRenderJob) -> Optional[str]:
+        """Cache key for a job, or None if it can't be cached."""
+        if self.cache is None or job.job_type not in CACHEABLE_JOB_TYPES:
+            return None
+        fingerprint = self._project_fingerprint()
+        if fingerprint is None:
+            return None
+        canonical = json.dumps(
+            {"job_type": job.job_type, "params": job.params, "project": fingerprint},
+            sort_keys=True,
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def _run_job(self, job: GodotRenderJob, timeout: Optional[float] = None) -> GodotRenderResult:
+        """Submit a job and wait for it, serving/storing through the cache if set."""
+        key = self._cache_key(job)
+        if key is not None:
+            entry = self.cache.get(key, count=False)
+            if entry is None:
+                self.cache.record_lookup(False)
+            else:
+                output_file = self.output_dir / f"{job.job_id}.png"
+                try:
+                    link_or_copy(Path(entry["files_dir"]) / "output.png", output_file)
+                except OSError:
+                    self.cache.record_lookup(False)  # evicted underneath us; render normally
+                else:
+                    self.cache.record_lookup(True)
+                    if self.metrics is not None:
+                        self.metrics.count_cache_hit("godot")
+                    return GodotRenderResult(
+                        job_id=job.job_id,
+                        status="success",
+                        output_file=output_file,
+                        render_time_seconds=entry.get("render_time_seconds", 0.0),
+                        gpu_name=entry.get("gpu_name"),
+                    )
+
+        self.submit_job(job)
+        result = self.wait_for_result(job.job_id, timeout)
+
+        if key is not None and result.status == "success" and result.output_file:
+            self.cache.put(
+                key,
+                {"output.png": result.output_file},
+                {"render_time_seconds": result.render_time_seconds, "gpu_name": result.gpu_name},
+            )
+        return result
+
+    def cache_stats(self) -> Optional[dict]:
+        """Hit/miss/eviction counters and on-disk size, or None if caching is off."""
+        return self.cache.stats() if self.cache is not None else None
+
     def submit_job(self, job: GodotRenderJob) -> str:
         """
         Submit a render job to the queue.
@@ -209,23 +349,35 @@ class GodotRenderBridge:
         Returns:
             job_id for tracking
         """
-        job_file = self.queue_dir / f"{job.job_id}.json"
-        with open(job_file, "w") as f:
-            json.dump(asdict(job), f, indent=2)
+        job_file = self.queue_dir / queue_filename(job.job_id, job.priority)
+        job.submitted_at = time.time()
+        atomic_write_text(job_file, json.dumps(asdict(job), indent=2))
         return job.job_id
 
     def is_complete(self, job_id: str) -> bool:
         """Check if a job has completed (success or failure)."""
-        result_file = self.output_dir / f"{job_id}_result.json"
+        result_file = self.output_dir / f"{job_id}{RESULT_SUFFIX}"
         return result_file.exists()
 
+    def _scan_completed(self, job_ids: Iterable[str]) -> list[str]:
+        """Return which of job_ids have a result file, using one directory scan."""
+        wanted = set(job_ids)
+        completed = []
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(RESULT_SUFFIX):
+                    job_id = entry.name[:-len(RESULT_SUFFIX)]
+                    if job_id in wanted:
+                        completed.append(job_id)
+        return completed
+
     def get_result(self, job_id: str) -> Optional[GodotRenderResult]:
         """
         Get the result of a completed job without waiting.
 
         Returns None if job is not yet complete.
         """
-        result_file = self.output_dir / f"{job_id}_result.json"
+        result_file = self.output_dir / f"{job_id}{RESULT_SUFFIX}"
         output_file = self.output_dir / f"{job_id}.png"
 
         if not result_file.exists():
@@ -235,6 +387,8 @@ class GodotRenderBridge:
             with open(result_file) as f:
                 data = json.load(f)
 
+            timestamps = dict(data.get("timestamps") or {})
+            timestamps.setdefault("observed", time.time())
             if data.get("status") == "success" and output_file.exists():
                 return GodotRenderResult(
                     job_id=job_id,
@@ -242,15 +396,18 @@ class GodotRenderBridge:
                     output_file=output_file,
                     render_time_seconds=data.get("render_time_seconds", 0),
                     gpu_name=data.get("gpu_name"),
+                    timestamps=timestamps,
                 )
             else:
                 return GodotRenderResult(
                     job_id=job_id,
                     status="error",
                     error=data.get("error", "Unknown error"),
+                    timestamps=timestamps,
                 )
         except json.JSONDecodeError:
-            # File may be partially written
+            # Results are renamed into place complete; only a watcher that
+            # predates atomic writes leaves a partial file. Retry next poll.
             return None
 
     def wait_for_result(self, job_id: str, timeout: Optional[float] = None) -> GodotRenderResult:
@@ -267,17 +424,78 @@ class GodotRenderBridge:
         timeout = timeout or self.timeout
         start_time = time.time()
 
-        while time.time() - start_time < timeout:
-            result = self.get_result(job_id)
-            if result is not None:
-                return result
-            time.sleep(self.poll_interval)
+        with ResultWatcher(self.output_dir, use_inotify=self.use_inotify) as watcher:
+            while time.time() - start_time < timeout:
+                result = self.get_result(job_id)
+                if result is not None:
+                    self._observe(result)
+                    return result
+                remaining = timeout - (time.time() - start_time)
+                watcher.wait(min(self.poll_interval, remaining))
 
-        return GodotRenderResult(
+        result = GodotRenderResult(
             job_id=job_id,
             status="timeout",
             error=f"Render timed out after {timeout}s",
         )
+        self._observe(result)
+        return result
+
+    def _observe(self, result: GodotRenderResult):
+        if self.metrics is not None:
+            self.metrics.observe("godot", result.status, result.timestamps)
+
+    def as_completed(
+        self, job_ids: Iterable[str], timeout: Optional[float] = None
+    ) -> Iterator[GodotRenderResult]:
+        """
+        Yield results for several jobs in the order they finish.
+
+        Each tick does a single scan of the output directory for all
+        outstanding jobs. When the (shared) timeout expires, a "timeout"
+        result is yielded for every job still outstanding.
+
+        Args:
+            job_ids: The job IDs to wait for
+            timeout: Override default timeout
+        """
+        timeout = timeout or self.timeout
+        pending = set(job_ids)
+        start_time = time.time()
+
+        with ResultWatcher(self.output_dir, use_inotify=self.use_inotify) as watcher:
+            while pending:
+                for job_id in self._scan_completed(pending):
+                    result = self.get_result(job_id)
+                    if result is not None:
+                        pending.discard(job_id)
+                        self._observe(result)
+                        yield result
+
+                remaining = timeout - (time.time() - start_time)
+                if not pending or remaining <= 0:
+                    break
+                watcher.wait(min(self.poll_interval, remaining))
+
+        for job_id in sorted(pending):
+            result = GodotRenderResult(
+                job_id=job_id,
+                status="timeout",
+                error=f"Render timed out after {timeout}s",
+            )
+            self._observe(result)
+            yield result
+
+    def wait_for_many(
+        self, job_ids: Iterable[str], timeout: Optional[float] = None
+    ) -> dict[str, GodotRenderResult]:
+        """
+        Wait for several jobs; total latency is the slowest job, not the sum.
+
+        Returns:
+            Dict of job_id -> GodotRenderResult (status may be "timeout")
+        """
+        return {result.job_id: result for result in self.as_completed(job_ids, timeout)}
 
     def render_biome_showcase(
         self,
@@ -298,6 +516,9 @@ class GodotRenderBridge:
         """
         Render a biome showcase scene with GPU acceleration.
 
+        Served from disk when a cache is configured and an identical job
+        (same params and project fingerprint) has been rendered before.
+
         Args:
             biome: Biome identifier (any string accepted by the project)
             camera: Camera preset (e.g. front, side, overhead, low, wide, closeup)
@@ -316,7 +537,7 @@ class GodotRenderBridge:
         Returns:
             GodotRenderResult with output path
         """
-        job_id = self.submit_biome_showcase(
+        job = GodotRenderJob.biome_showcase(
             biome=biome,
             camera=camera,
             distance=distance,
@@ -331,7 +552,7 @@ class GodotRenderBridge:
             output_width=output_width,
             output_height=output_height,
         )
-        return self.wait_for_result(job_id)
+        return self._run_job(job)
 
     def submit_biome_showcase(
         self,
@@ -383,10 +604,13 @@ class GodotRenderBridge:
         render_mode: str = "normal",
         output_width: int = 512,
         output_height: int = 512,
+        priority: str = "normal",
     ) -> GodotRenderResult:
         """
         Render a single asset with GPU acceleration.
 
+        Served from disk when a cache is configured (see render_biome_showcase).
+
         Args:
             asset_path: Path to asset (e.g., res://assets/blender/...)
             biome: Biome for lighting/ground colors (any string)
@@ -396,11 +620,12 @@ class GodotRenderBridge:
             render_mode: Rendering mode (e.g. normal, clay, matcap)
             output_width: Output image width
             output_height: Output image height
+            priority: Queue scheduling class (interactive, normal, bulk)
 
         Returns:
             GodotRenderResult with output path
         """
-        job_id = self.submit_single_asset(
+        job = GodotRenderJob.single_asset(
             asset_path=asset_path,
             biome=biome,
             camera=camera,
@@ -409,8 +634,9 @@ class GodotRenderBridge:
             render_mode=render_mode,
             output_width=output_width,
             output_height=output_height,
+            priority=priority,
         )
-        return self.wait_for_result(job_id)
+        return self._run_job(job)
 
     def submit_single_asset(
         self,
@@ -422,6 +648,7 @@ class GodotRenderBridge:
         render_mode: str = "normal",
         output_width: int = 512,
         output_height: int = 512,
+        priority: str = "normal",
     ) -> str:
         """
         Submit a single asset render job without waiting.
@@ -438,21 +665,23 @@ class GodotRenderBridge:
             render_mode=render_mode,
             output_width=output_width,
             output_height=output_height,
+            priority=priority,
         )
         self.submit_job(job)
         return job.job_id
 
+    def watcher_status(self, refresh: bool = False) -> WatcherStatus:
+        """Cached heartbeat status of the Windows watcher (alive, free slots, GPU)."""
+        return self.liveness.status(refresh=refresh)
+
     def is_watcher_running(self) -> bool:
         """Check if the Windows watcher appears to be running."""
-        heartbeat = self.base_dir / "temp" / "godot-watcher-heartbeat"
-        if heartbeat.exists():
-            age = time.time() - heartbeat.stat().st_mtime
-            return age < 10  # Heartbeat within last 10 seconds
-        return False
+        return self.watcher_status().alive
 
     def cleanup_job(self, job_id: str) -> None:
         """Remove job files after processing."""
-        for pattern in [f"{job_id}.json", f"{job_id}_result.json", f"{job_id}.png"]:
+        queue_files = [queue_filename(job_id, priority) for priority in PRIORITY_RANK]
+        for pattern in queue_files + [f"{job_id}{RESULT_SUFFIX}", f"{job_id}.png"]:
             for directory in [self.queue_dir, self.output_dir]:
                 file = directory / pattern
                 if file.exists():
@@ -460,11 +689,12 @@ class GodotRenderBridge:
 
     def list_pending_jobs(self) -> list[str]:
         """List job IDs in the queue."""
-        return [f.stem for f in self.queue_dir.glob("*.json")]
+        parsed = (parse_queue_filename(f.name) for f in self.queue_dir.glob("*.json"))
+        return [p[0] for p in parsed if p]
 
     def list_completed_jobs(self) -> list[str]:
         """List completed job IDs."""
-        return [f.stem.replace("_result", "") for f in self.output_dir.glob("*_result.json")]
+        return [f.name[:-len(RESULT_SUFFIX)] for f in self.output_dir.glob(f"*{RESULT_SUFFIX}")]
 
 
 # CLI for testing
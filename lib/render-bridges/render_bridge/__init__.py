@@ -1,4 +1,6 @@
 from .bridge import RenderBridge
-from .job import RenderJob, RenderResult
+from .aio import AsyncRenderBridge
+from .batch import BatchHandle
+from .job import RenderJob, RenderResult, RenderBatch
 
-__all__ = ["RenderBridge", "RenderJob", "RenderResult"]
+__all__ = ["RenderBridge", "AsyncRenderBridge", "BatchHandle", "RenderJob", "RenderResult", "RenderBatch"]
@@ -0,0 +1,186 @@
+"""
+AsyncRenderBridge - asyncio front-end for the render bridges.
+
+All in-flight jobs share one watcher task per bridge: it scans the output
+directory once per tick (woken early by inotify when available) and
+resolves every waiter whose result has landed. Thousands of pending jobs
+cost one task and no threads.
+
+Usage:
+    bridge = AsyncRenderBridge()
+    job_id = await bridge.submit(RenderJob(blend_file="/path/to/asset.blend"))
+    result = await bridge.wait_for_result(job_id)
+
+    async for result in bridge.as_completed(job_ids):
+        print(result.job_id, result.status)
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from .bridge import RenderBridge
+from .job import RenderResult, JobStatus
+from .watch import ResultWatcher
+
+
+class AsyncRenderBridge:
+    """Awaitable submit/wait over a RenderBridge or GodotRenderBridge.
+
+    Args:
+        bridge: The synchronous bridge that owns the queue/output directories.
+            Defaults to a new RenderBridge built from ``bridge_kwargs``.
+    """
+
+    def __init__(self, bridge: Optional[Any] = None, **bridge_kwargs):
+        self.bridge = bridge if bridge is not None else RenderBridge(**bridge_kwargs)
+        self._waiters: Dict[str, List[Callable[[Any], None]]] = {}
+        self._watch_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def submit(self, job) -> str:
+        """Submit a job without blocking the event loop.
+
+        Returns:
+            The job ID for tracking.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.bridge.submit_job, job)
+
+    async def wait_for_result(self, job_id: str, timeout: Optional[float] = None):
+        """Wait for a job to complete and return the result.
+
+        Raises:
+            TimeoutError: If the job doesn't complete within the timeout.
+            RuntimeError: If a Blender job failed.
+            Exception: Whatever stopped the shared watcher task.
+        """
+        timeout = timeout or self.bridge.timeout
+        future = asyncio.get_running_loop().create_future()
+
+        def resolve(result):
+            if future.done():
+                return
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        self._add_waiter(job_id, resolve)
+        try:
+            result = await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TimeoutError(f"Render job {job_id} timed out after {timeout}s") from None
+        finally:
+            self._remove_waiter(job_id, resolve)
+
+        if isinstance(result, RenderResult) and result.status == JobStatus.FAILED.value:
+            raise RuntimeError(f"Render job {job_id} failed: {result.error_message}")
+        return result
+
+    async def as_completed(
+        self, job_ids: Iterable[str], timeout: Optional[float] = None
+    ) -> AsyncIterator[Any]:
+        """Yield results for several jobs in the order they finish.
+
+        Failed jobs are yielded like any other result.
+
+        Raises:
+            TimeoutError: If some jobs haven't completed within the timeout.
+            Exception: Whatever stopped the shared watcher task.
+        """
+        timeout = timeout or self.bridge.timeout
+        job_ids = list(job_ids)
+        pending = set(job_ids)
+        queue: asyncio.Queue = asyncio.Queue()
+        deadline = time.monotonic() + timeout
+
+        for job_id in pending:
+            self._add_waiter(job_id, queue.put_nowait)
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                try:
+                    result = await asyncio.wait_for(queue.get(), max(remaining, 0))
+                except asyncio.TimeoutError:
+                    raise TimeoutError(
+                        f"{len(pending)} render jobs timed out after {timeout}s: {sorted(pending)}"
+                    ) from None
+                if isinstance(result, BaseException):
+                    raise result
+                pending.discard(result.job_id)
+                yield result
+        finally:
+            for job_id in job_ids:
+                self._remove_waiter(job_id, queue.put_nowait)
+
+    async def render(self, job, timeout: Optional[float] = None):
+        """Submit a job and wait for its result."""
+        job_id = await self.submit(job)
+        return await self.wait_for_result(job_id, timeout)
+
+    # Watcher task
+
+    # Waiter callbacks get the job's result, or the exception that killed
+    # the watcher task
+
+    def _add_waiter(self, job_id: str, callback: Callable[[Any], None]):
+        self._waiters.setdefault(job_id, []).append(callback)
+        if self._watch_task is None or self._watch_task.done():
+            self._wakeup = asyncio.Event()
+            self._watch_task = asyncio.get_running_loop().create_task(self._watch())
+        else:
+            self._wakeup.set()
+
+    def _remove_waiter(self, job_id: str, callback: Callable[[Any], None]):
+        callbacks = self._waiters.get(job_id)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+            if not callbacks:
+                del self._waiters[job_id]
+
+    def _collect(self, job_ids: List[str]) -> Dict[str, Any]:
+        """Scan once and read every result that has landed (runs in executor)."""
+        results = {}
+        for job_id in self.bridge._scan_completed(job_ids):
+            result = self.bridge.get_result(job_id)
+            if result is not None:
+                results[job_id] = result
+        return results
+
+    async def _watch(self):
+        loop = asyncio.get_running_loop()
+        watcher = ResultWatcher(self.bridge.output_dir, use_inotify=self.bridge.use_inotify)
+        wakeup = self._wakeup
+
+        def on_event():
+            watcher.read_events()
+            wakeup.set()
+
+        if watcher.event_driven:
+            loop.add_reader(watcher.fileno(), on_event)
+        try:
+            while self._waiters:
+                wakeup.clear()
+                results = await loop.run_in_executor(None, self._collect, list(self._waiters))
+                for job_id, result in results.items():
+                    for callback in self._waiters.pop(job_id, []):
+                        callback(result)
+                if not self._waiters:
+                    break
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.bridge.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        except Exception as exc:
+            # Fail every waiter now instead of leaving it to its timeout; the
+            # next _add_waiter starts a fresh task
+            waiters, self._waiters = self._waiters, {}
+            self._watch_task = None
+            for callbacks in waiters.values():
+                for callback in callbacks:
+                    callback(exc)
+        finally:
+            if watcher.event_driven:
+                loop.remove_reader(watcher.fileno())
+            watcher.close()
@@ -0,0 +1,89 @@
+"""
+BatchHandle - track a batch of jobs submitted with RenderBridge.submit_batch.
+"""
+
+from typing import Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING
+
+from .job import RenderResult
+
+if TYPE_CHECKING:
+    from .bridge import RenderBridge
+
+
+class BatchHandle:
+    """Aggregate progress and per-job results for a submitted batch."""
+
+    def __init__(self, bridge: "RenderBridge", batch_id: str, job_ids: List[str]):
+        self.bridge = bridge
+        self.batch_id = batch_id
+        self.job_ids = list(job_ids)
+        self._results: Dict[str, RenderResult] = {}
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    def __repr__(self) -> str:
+        done, total = self.progress()
+        return f"BatchHandle({self.batch_id!r}, {done}/{total} complete)"
+
+    def completed_jobs(self) -> List[str]:
+        """Job IDs whose result file has landed (one directory scan)."""
+        outstanding = [job_id for job_id in self.job_ids if job_id not in self._results]
+        landed = set(self._results)
+        if outstanding:
+            landed.update(self.bridge._scan_completed(outstanding))
+        return [job_id for job_id in self.job_ids if job_id in landed]
+
+    def progress(self) -> Tuple[int, int]:
+        """Return (completed, total) job counts."""
+        return len(self.completed_jobs()), len(self.job_ids)
+
+    def is_complete(self) -> bool:
+        done, total = self.progress()
+        return done == total
+
+    def results(self) -> Dict[str, RenderResult]:
+        """Results for the jobs that have completed so far, keyed by job ID."""
+        for job_id in self.completed_jobs():
+            if job_id not in self._results:
+                result = self.bridge.get_result(job_id)
+                if result is not None:
+                    self._results[job_id] = result
+        return dict(self._results)
+
+    def failed(self) -> List[RenderResult]:
+        """Completed results whose status is failed."""
+        return [result for result in self.results().values() if not result.success]
+
+    def as_completed(self, timeout: Optional[float] = None) -> Iterator[RenderResult]:
+        """Yield each job's result as it lands (already-seen results first)."""
+        for result in list(self._results.values()):
+            yield result
+        outstanding = [job_id for job_id in self.job_ids if job_id not in self._results]
+        for result in self.bridge.as_completed(outstanding, timeout):
+            self._results[result.job_id] = result
+            yield result
+
+    def wait(self, timeout: Optional[float] = None) -> Dict[str, RenderResult]:
+        """Wait for every job in the batch.
+
+        Raises:
+            TimeoutError: If some jobs haven't completed within the timeout.
+        """
+        for _ in self.as_completed(timeout):
+            pass
+        return dict(self._results)
+
+    def cleanup(self):
+        """Remove job files for every job in the batch.
+
+        A manifest the watcher hasn't expanded yet is removed too, so
+        abandoned jobs are never rendered.
+        """
+        manifest = self.bridge.queue_dir / f"{self.batch_id}.batch"
+        try:
+            manifest.unlink()
+        except FileNotFoundError:
+            pass
+        for job_id in self.job_ids:
+            self.bridge.cleanup_job(job_id)
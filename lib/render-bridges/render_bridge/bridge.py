@@ -3,15 +3,31 @@ RenderBridge - Submit and await render jobs from the Linux container.
 """
 
 import os
-import re
+import sys
 import json
 import time
 import shutil
+import threading
 from pathlib import Path
-from typing import Optional, List, Union, Dict, Any
+from typing import Optional, List, Union, Dict, Any, Callable, Iterable, Iterator, Tuple
 
-from .job import RenderJob, RenderResult, JobStatus
-from .diagnostics import DIAGNOSTIC_SCRIPT
+from .job import (
+    RenderJob, RenderResult, RenderBatch, JobStatus, JobPriority, OutputFormat,
+    PHASES, PRIORITY_RANK, queue_filename, parse_queue_filename,
+)
+from .batch import BatchHandle
+from .cache import RenderCache
+from .coalesce import InflightRegistry, INFLIGHT_DIR_NAME
+from . import events as ev
+from .events import EventBus
+from .index import JobIndex
+from .liveness import HEARTBEAT_FILE_NAME, WatcherStatus, watcher_liveness
+from .metrics import RenderMetrics
+from .diagnostics import (
+    DIAGNOSTIC_SCRIPT, DIAGNOSTICS_DIR_NAME, DIAGNOSTICS_FILE_NAME,
+    diagnostics_key, empty_diagnostics, parse_diagnostics_log, read_log_tail,
+)
+from .watch import ResultWatcher
 
 
 # Paths that work in both container and Windows
@@ -41,6 +57,15 @@ def _output_dir_for(base_dir: Path) -> Path:
 QUEUE_DIR = _queue_dir_for(DEFAULT_BASE_DIR)
 OUTPUT_DIR = _output_dir_for(DEFAULT_BASE_DIR)
 
+# Result files are written by the watcher as <job_id>.result.json
+RESULT_SUFFIX = ".result.json"
+# Batch manifests are expanded into <job_id>.json files by the watcher
+BATCH_SUFFIX = ".batch"
+# sync_index stats pending jobs individually up to this many
+SYNC_STAT_LIMIT = 512
+# Share of a chunked animation's timeout spent looking up its frame range
+FRAME_RANGE_TIMEOUT_SHARE = 0.25
+
 
 class RenderBridge:
     """Bridge for submitting render jobs to the Windows host."""
@@ -51,17 +76,52 @@ class RenderBridge:
         queue_dir: Optional[Path] = None,
         output_dir: Optional[Path] = None,
         timeout: float = 300.0,
-        poll_interval: float = 1.0
+        poll_interval: float = 1.0,
+        use_inotify: Optional[bool] = None,
+        cache: Optional[RenderCache] = None,
+        coalesce: bool = False,
+        index: Optional[JobIndex] = None,
+        metrics: Optional[RenderMetrics] = None,
+        events: Optional[EventBus] = None
     ):
         resolved_base = _resolve_base_dir(base_dir)
         self.queue_dir = Path(queue_dir) if queue_dir else _queue_dir_for(resolved_base)
         self.output_dir = Path(output_dir) if output_dir else _output_dir_for(resolved_base)
         self.timeout = timeout
         self.poll_interval = poll_interval
+        # None = auto-detect; inotify wakes waiters early, polling stays as fallback
+        self.use_inotify = use_inotify
+        # Optional content-addressed output cache used by the render_* helpers
+        self.cache = cache
         
         # Ensure directories exist
         self.queue_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Single-flight: identical concurrent jobs (any thread/process sharing
+        # the queue) attach to the one already in flight
+        self.inflight = (
+            InflightRegistry(self.queue_dir / INFLIGHT_DIR_NAME, stale_after=timeout)
+            if coalesce else None
+        )
+        self._inflight_refs: Dict[str, List[str]] = {}
+        self._inflight_lock = threading.Lock()
+        
+        # Optional persistent job index; replaces directory scans in the
+        # list_* methods and cleanup_older_than
+        self.index = index
+        if index is not None and index.created:
+            self.rebuild_index()
+        
+        # Optional job counters / phase histograms, fed when results are picked up
+        self.metrics = metrics
+        # Structured events (submit, complete, timeout, ...); see render_bridge.events
+        self.events = events if events is not None else EventBus()
+        
+        # The watcher's heartbeat sits next to the queue; status is TTL-cached
+        # and shared with every other bridge on the same queue
+        self.heartbeat_file = self.queue_dir.parent / HEARTBEAT_FILE_NAME
+        self.liveness = watcher_liveness(self.heartbeat_file)
     
     def submit_job(self, job: RenderJob) -> str:
         """Submit a render job to the queue.
@@ -69,60 +129,84 @@ class RenderBridge:
         Returns:
             The job ID for tracking.
         """
-        job_file = self.queue_dir / f"{job.job_id}.json"
+        job_file = self.queue_dir / queue_filename(job.job_id, job.priority)
+        job.submitted_at = time.time()
         job.save(job_file)
-        print(f"[RenderBridge] Submitted job {job.job_id}")
+        if self.index is not None:
+            self.index.record_submit([(job.job_id, job.priority)])
+        self.events.emit(ev.SUBMIT, job.job_id, priority=job.priority)
         return job.job_id
     
+    def submit_batch(self, jobs: List[RenderJob], batch_id: Optional[str] = None) -> BatchHandle:
+        """Submit many jobs as a single atomically written batch manifest.
+        
+        The watcher expands ``{batch_id}.batch`` into individual job files on
+        its side of the mount, so N jobs cost one cross-mount write.
+        
+        Returns:
+            A BatchHandle for tracking progress and collecting results.
+        """
+        batch = RenderBatch(jobs=list(jobs))
+        if batch_id:
+            batch.batch_id = batch_id
+        for job in batch.jobs:
+            job.submitted_at = batch.created_at
+        batch.save(self.queue_dir / f"{batch.batch_id}{BATCH_SUFFIX}")
+        if self.index is not None:
+            self.index.record_submit([(job.job_id, job.priority) for job in batch.jobs])
+        self.events.emit(ev.SUBMIT_BATCH, batch_id=batch.batch_id, jobs=len(batch.jobs))
+        return BatchHandle(self, batch.batch_id, batch.job_ids)
+    
     def is_complete(self, job_id: str) -> bool:
         """Check if a job has completed (success or failure)."""
-        result_file = self.output_dir / f"{job_id}.result.json"
+        result_file = self.output_dir / f"{job_id}{RESULT_SUFFIX}"
         return result_file.exists()
     
-    def get_result(self, job_id: str, max_retries: int = 5, retry_delay: float = 0.2) -> Optional[RenderResult]:
-        """Get the result of a completed job.
+    def _scan_completed(self, job_ids: Iterable[str]) -> List[str]:
+        """Return which of job_ids have a result file, using one directory scan."""
+        wanted = set(job_ids)
+        completed = []
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(RESULT_SUFFIX):
+                    job_id = entry.name[:-len(RESULT_SUFFIX)]
+                    if job_id in wanted:
+                        completed.append(job_id)
+        return completed
+    
+    def get_result(self, job_id: str) -> Optional[RenderResult]:
+        """Get the result of a completed job, or None if it isn't available.
 
-        Handles race condition where file exists but isn't fully written yet.
+        Result files are written to a temp file and renamed into place, so
+        an existing result is always complete; no retry/sleep is needed.
         """
-        result_file = self.output_dir / f"{job_id}.result.json"
-        if not result_file.exists():
+        result_file = self.output_dir / f"{job_id}{RESULT_SUFFIX}"
+        try:
+            content = result_file.read_text(encoding='utf-8-sig')
+        except FileNotFoundError:
             return None
 
-        # Retry loop to handle race condition with file writing
-        for attempt in range(max_retries):
-            try:
-                # Check file has content
-                if result_file.stat().st_size == 0:
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
-                        continue
-                    return None
-
-                content = result_file.read_text(encoding='utf-8-sig')
-                if not content.strip():
-                    if attempt < max_retries - 1:
-                        time.sleep(retry_delay)
-                        continue
-                    return None
-
-                return RenderResult.from_json(content)
-            except json.JSONDecodeError:
-                # File may be partially written
-                if attempt < max_retries - 1:
-                    time.sleep(retry_delay)
-                    continue
-                # Final attempt failed - log and return None
-                print(f"[RenderBridge] Warning: Could not parse result for {job_id} after {max_retries} attempts")
-                return None
-            except Exception as e:
-                print(f"[RenderBridge] Error reading result for {job_id}: {e}")
-                return None
-
-        return None
+        try:
+            result = RenderResult.from_json(content)
+        except json.JSONDecodeError:
+            # Only a watcher predating atomic writes can leave a partial
+            # file; report "not ready" and let the next poll re-read it.
+            self.events.emit(ev.RETRY, job_id)
+            return None
+        except Exception as e:
+            if not self.events.emit(ev.ERROR, job_id, error=str(e)):
+                print(f"[RenderBridge] Error reading result for {job_id}: {e}", file=sys.stderr)
+            return None
+        result.timestamps.setdefault("observed", time.time())
+        return result
     
     def wait_for_result(self, job_id: str, timeout: Optional[float] = None) -> RenderResult:
         """Wait for a job to complete and return the result.
         
+        Wakes as soon as the result file is created in output_dir (inotify
+        on Linux). Every poll_interval the result is re-checked regardless,
+        for bind mounts that don't deliver filesystem events.
+        
         Raises:
             TimeoutError: If the job doesn't complete within the timeout.
             RuntimeError: If the job failed.
@@ -130,18 +214,275 @@ class RenderBridge:
         timeout = timeout or self.timeout
         start = time.time()
         
-        while True:
-            if self.is_complete(job_id):
+        with ResultWatcher(self.output_dir, use_inotify=self.use_inotify) as watcher:
+            while True:
+                # None also covers a partial file from a pre-atomic watcher
                 result = self.get_result(job_id)
-                if result and result.status == JobStatus.FAILED.value:
-                    raise RuntimeError(f"Render job {job_id} failed: {result.error_message}")
-                return result
-            
-            elapsed = time.time() - start
-            if elapsed > timeout:
-                raise TimeoutError(f"Render job {job_id} timed out after {timeout}s")
-            
-            time.sleep(self.poll_interval)
+                if result is not None:
+                    self._observe(result)
+                    if result.status == JobStatus.FAILED.value:
+                        raise RuntimeError(f"Render job {job_id} failed: {result.error_message}")
+                    return result
+                
+                elapsed = time.time() - start
+                if elapsed > timeout:
+                    self._observe_timeout([job_id])
+                    raise TimeoutError(f"Render job {job_id} timed out after {timeout}s")
+                
+                watcher.wait(min(self.poll_interval, timeout - elapsed))
+    
+    def as_completed(self, job_ids: Iterable[str], timeout: Optional[float] = None) -> Iterator[RenderResult]:
+        """Yield results for several jobs in the order they finish.
+        
+        Each tick does a single scan of output_dir for all outstanding jobs
+        instead of one stat loop per job. Failed jobs are yielded like any
+        other result; check ``result.success``.
+        
+        Raises:
+            TimeoutError: If some jobs haven't completed within the timeout
+                (shared by all jobs, not per job).
+        """
+        timeout = timeout or self.timeout
+        pending = set(job_ids)
+        start = time.time()
+        
+        with ResultWatcher(self.output_dir, use_inotify=self.use_inotify) as watcher:
+            while pending:
+                for job_id in self._scan_completed(pending):
+                    result = self.get_result(job_id)
+                    if result is None:
+                        continue  # unreadable for now, picked up next tick
+                    pending.discard(job_id)
+                    self._observe(result)
+                    yield result
+                
+                if not pending:
+                    return
+                
+                elapsed = time.time() - start
+                if elapsed > timeout:
+                    self._observe_timeout(pending)
+                    raise TimeoutError(
+                        f"{len(pending)} render jobs timed out after {timeout}s: {sorted(pending)}"
+                    )
+                
+                watcher.wait(min(self.poll_interval, timeout - elapsed))
+    
+    def wait_for_many(self, job_ids: Iterable[str], timeout: Optional[float] = None) -> Dict[str, RenderResult]:
+        """Wait for several jobs and return their results keyed by job ID.
+        
+        Total latency is that of the slowest job, not the sum. Failed jobs
+        are returned rather than raised; check ``result.success``.
+        
+        Raises:
+            TimeoutError: If some jobs haven't completed within the timeout.
+        """
+        return {result.job_id: result for result in self.as_completed(job_ids, timeout)}
+    
+    def _observe(self, result: RenderResult):
+        if self.metrics is not None:
+            self.metrics.observe("blender", result.status, result.timestamps)
+        if self.events.wants(ev.COMPLETE):
+            self.events.emit(
+                ev.COMPLETE, result.job_id, status=result.status,
+                render_time_seconds=result.render_time_seconds, timestamps=result.timestamps,
+            )
+    
+    def _observe_timeout(self, job_ids: Iterable[str]):
+        for job_id in job_ids:
+            if self.metrics is not None:
+                self.metrics.observe("blender", "timeout")
+            self.events.emit(ev.TIMEOUT, job_id)
+    
+    def _run_job(self, job: RenderJob, timeout: Optional[float] = None, chunks: int = 1) -> RenderResult:
+        """Submit a job and wait for it, serving/storing through the cache if set.
+        
+        Animation jobs with chunks > 1 are split into parallel sub-jobs (see
+        _run_chunked); they bypass coalescing.
+        """
+        if self.cache is not None:
+            cached = self.cache.lookup(job, self.output_dir)
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.count_cache_hit("blender")
+                self.events.emit(ev.CACHE_HIT, job.job_id)
+                return cached
+        
+        if chunks > 1 and job.render_animation:
+            result = self._run_chunked(job, chunks, timeout)
+        elif self.inflight is not None:
+            result = self._run_coalesced(job, timeout)
+        else:
+            self.submit_job(job)
+            result = self.wait_for_result(job.job_id, timeout)
+        
+        if self.cache is not None and result is not None:
+            self.cache.store(job, result, self.output_dir)
+        return result
+    
+    def _run_chunked(self, job: RenderJob, chunks: int, timeout: Optional[float] = None) -> RenderResult:
+        """Render an animation as angle x frame-chunk sub-jobs submitted as one batch.
+        
+        The sub-jobs' frames are moved into this job's ``frames_{angle}/``
+        directories and a merged result is written under job.job_id, so the
+        caller sees the same layout as an unchunked render.
+        
+        Sub-job files are removed whatever happens; on a timeout a failed
+        result is written under job.job_id before re-raising.
+        
+        Raises:
+            TimeoutError: If some sub-jobs haven't completed within the timeout.
+            RuntimeError: If any sub-job failed.
+        """
+        timeout = timeout or self.timeout
+        started = time.time()
+        frame_range = self._animation_frame_range(job, timeout)
+        if frame_range is None:
+            # Range unknown (watcher can't run diagnostics): one job as before
+            self.submit_job(job)
+            return self.wait_for_result(job.job_id, timeout - (time.time() - started))
+        
+        sub_jobs = job.split_frames(frame_range[0], frame_range[1], chunks)
+        handle = self.submit_batch(sub_jobs)
+        try:
+            try:
+                results = handle.wait(max(timeout - (time.time() - started), 0.0))
+            except TimeoutError as exc:
+                self._save_chunked_result(job, RenderResult(
+                    job_id=job.job_id, status=JobStatus.FAILED.value, error_message=str(exc)
+                ), started)
+                raise
+            result = self._merge_chunks(job, sub_jobs, results)
+        finally:
+            handle.cleanup()
+        self._save_chunked_result(job, result, started)
+        
+        if not result.success:
+            raise RuntimeError(f"Render job {job.job_id} failed: {result.error_message}")
+        return result
+    
+    def _save_chunked_result(self, job: RenderJob, result: RenderResult, started: float):
+        result.render_time_seconds = time.time() - started
+        result.save(self.output_dir / f"{job.job_id}{RESULT_SUFFIX}")
+        if self.index is not None:
+            self.index.record_complete([(job.job_id, time.time())])
+    
+    def _animation_frame_range(self, job: RenderJob, timeout: float) -> Optional[tuple]:
+        """(frame_start, frame_end) the watcher would render, or None if unknown.
+        
+        Missing bounds come from the action's frame range as reported by
+        diagnose_blend (cached per file contents when a cache is set),
+        resolved the same way as the watcher's animation script. The
+        diagnostic gets at most FRAME_RANGE_TIMEOUT_SHARE of the timeout;
+        if it fails or times out the range is unknown.
+        """
+        if job.frame_start is not None and job.frame_end is not None:
+            return job.frame_start, job.frame_end
+        
+        try:
+            diagnostics = self.diagnose_blend(job.blend_file, timeout * FRAME_RANGE_TIMEOUT_SHARE)
+        except (RuntimeError, TimeoutError):
+            return None
+        if not diagnostics.get("armatures") and not diagnostics.get("meshes"):
+            return None  # the file was never read
+        actions = {action["name"]: action for action in diagnostics.get("actions", [])}
+        armatures = diagnostics.get("armatures", [])
+        if job.action_name in actions:
+            action = actions[job.action_name]
+        elif armatures and armatures[0].get("active_action") in actions:
+            action = actions[armatures[0]["active_action"]]
+        else:
+            action = None
+        
+        # Watcher defaults without an action: frames 1-24
+        default_start, default_end = (
+            (int(action["frame_start"]), int(action["frame_end"])) if action else (1, 24)
+        )
+        return (
+            job.frame_start if job.frame_start is not None else default_start,
+            job.frame_end if job.frame_end is not None else default_end,
+        )
+    
+    def _merge_chunks(
+        self,
+        job: RenderJob,
+        sub_jobs: List[RenderJob],
+        results: Dict[str, RenderResult]
+    ) -> RenderResult:
+        """Move sub-job outputs under job.job_id and combine their results."""
+        job_dir = self.output_dir / job.job_id
+        output_files: List[str] = []
+        errors: List[str] = []
+        merged = [results[sub.job_id] for sub in sub_jobs if sub.job_id in results]
+        
+        for sub in sub_jobs:
+            result = results.get(sub.job_id)
+            if result is None or not result.success:
+                reason = result.error_message if result is not None else "no result"
+                errors.append(f"{sub.animation_angles[0]} frames {sub.frame_start}-{sub.frame_end}: {reason}")
+                continue
+            for rel_path in result.output_files:
+                parts = rel_path.replace("\\", "/").split("/")
+                if parts[0] != sub.job_id:
+                    continue  # outside the sub-job dir
+                # frames_{angle}/frame_NNNN.png keep their names; {sub_id}.glb is renamed
+                rel_name = "/".join(job.job_id + part[len(sub.job_id):] if part.startswith(sub.job_id) else part
+                                    for part in parts[1:])
+                dest = job_dir / rel_name
+                if dest.exists():
+                    continue
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(self.output_dir / rel_path, dest)
+                output_files.append(f"{job.job_id}/{rel_name}")
+        
+        # Earliest start phases, latest end phases across the sub-jobs
+        timestamps: Dict[str, float] = {}
+        for phase in PHASES:
+            values = [r.timestamps[phase] for r in merged if phase in r.timestamps]
+            if values:
+                timestamps[phase] = min(values) if phase in ("submitted", "claimed", "process_started") else max(values)
+        
+        first = next((r for r in merged if r.success), None)
+        return RenderResult(
+            job_id=job.job_id,
+            status=JobStatus.FAILED.value if errors else JobStatus.COMPLETE.value,
+            output_files=sorted(output_files),
+            error_message="; ".join(errors) if errors else None,
+            blender_version=first.blender_version if first else None,
+            gpu_used=first.gpu_used if first else None,
+            timestamps=timestamps,
+        )
+    
+    def _run_coalesced(self, job: RenderJob, timeout: Optional[float] = None) -> RenderResult:
+        """Submit job, or wait on an identical job already in flight.
+        
+        The returned result may belong to another caller's job (its job_id
+        and output paths); cleanup_job(result.job_id) is reference counted.
+        """
+        key = job.fingerprint()
+        job_id, token, leader = self.inflight.claim(key, job.job_id, stale_after=timeout or self.timeout)
+        with self._inflight_lock:
+            self._inflight_refs.setdefault(job_id, []).append(token)
+        
+        if leader:
+            self.submit_job(job)
+        else:
+            self.events.emit(ev.COALESCED, job_id, requested_job_id=job.job_id)
+        try:
+            result = self.wait_for_result(job_id, timeout)
+        except TimeoutError:
+            if leader:
+                self.inflight.complete(key, job_id)
+            else:
+                # The caller never learns the leader's job_id, so it can't
+                # cleanup_job it; drop our ref here
+                self._drop_inflight_ref(job_id, token)
+            raise
+        except RuntimeError:
+            self.inflight.complete(key, job_id)  # failed, but finished
+            raise
+        self.inflight.complete(key, job_id)
+        return result
     
     def render_blend(
         self,
@@ -173,8 +514,7 @@ class RenderBridge:
             **kwargs
         )
         
-        self.submit_job(job)
-        return self.wait_for_result(job.job_id, timeout)
+        return self._run_job(job, timeout)
     
     def render_with_script(
         self,
@@ -200,8 +540,7 @@ class RenderBridge:
             script_args=script_args or []
         )
         
-        self.submit_job(job)
-        return self.wait_for_result(job.job_id, timeout)
+        return self._run_job(job, timeout)
 
     def render_animation(
         self,
@@ -211,7 +550,10 @@ class RenderBridge:
         frame_end: Optional[int] = None,
         render_engine: str = "BLENDER_EEVEE",
         resolution: int = 256,
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        priority: str = "normal",
+        chunks: int = 1,
+        raw_frames: bool = False
     ) -> RenderResult:
         """Render an animation sequence from a .blend file.
 
@@ -223,6 +565,17 @@ class RenderBridge:
             render_engine: "BLENDER_EEVEE", "CYCLES", or "BLENDER_WORKBENCH"
             resolution: Output resolution (square)
             timeout: Max seconds to wait
+            priority: Queue scheduling class ("interactive", "normal", "bulk")
+            chunks: Split each angle's frame range into this many sub-jobs,
+                submitted together so the watcher's parallel slots share the
+                work. Frames are merged back into this job's frames_{angle}/.
+                Without frame_start and frame_end the range is first read
+                with a diagnose_blend job (an extra Blender run, cached per
+                file contents when a cache is set); if that fails the
+                animation is rendered as one job.
+            raw_frames: Also write raw RGBA segments that
+                render_bridge.frames.load_frames memory-maps instead of
+                decoding PNGs.
 
         Returns:
             RenderResult with frame file paths in output_files
@@ -234,21 +587,165 @@ class RenderBridge:
             frame_start=frame_start,
             frame_end=frame_end,
             render_engine=render_engine,
-            preview_resolution=resolution  # Reuse this field for animation resolution
+            preview_resolution=resolution,  # Reuse this field for animation resolution
+            priority=priority,
+            raw_frames=raw_frames
+        )
+
+        return self._run_job(job, timeout or self.timeout, chunks=chunks)
+
+    def iter_previews(
+        self,
+        blend_file: str,
+        angles: Optional[List[str]] = None,
+        resolution: int = 512,
+        render_engine: str = "BLENDER_EEVEE",
+        group_size: int = 1,
+        timeout: Optional[float] = None,
+        priority: str = "normal"
+    ) -> Iterator[Tuple[str, Path]]:
+        """Yield (angle, png_path) as per-angle-group preview jobs finish.
+
+        The preview job is split into groups of ``group_size`` angles (see
+        RenderJob.split_previews) submitted as one batch, so the watcher's
+        parallel slots share them. The first group is submitted as
+        "interactive" so the first angle comes back first. With a cache
+        set, groups are served from and stored in it individually.
+
+        Each path lives in its group's job directory, which is removed once
+        the generator resumes after the group's last angle; copy files out
+        inside the loop.
+
+        Raises:
+            TimeoutError: If some groups haven't completed within the timeout
+                (shared by all groups).
+            RuntimeError: If a group fails.
+        """
+        for group in self.iter_preview_groups(
+            blend_file, angles, resolution, render_engine, group_size, timeout, priority
+        ):
+            yield from group
+
+    def iter_preview_groups(
+        self,
+        blend_file: str,
+        angles: Optional[List[str]] = None,
+        resolution: int = 512,
+        render_engine: str = "BLENDER_EEVEE",
+        group_size: int = 1,
+        timeout: Optional[float] = None,
+        priority: str = "normal"
+    ) -> Iterator[List[Tuple[str, Path]]]:
+        """Like iter_previews, but yield each finished group's [(angle, png_path)] at once.
+
+        The group's job directory is removed when the generator resumes, so
+        callers can publish a whole group (e.g. in parallel) in one step.
+        """
+        job = RenderJob(
+            blend_file=blend_file,
+            output_format=OutputFormat.BLEND.value,  # previews only, no export
+            render_engine=render_engine,
+            generate_previews=True,
+            preview_resolution=resolution,
+            priority=priority
         )
+        if angles is not None:
+            job.preview_angles = list(angles)
+        sub_jobs = job.split_previews(group_size)
+        if not sub_jobs:
+            return
+        sub_jobs[0].priority = JobPriority.INTERACTIVE.value
+        by_id = {sub.job_id: sub for sub in sub_jobs}
+
+        ready: List[RenderResult] = []
+        pending: List[RenderJob] = []
+        for sub in sub_jobs:
+            cached = self.cache.lookup(sub, self.output_dir) if self.cache is not None else None
+            if cached is not None:
+                if self.metrics is not None:
+                    self.metrics.count_cache_hit("blender")
+                self.events.emit(ev.CACHE_HIT, sub.job_id)
+                ready.append(cached)
+            else:
+                pending.append(sub)
+
+        def landed() -> Iterator[RenderResult]:
+            yield from ready
+            if pending:
+                for result in self.submit_batch(pending).as_completed(timeout or self.timeout):
+                    if self.cache is not None:
+                        self.cache.store(by_id[result.job_id], result, self.output_dir)
+                    yield result
+
+        remaining = set(by_id)
+        try:
+            for result in landed():
+                remaining.discard(result.job_id)
+                try:
+                    if not result.success:
+                        raise RuntimeError(f"Preview job {result.job_id} failed: {result.error_message}")
+                    group = [
+                        (angle, self.output_dir / result.job_id / f"{angle}.png")
+                        for angle in by_id[result.job_id].preview_angles
+                    ]
+                    group = [(angle, path) for angle, path in group if path.is_file()]
+                    if group:
+                        yield group
+                finally:
+                    self.cleanup_job(result.job_id)
+        finally:
+            for job_id in remaining:
+                self.cleanup_job(job_id)
+
+    def watcher_status(self, refresh: bool = False) -> WatcherStatus:
+        """Cached heartbeat status of the Windows watcher (alive, free slots, GPU).
+
+        Only stats the heartbeat file, at most once per STATUS_TTL unless
+        refresh is set; never writes.
+        """
+        return self.liveness.status(refresh=refresh)
 
-        self.submit_job(job)
-        return self.wait_for_result(job.job_id, timeout or self.timeout)
+    def is_watcher_running(self) -> bool:
+        """Check if the Windows watcher appears to be running."""
+        return self.watcher_status().alive
 
-    def cleanup_job(self, job_id: str):
-        """Remove job files after processing."""
+    def _drop_inflight_ref(self, job_id: str, token: Optional[str] = None):
+        """Release one of this bridge's refs on job_id (a given token, or the latest)."""
+        with self._inflight_lock:
+            tokens = self._inflight_refs.get(job_id)
+            if token is None:
+                token = tokens.pop() if tokens else None
+            elif tokens and token in tokens:
+                tokens.remove(token)
+            if tokens == []:
+                del self._inflight_refs[job_id]
+        if token is not None:
+            self.inflight.release(job_id, token)
+    
+    def cleanup_job(self, job_id: str) -> bool:
+        """Remove job files after processing.
+        
+        With coalescing enabled, files shared by several callers are only
+        removed when the last of them cleans up. A caller that never calls
+        this leaves its ref in ``_inflight/`` until cleanup_older_than
+        prunes it.
+        
+        Returns:
+            False if other callers still hold refs and the files were kept.
+        """
+        if self.inflight is not None:
+            self._drop_inflight_ref(job_id)
+            if self.inflight.has_refs(job_id):
+                return False
+        
         # Remove from queue (should already be gone)
-        job_file = self.queue_dir / f"{job_id}.json"
-        if job_file.exists():
-            job_file.unlink()
+        for priority in PRIORITY_RANK:
+            job_file = self.queue_dir / queue_filename(job_id, priority)
+            if job_file.exists():
+                job_file.unlink()
         
         # Remove result file
-        result_file = self.output_dir / f"{job_id}.result.json"
+        result_file = self.output_dir / f"{job_id}{RESULT_SUFFIX}"
         if result_file.exists():
             result_file.unlink()
         
@@ -256,19 +753,124 @@ class RenderBridge:
         job_output_dir = self.output_dir / job_id
         if job_output_dir.exists():
             shutil.rmtree(job_output_dir)
+        
+        if self.index is not None:
+            self.index.record_cleanup([job_id])
+        return True
+    
+    def cleanup_older_than(self, max_age_seconds: float) -> List[str]:
+        """Clean up completed jobs whose result landed more than max_age_seconds ago.
+        
+        With coalescing enabled, in-flight refs and markers older than
+        max_age_seconds (left by callers that never called cleanup_job) are
+        removed too.
+        
+        Returns:
+            The job IDs that were cleaned up.
+        """
+        cutoff = time.time() - max_age_seconds
+        if self.index is not None:
+            self.sync_index()
+            old_jobs = self.index.completed_before(cutoff)
+        else:
+            old_jobs = [job_id for job_id, mtime in self._scan_results() if mtime < cutoff]
+        if self.inflight is not None:
+            # First, so abandoned refs don't keep old jobs' files alive
+            self.inflight.prune(max_age_seconds)
+        return [job_id for job_id in old_jobs if self.cleanup_job(job_id)]
+    
+    # Job index
+    
+    def _scan_results(self) -> List[tuple]:
+        """(job_id, result mtime) for every result file (full directory scan)."""
+        results = []
+        with os.scandir(self.output_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(RESULT_SUFFIX) and not entry.name.startswith("."):
+                    try:
+                        results.append((entry.name[:-len(RESULT_SUFFIX)], entry.stat().st_mtime))
+                    except FileNotFoundError:
+                        continue
+        return results
+    
+    def _scan_queue(self) -> List[tuple]:
+        """(job_id, priority, enqueued_at) for queued jobs, including unexpanded batches."""
+        queued = []
+        with os.scandir(self.queue_dir) as entries:
+            for entry in entries:
+                try:
+                    if entry.name.endswith(BATCH_SUFFIX):
+                        batch = RenderBatch.load(Path(entry.path))
+                        queued.extend((job.job_id, job.priority, batch.created_at) for job in batch.jobs)
+                        continue
+                    parsed = parse_queue_filename(entry.name)
+                    if parsed:
+                        queued.append((parsed[0], parsed[1], entry.stat().st_mtime))
+                except (OSError, ValueError, KeyError):
+                    continue  # consumed by the watcher while we were listing
+        return queued
+    
+    def sync_index(self) -> int:
+        """Mark indexed pending jobs whose result has landed as complete.
+        
+        Costs one stat per pending job, independent of how many files the
+        output directory holds. Above SYNC_STAT_LIMIT pending jobs it does
+        one directory scan instead.
+        
+        Returns:
+            The number of newly completed jobs.
+        """
+        pending = self.index.pending()
+        if len(pending) > SYNC_STAT_LIMIT:
+            # Past this point one directory scan beats a stat per job
+            pending = self._scan_completed(pending)
+        completed = []
+        for job_id in pending:
+            try:
+                mtime = (self.output_dir / f"{job_id}{RESULT_SUFFIX}").stat().st_mtime
+            except FileNotFoundError:
+                continue
+            completed.append((job_id, mtime))
+        self.index.record_complete(completed)
+        return len(completed)
+    
+    def rebuild_index(self):
+        """Repopulate the index from a full scan of the queue and output dirs.
+        
+        Needed once for jobs submitted without the index (other clients,
+        older code); runs automatically when the index file is new.
+        """
+        self.index.replace_all(self._scan_queue(), self._scan_results())
     
     def list_pending_jobs(self) -> List[str]:
-        """List job IDs currently in the queue."""
-        return [f.stem for f in self.queue_dir.glob("*.json")]
+        """List job IDs currently in the queue, including unexpanded batches."""
+        if self.index is not None:
+            self.sync_index()
+            return self.index.pending()
+        pending = []
+        for f in self.queue_dir.glob("*.json"):
+            parsed = parse_queue_filename(f.name)
+            if parsed:
+                pending.append(parsed[0])
+        for manifest in self.queue_dir.glob(f"*{BATCH_SUFFIX}"):
+            try:
+                pending.extend(RenderBatch.load(manifest).job_ids)
+            except (OSError, ValueError, KeyError):
+                continue  # consumed by the watcher while we were listing
+        return pending
     
     def list_completed_jobs(self) -> List[str]:
         """List job IDs that have completed."""
-        return [f.stem.replace(".result", "") for f in self.output_dir.glob("*.result.json")]
+        if self.index is not None:
+            self.sync_index()
+            return self.index.completed()
+        return [f.name[:-len(RESULT_SUFFIX)] for f in self.output_dir.glob(f"*{RESULT_SUFFIX}")]
 
     def diagnose_blend(
         self,
         blend_file: str,
-        timeout: Optional[float] = None
+        timeout: Optional[float] = None,
+        sample_frames: Optional[int] = None
     ) -> Dict[str, Any]:
         """Run animation diagnostics on a .blend file.
 
@@ -281,6 +883,8 @@ class RenderBridge:
         Args:
             blend_file: Path to the .blend file
             timeout: Max seconds to wait
+            sample_frames: Frames of the first action sampled by the
+                deformation test (script default: 5)
 
         Returns:
             Dict with diagnostic results including:
@@ -291,43 +895,264 @@ class RenderBridge:
             - meshes: Mesh info
             - actions: Available actions
             - vertex_deformation_test: Results of vertex movement test
+              (max/mean displacement overall and per vertex group)
+
+        With a cache set, a file whose contents (and DIAGNOSTIC_SCRIPT) are
+        unchanged since its last diagnosis is answered locally.
         """
-        # Write diagnostic script to temp file
-        script_path = self.queue_dir / "_diagnostic_script.py"
+        key, cached = self._cached_diagnostics(blend_file, sample_frames)
+        if cached is not None:
+            return cached
+
+        job = RenderJob(blend_file=blend_file)
+        # One script file per job: concurrent diagnose calls share the queue dir
+        script_path = self.queue_dir / f"_diagnostic_{job.job_id}.py"
         script_path.write_text(DIAGNOSTIC_SCRIPT)
+        job.script = str(script_path)
+        job.script_args = ["--job-id", job.job_id]
+        if sample_frames:
+            job.script_args += ["--sample-frames", str(sample_frames)]
 
         try:
-            result = self.render_with_script(
-                blend_file=blend_file,
-                script=str(script_path),
-                timeout=timeout
-            )
-
-            # Parse the log file to get diagnostic JSON
-            log_file = self.output_dir.parent / "render-watcher.log"
-            if log_file.exists():
-                log_content = log_file.read_text(encoding='utf-8', errors='ignore')
-
-                # Find the diagnostic JSON in the log
-                match = re.search(
-                    r'=== DIAGNOSTIC_JSON_START ===\s*\n(.*?)\n=== DIAGNOSTIC_JSON_END ===',
-                    log_content,
-                    re.DOTALL
-                )
-                if match:
-                    return json.loads(match.group(1))
-
-            return {
-                "status": "error",
-                "issues": ["Could not parse diagnostic output from log"],
-                "warnings": [],
-                "armatures": [],
-                "meshes": [],
-                "actions": [],
-                "vertex_deformation_test": None
-            }
+            # Bypass the output cache: diagnostics are read from the job's output dir
+            self.submit_job(job)
+            self.wait_for_result(job.job_id, timeout)
+            diagnostics = self._read_diagnostics(job.job_id)
+            if diagnostics is None:
+                return empty_diagnostics("Could not read diagnostic output")
+            self._store_diagnostics(key, diagnostics)
+            return diagnostics
 
         finally:
-            # Cleanup script
+            # Cleanup script and the job (its diagnostics have been read)
             if script_path.exists():
                 script_path.unlink()
+            self.cleanup_job(job.job_id)
+
+    def diagnose_many(
+        self,
+        blend_files: Iterable[str],
+        timeout: Optional[float] = None,
+        on_result: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        sample_frames: Optional[int] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Run animation diagnostics on many .blend files in one Blender session.
+
+        Args:
+            blend_files: Paths to the .blend files
+            timeout: Max seconds to wait for the next file's result
+            on_result: Called with (blend_file, diagnostics) as each file finishes
+            sample_frames: Frames sampled by the deformation test
+
+        Returns:
+            Dict mapping each blend file to its diagnose_blend-style results.
+        """
+        results = {}
+        for blend_file, diagnostics in self.iter_diagnostics(blend_files, timeout, sample_frames):
+            results[blend_file] = diagnostics
+            if on_result is not None:
+                on_result(blend_file, diagnostics)
+        return results
+
+    def iter_diagnostics(
+        self,
+        blend_files: Iterable[str],
+        timeout: Optional[float] = None,
+        sample_frames: Optional[int] = None
+    ) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Yield (blend_file, diagnostics) pairs as a batch diagnostic job progresses.
+
+        DIAGNOSTIC_SCRIPT is shipped once with the file list and opens each
+        file in turn, writing ``{job_id}/diagnostics/{index:05d}.json`` as
+        it goes; those files are picked up while the job is still running.
+        Files without a result when the job ends (e.g. Blender crashed) get
+        an error entry.
+
+        With a cache set, unchanged files are yielded first from the cache
+        and only the rest (see stale_diagnostics) are sent to Blender.
+
+        Raises:
+            TimeoutError: If no file finishes within the timeout.
+        """
+        keys: Dict[str, Optional[str]] = {}
+        stale = []
+        for blend_file in blend_files:
+            key, cached = self._cached_diagnostics(blend_file, sample_frames)
+            if cached is not None:
+                yield blend_file, cached
+            else:
+                keys[blend_file] = key
+                stale.append(blend_file)
+
+        for blend_file, diagnostics, fresh in self._dispatch_diagnostics(stale, timeout, sample_frames):
+            if fresh:
+                self._store_diagnostics(keys.get(blend_file), diagnostics)
+            yield blend_file, diagnostics
+
+    def stale_diagnostics(self, blend_files: Iterable[str], sample_frames: Optional[int] = None) -> List[str]:
+        """Files that need (re-)diagnosis: not cached for their current
+        contents and the current DIAGNOSTIC_SCRIPT. Without a cache, all of them.
+        """
+        stale = []
+        for blend_file in blend_files:
+            key = diagnostics_key(blend_file, sample_frames) if self.cache is not None else None
+            if key is None or not self.cache.contains(key):
+                stale.append(blend_file)
+        return stale
+
+    def _cached_diagnostics(
+        self,
+        blend_file: str,
+        sample_frames: Optional[int]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """(cache key, cached diagnostics or None); the key is None if uncacheable.
+
+        The key is taken before dispatch so a file edited mid-run isn't
+        stored under its new contents.
+        """
+        if self.cache is None:
+            return None, None
+        key = diagnostics_key(blend_file, sample_frames)
+        if key is None:
+            return None, None
+        entry = self.cache.get(key)
+        if entry is None:
+            return key, None
+        diagnostics = entry["diagnostics"]
+        if "blend_file" in diagnostics:
+            diagnostics["blend_file"] = blend_file  # same contents, maybe another path
+        self.events.emit(ev.CACHE_HIT, blend_file=blend_file, diagnostics=True)
+        return key, diagnostics
+
+    def _store_diagnostics(self, key: Optional[str], diagnostics: Dict[str, Any]):
+        if self.cache is not None and key is not None:
+            self.cache.put(key, {}, {"diagnostics": diagnostics})
+
+    def _dispatch_diagnostics(
+        self,
+        blend_files: List[str],
+        timeout: Optional[float],
+        sample_frames: Optional[int]
+    ) -> Iterator[Tuple[str, Dict[str, Any], bool]]:
+        """Run one batch diagnostic job; yields (blend_file, diagnostics, fresh).
+
+        fresh is False for the error entries made up for files that
+        produced no output.
+        """
+        if not blend_files:
+            return
+        timeout = timeout or self.timeout
+
+        # The watcher opens the job's blend_file first; pick one that exists
+        # so a single missing file doesn't fail the whole batch
+        first = next((f for f in blend_files if Path(f).exists()), blend_files[0])
+        job = RenderJob(blend_file=first)
+        script_path = self.queue_dir / f"_diagnostic_{job.job_id}.py"
+        list_path = self.queue_dir / f"_diagnostic_{job.job_id}.files.txt"
+        results_dir = self.output_dir / job.job_id / DIAGNOSTICS_DIR_NAME
+        script_path.write_text(DIAGNOSTIC_SCRIPT)
+        list_path.write_text("".join(f"{f}\n" for f in blend_files), encoding="utf-8")
+        results_dir.mkdir(parents=True, exist_ok=True)
+        job.script = str(script_path)
+        job.script_args = ["--job-id", job.job_id, "--blend-files", str(list_path)]
+        if sample_frames:
+            job.script_args += ["--sample-frames", str(sample_frames)]
+
+        remaining = set(range(len(blend_files)))
+        result = None
+        try:
+            self.submit_job(job)
+            last_progress = time.time()
+            with ResultWatcher(results_dir, use_inotify=self.use_inotify) as watcher:
+                while remaining:
+                    for index, diagnostics in self._scan_diagnostics(results_dir, remaining):
+                        remaining.discard(index)
+                        last_progress = time.time()
+                        yield blend_files[index], diagnostics, True
+                    if not remaining:
+                        break
+
+                    result = self.get_result(job.job_id)
+                    if result is not None:
+                        self._observe(result)
+                        break
+
+                    elapsed = time.time() - last_progress
+                    if elapsed > timeout:
+                        self._observe_timeout([job.job_id])
+                        raise TimeoutError(
+                            f"Diagnostic job {job.job_id} made no progress for {timeout}s "
+                            f"({len(remaining)} of {len(blend_files)} files left)")
+                    watcher.wait(min(self.poll_interval, timeout - elapsed))
+
+            if not remaining:
+                return
+
+            # The job ended: files written since the last scan, then the log
+            for index, diagnostics in self._scan_diagnostics(results_dir, remaining):
+                remaining.discard(index)
+                yield blend_files[index], diagnostics, True
+
+            log_file = self.output_dir.parent / "render-watcher.log"
+            log_tail = read_log_tail(log_file) if remaining and log_file.exists() else ""
+            reason = result.error_message if result is not None and result.error_message else "no output"
+            for index in sorted(remaining):
+                diagnostics = parse_diagnostics_log(log_tail, f"{job.job_id}:{index}")
+                if diagnostics is None:
+                    yield blend_files[index], empty_diagnostics(f"Could not read diagnostic output ({reason})"), False
+                else:
+                    yield blend_files[index], diagnostics, True
+
+        finally:
+            for path in (script_path, list_path):
+                if path.exists():
+                    path.unlink()
+
+    def _scan_diagnostics(self, results_dir: Path, indices: Iterable[int]) -> List[Tuple[int, Dict[str, Any]]]:
+        """Readable per-file results in results_dir among the given indices."""
+        wanted = set(indices)
+        found = []
+        try:
+            names = [entry.name for entry in os.scandir(results_dir)]
+        except FileNotFoundError:
+            return found
+        for name in names:
+            if name.startswith(".") or not name.endswith(".json"):
+                continue
+            try:
+                index = int(name[:-len(".json")])
+            except ValueError:
+                continue
+            if index not in wanted:
+                continue
+            try:
+                found.append((index, json.loads((results_dir / name).read_text(encoding="utf-8"))))
+            except (OSError, json.JSONDecodeError):
+                continue  # picked up on the next scan
+        return sorted(found, key=lambda pair: pair[0])
+
+    def read_diagnostics(self, job_id: str) -> Dict[str, Any]:
+        """Diagnostics written by a finished DIAGNOSTIC_SCRIPT job.
+
+        Reads ``render-output/{job_id}/diagnostics.json``. Watchers that don't
+        set ``RENDER_JOB_OUTPUT_DIR`` leave no file; then the block tagged
+        with job_id is looked up in the tail of ``render-watcher.log``.
+        """
+        diagnostics = self._read_diagnostics(job_id)
+        if diagnostics is None:
+            return empty_diagnostics("Could not read diagnostic output")
+        return diagnostics
+
+    def _read_diagnostics(self, job_id: str) -> Optional[Dict[str, Any]]:
+        diagnostics_file = self.output_dir / job_id / DIAGNOSTICS_FILE_NAME
+        try:
+            return json.loads(diagnostics_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError:
+            pass  # fall back to the log
+
+        log_file = self.output_dir.parent / "render-watcher.log"
+        if log_file.exists():
+            return parse_diagnostics_log(read_log_tail(log_file), job_id)
+        return None
@@ -0,0 +1,315 @@
+"""
+Content-addressed cache of render outputs.
+
+Entries are keyed by a hash of the input file contents plus the job's
+normalized parameters, so re-rendering an unchanged .blend with the same
+settings is answered locally instead of going to the GPU host.
+
+Layout:
+    <cache_dir>/<key[:2]>/<key>/entry.json   # metadata + stored result
+    <cache_dir>/<key[:2]>/<key>/files/...    # outputs, relative to the job dir
+
+The mtime of entry.json records the last access and drives LRU eviction.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .fileio import atomic_write_text, link_or_copy
+from .job import RenderJob, RenderResult
+
+
+DEFAULT_CACHE_MAX_BYTES = 2 * 1024 ** 3  # 2 GiB
+CACHE_ENTRY_FILE = "entry.json"
+# Stand-in for the job ID inside stored output paths
+JOB_ID_PLACEHOLDER = "{job_id}"
+
+# (path, size, mtime_ns) -> sha256, so unchanged inputs aren't re-read;
+# least recently used entries are dropped beyond DIGEST_MEMO_SIZE
+DIGEST_MEMO_SIZE = 4096
+_digest_memo: "OrderedDict[Tuple[str, int, int], str]" = OrderedDict()
+_digest_lock = threading.Lock()
+
+
+def file_digest(path: Path) -> str:
+    """Return the sha256 hex digest of a file's contents (memoized on size/mtime)."""
+    path = Path(path)
+    st = path.stat()
+    memo_key = (str(path.resolve()), st.st_size, st.st_mtime_ns)
+    with _digest_lock:
+        cached = _digest_memo.get(memo_key)
+        if cached is not None:
+            _digest_memo.move_to_end(memo_key)
+    if cached is not None:
+        return cached
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    hexdigest = digest.hexdigest()
+    with _digest_lock:
+        _digest_memo[memo_key] = hexdigest
+        while len(_digest_memo) > DIGEST_MEMO_SIZE:
+            _digest_memo.popitem(last=False)
+    return hexdigest
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.stat(os.path.join(root, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class RenderCache:
+    """Size-bounded LRU store of render outputs.
+
+    Args:
+        cache_dir: Directory holding cache entries.
+        max_bytes: Evict least recently used entries beyond this total size.
+        max_age_seconds: Optionally also evict entries created longer ago.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        max_age_seconds: Optional[float] = None,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # Generic key/value store
+
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / key
+
+    def get(self, key: str, count: bool = True) -> Optional[Dict[str, Any]]:
+        """Return an entry's metadata (and mark it recently used), or None.
+
+        The returned dict has a "files_dir" key pointing at the stored files.
+        With ``count=False`` no hit/miss is counted; callers that still have
+        to materialize the files call record_lookup once they know.
+        """
+        entry_file = self._entry_dir(key) / CACHE_ENTRY_FILE
+        try:
+            entry = json.loads(entry_file.read_text(encoding="utf-8"))
+            if self._expired(entry.get("created_at", 0.0)):
+                raise ValueError("expired")
+            os.utime(entry_file)
+        except (OSError, ValueError):
+            if count:
+                self.record_lookup(False)
+            return None
+        if count:
+            self.record_lookup(True)
+        entry["files_dir"] = str(entry_file.parent / "files")
+        return entry
+
+    def record_lookup(self, hit: bool):
+        """Count one hit or miss (see get(count=False))."""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def contains(self, key: str) -> bool:
+        """True if an unexpired entry exists (no hit/miss counted, LRU untouched)."""
+        try:
+            entry = json.loads((self._entry_dir(key) / CACHE_ENTRY_FILE).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return False
+        return not self._expired(entry.get("created_at", 0.0))
+
+    def put(self, key: str, files: Dict[str, Path], metadata: Dict[str, Any]) -> bool:
+        """Store files (relative name -> source path) under key.
+
+        The entry is assembled in a temp directory and renamed into place, so
+        concurrent readers never see a partial entry. Returns False if any
+        source file is missing.
+        """
+        final_dir = self._entry_dir(key)
+        if (final_dir / CACHE_ENTRY_FILE).exists():
+            return True
+
+        tmp_dir = self.cache_dir / f".tmp-{uuid.uuid4().hex[:8]}"
+        try:
+            for rel_name, src in files.items():
+                if not Path(src).is_file():
+                    return False
+                link_or_copy(Path(src), tmp_dir / "files" / rel_name)
+            entry = dict(metadata)
+            entry.update({
+                "key": key,
+                "files": sorted(files),
+                "size": _dir_size(tmp_dir),
+                "created_at": time.time(),
+            })
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(tmp_dir / CACHE_ENTRY_FILE, json.dumps(entry, indent=2))
+            final_dir.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.rename(tmp_dir, final_dir)
+            except OSError:
+                return True  # another process stored the same key first
+        finally:
+            if tmp_dir.exists():
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        self.evict()
+        return True
+
+    def _expired(self, created_at: float) -> bool:
+        return self.max_age_seconds is not None and time.time() - created_at > self.max_age_seconds
+
+    def _entries(self) -> List[Tuple[float, int, float, Path]]:
+        """(last_used, size, created_at, entry_dir) for every entry."""
+        entries = []
+        for shard in self.cache_dir.iterdir():
+            if not shard.is_dir() or shard.name.startswith("."):
+                continue
+            for entry_dir in shard.iterdir():
+                entry_file = entry_dir / CACHE_ENTRY_FILE
+                try:
+                    last_used = entry_file.stat().st_mtime
+                    entry = json.loads(entry_file.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    continue
+                entries.append((last_used, entry.get("size", 0), entry.get("created_at", 0.0), entry_dir))
+        return entries
+
+    def evict(self) -> int:
+        """Remove expired entries, then least recently used ones until under max_bytes.
+
+        Returns:
+            Number of entries removed.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _, _ in entries)
+        removed = 0
+        for _last_used, size, created_at, entry_dir in entries:
+            if total <= self.max_bytes and not self._expired(created_at):
+                continue
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            removed += 1
+        with self._lock:
+            self.evictions += removed
+        return removed
+
+    def clear(self):
+        """Remove every entry."""
+        for _last_used, _size, _created_at, entry_dir in self._entries():
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this instance plus on-disk totals."""
+        entries = self._entries()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _, _ in entries),
+            "max_bytes": self.max_bytes,
+            "max_age_seconds": self.max_age_seconds,
+        }
+
+    # RenderJob integration
+
+    def key_for(self, job: RenderJob) -> Optional[str]:
+        """Cache key for a job, or None if its inputs can't be hashed locally."""
+        params = job.normalized()
+        try:
+            params["blend_file"] = file_digest(Path(job.blend_file))
+            if job.script:
+                params["script"] = file_digest(Path(job.script))
+        except OSError:
+            return None
+        canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def lookup(self, job: RenderJob, output_dir: Path) -> Optional[RenderResult]:
+        """Serve a job from the cache.
+
+        On a hit the stored outputs are hardlinked into ``output_dir/<job_id>``
+        so callers can treat the result exactly like a fresh render.
+        """
+        key = self.key_for(job)
+        if key is None:
+            return None
+        entry = self.get(key, count=False)
+        if entry is None:
+            self.record_lookup(False)
+            return None
+
+        files_dir = Path(entry["files_dir"])
+        job_dir = Path(output_dir) / job.job_id
+        try:
+            for rel_name in entry["files"]:
+                dest_name = rel_name.replace(JOB_ID_PLACEHOLDER, job.job_id)
+                link_or_copy(files_dir / rel_name, job_dir / dest_name)
+        except OSError:
+            self.record_lookup(False)
+            return None  # evicted underneath us; render normally
+        self.record_lookup(True)
+
+        def rebase(paths: List[str]) -> List[str]:
+            return [f"{job.job_id}/{p.replace(JOB_ID_PLACEHOLDER, job.job_id)}" for p in paths]
+
+        result = RenderResult(**entry["result"])
+        result.job_id = job.job_id
+        result.timestamps = {}  # the stored render's phases don't describe this job
+        result.output_files = rebase(result.output_files)
+        result.preview_files = rebase(result.preview_files)
+        return result
+
+    def store(self, job: RenderJob, result: RenderResult, output_dir: Path) -> bool:
+        """Store a successful job's outputs. Returns True if cached."""
+        if not result.success:
+            return False
+        key = self.key_for(job)
+        if key is None:
+            return False
+
+        prefix = f"{job.job_id}/"
+        files: Dict[str, Path] = {}
+        stored = asdict(result)
+        for field_name in ("output_files", "preview_files"):
+            templated = []
+            for rel_path in stored[field_name]:
+                rel_path = rel_path.replace("\\", "/")
+                if not rel_path.startswith(prefix):
+                    return False  # output outside the job dir; don't cache
+                template = "/".join(
+                    JOB_ID_PLACEHOLDER + part[len(job.job_id):]
+                    if part == job.job_id or part.startswith(job.job_id + ".") else part
+                    for part in rel_path[len(prefix):].split("/")
+                )
+                files[template] = Path(output_dir) / rel_path
+                templated.append(template)
+            stored[field_name] = templated
+        return self.put(key, files, {"result": stored})
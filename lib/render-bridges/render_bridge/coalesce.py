@@ -0,0 +1,166 @@
+"""
+Single-flight coalescing of identical in-flight render jobs.
+
+State lives in files under ``<queue_dir>/_inflight/`` so it is shared by
+threads and by every process using the same queue:
+
+    <key>.inflight            # created O_EXCL by the leader: "<job_id>\n<stale_after>"
+    <job_id>.<token>.ref      # one per participant (leader and followers)
+
+A second identical job finds the marker and waits on the leader's job
+instead of queueing its own. Each participant holds a ref on the shared
+job, and cleanup_job only removes the job's outputs once the last ref has
+been released, so a fast leader can't delete files a follower still needs.
+
+The leader records how long it will wait in its marker, so followers with
+shorter timeouts don't declare a live leader stale. Refs left behind by a
+caller that never called cleanup_job are removed by prune().
+"""
+
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+INFLIGHT_DIR_NAME = "_inflight"
+MARKER_SUFFIX = ".inflight"
+REF_SUFFIX = ".ref"
+
+
+class InflightRegistry:
+    """Cross-process registry of in-flight jobs keyed by job fingerprint.
+
+    Args:
+        directory: Shared directory for markers and refs.
+        stale_after: Default for claim(); markers older than the leader's
+            stale_after (seconds) belong to a leader that died and are
+            replaced rather than joined.
+    """
+
+    def __init__(self, directory: Path, stale_after: float = 300.0):
+        self.directory = Path(directory)
+        self.stale_after = stale_after
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _marker(self, key: str) -> Path:
+        return self.directory / f"{key}{MARKER_SUFFIX}"
+
+    def _read_marker_entry(self, key: str) -> Tuple[Optional[str], float]:
+        """(leader job_id or None, the leader's stale_after)."""
+        try:
+            lines = self._marker(key).read_text(encoding="utf-8").split()
+        except OSError:
+            return None, self.stale_after
+        if not lines:
+            return None, self.stale_after  # still being written
+        if len(lines) < 2:
+            return lines[0], self.stale_after
+        try:
+            return lines[0], float(lines[1])
+        except ValueError:
+            return lines[0], self.stale_after
+
+    def _read_marker(self, key: str) -> Optional[str]:
+        return self._read_marker_entry(key)[0]
+
+    def add_ref(self, job_id: str) -> str:
+        """Register interest in job_id's outputs. Returns a token for release()."""
+        token = uuid.uuid4().hex[:12]
+        (self.directory / f"{job_id}.{token}{REF_SUFFIX}").touch()
+        return token
+
+    def release(self, job_id: str, token: str):
+        try:
+            (self.directory / f"{job_id}.{token}{REF_SUFFIX}").unlink()
+        except FileNotFoundError:
+            pass
+
+    def has_refs(self, job_id: str) -> bool:
+        return any(self.directory.glob(f"{job_id}.*{REF_SUFFIX}"))
+
+    def claim(self, key: str, job_id: str, stale_after: Optional[float] = None) -> Tuple[str, str, bool]:
+        """Lead a new job for key, or join the identical job already in flight.
+
+        Args:
+            key: Job fingerprint.
+            job_id: The caller's own job ID, used if it becomes the leader.
+            stale_after: How long the caller will wait for the job (default:
+                the registry's); stored in the marker if the caller leads.
+
+        Returns:
+            (job_id to wait on, ref token, True if the caller is the leader
+            and must submit its job)
+        """
+        marker = self._marker(key)
+        while True:
+            try:
+                fd = os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                pass
+            else:
+                # Ref before publishing the job ID so a follower's cleanup
+                # can never see the job with zero refs.
+                token = self.add_ref(job_id)
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(f"{job_id}\n{stale_after or self.stale_after}")
+                return job_id, token, True
+
+            leader_id, leader_stale_after = self._read_marker_entry(key)
+            if leader_id is None:
+                try:
+                    age = time.time() - marker.stat().st_mtime
+                except FileNotFoundError:
+                    continue  # leader finished in between; retry the claim
+                if age > 1.0:
+                    self._remove_marker(key)  # abandoned mid-write
+                else:
+                    time.sleep(0.01)  # leader is still writing its job ID
+                continue
+
+            try:
+                if time.time() - marker.stat().st_mtime > leader_stale_after:
+                    self._remove_marker(key, leader_id)
+                    continue
+            except FileNotFoundError:
+                continue
+
+            token = self.add_ref(leader_id)
+            # The leader removes the marker once its result has landed; if
+            # that happened before our ref existed its outputs may be gone.
+            if self._read_marker(key) == leader_id:
+                return leader_id, token, False
+            self.release(leader_id, token)
+
+    def _remove_marker(self, key: str, job_id: Optional[str] = None):
+        if job_id is not None and self._read_marker(key) != job_id:
+            return
+        try:
+            self._marker(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def complete(self, key: str, job_id: str):
+        """Stop new callers from joining job_id (its result has landed)."""
+        self._remove_marker(key, job_id)
+
+    def prune(self, max_age_seconds: float) -> int:
+        """Remove refs and markers older than max_age_seconds.
+
+        Refs are normally released by cleanup_job; this drops those left by
+        callers that never cleaned up. Returns the number of files removed.
+        """
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith((REF_SUFFIX, MARKER_SUFFIX)):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
+                        removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
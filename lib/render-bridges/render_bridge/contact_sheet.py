@@ -0,0 +1,231 @@
+"""
+Contact sheets and animated GIFs built on the Linux side.
+
+The watcher's in-Blender contact sheet copies pixels one float at a time in
+Python. Here the PNGs are decoded (and resized to the cell size) across a
+process pool and pasted into one preallocated sheet as they arrive. At most
+``2 * workers`` decoded tiles are held at once, so memory is bounded by the
+sheet plus that window, not by the number of inputs.
+
+Needs Pillow.
+
+Usage:
+    sheet = contact_sheet_for_result(bridge.output_dir, result)  # labelled by angle
+    build_gif(frame_paths, "walk.gif", duration_ms=80)
+"""
+
+import math
+import os
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+from .frames import frame_files
+from .job import RenderResult
+
+
+LABEL_HEIGHT = 14
+SHEET_FILE_NAME = "contact_sheet.png"
+# Below this many images the pool costs more than it saves
+MIN_POOL_IMAGES = 4
+
+Color = Tuple[int, int, int, int]
+
+
+def _require_pillow():
+    if Image is None:
+        raise ImportError("render_bridge.contact_sheet needs Pillow")
+
+
+def _decode_tile(path: str, size: Optional[Tuple[int, int]], mode: str) -> Tuple[str, Tuple[int, int], bytes]:
+    """Decode one image, fit it into size and convert it (runs in a worker process)."""
+    with Image.open(path) as image:
+        image = image.convert("RGBA")
+        if size is not None and image.size != tuple(size):
+            image.thumbnail(size)
+        if mode == "P":
+            image = image.quantize(colors=255, method=Image.Quantize.FASTOCTREE)
+            return mode, image.size, image.tobytes() + bytes(image.getpalette() or [])
+        return mode, image.size, image.convert(mode).tobytes()
+
+
+def _tile_image(decoded: Tuple[str, Tuple[int, int], bytes]):
+    mode, size, data = decoded
+    if mode != "P":
+        return Image.frombytes(mode, size, data)
+    pixels = size[0] * size[1]
+    image = Image.frombytes("P", size, data[:pixels])
+    image.putpalette(data[pixels:])
+    return image
+
+
+def iter_decoded(
+    paths: Sequence[Union[str, Path]],
+    size: Optional[Tuple[int, int]] = None,
+    mode: str = "RGBA",
+    workers: Optional[int] = None,
+    executor: Optional[Executor] = None
+) -> Iterator:
+    """Yield each path decoded as a PIL image, in order.
+
+    Decoding runs on ``executor`` (or a process pool of ``workers``) with at
+    most ``2 * workers`` tiles decoded ahead of the consumer. Small inputs
+    and ``workers=1`` decode inline.
+    """
+    _require_pillow()
+    paths = [str(p) for p in paths]
+    workers = workers or os.cpu_count() or 1
+    if executor is None and (workers <= 1 or len(paths) < MIN_POOL_IMAGES):
+        for path in paths:
+            yield _tile_image(_decode_tile(path, size, mode))
+        return
+
+    own_pool = executor is None
+    pool = executor or ProcessPoolExecutor(max_workers=workers)
+    try:
+        window = deque()
+        pending = iter(paths)
+        for path in pending:
+            window.append(pool.submit(_decode_tile, path, size, mode))
+            if len(window) >= 2 * workers:
+                break
+        while window:
+            decoded = window.popleft().result()
+            for path in pending:
+                window.append(pool.submit(_decode_tile, path, size, mode))
+                break
+            yield _tile_image(decoded)
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def build_contact_sheet(
+    paths: Sequence[Union[str, Path]],
+    labels: Optional[Sequence[str]] = None,
+    columns: Optional[int] = None,
+    cell_size: Optional[Tuple[int, int]] = None,
+    padding: int = 0,
+    background: Color = (0, 0, 0, 0),
+    label_color: Color = (255, 255, 255, 255),
+    workers: Optional[int] = None,
+    out_path: Optional[Union[str, Path]] = None
+):
+    """Composite images into a labelled grid.
+
+    Args:
+        paths: Images in grid order (row-major)
+        labels: Text drawn under each cell (default: no label strip)
+        columns: Cells per row (default: square-ish grid)
+        cell_size: (width, height) each image is fitted into (default: the
+            first image's size)
+        padding: Pixels between cells
+        background: RGBA fill
+        label_color: RGBA text colour
+        workers: Decode processes (default: CPU count)
+        out_path: Also save the sheet here as PNG
+
+    Returns:
+        The contact sheet as an RGBA PIL image.
+    """
+    _require_pillow()
+    paths = list(paths)
+    if not paths:
+        raise ValueError("build_contact_sheet needs at least one image")
+    if labels is not None and len(labels) != len(paths):
+        raise ValueError("labels must match paths")
+    if cell_size is None:
+        with Image.open(paths[0]) as first:
+            cell_size = first.size  # header only, no decode
+    columns = max(1, min(columns or math.ceil(math.sqrt(len(paths))), len(paths)))
+    rows = -(-len(paths) // columns)
+    label_height = LABEL_HEIGHT if labels is not None else 0
+    cell_w, cell_h = cell_size
+    pitch_x, pitch_y = cell_w + padding, cell_h + label_height + padding
+
+    sheet = Image.new("RGBA", (columns * pitch_x - padding, rows * pitch_y - padding), background)
+    draw = ImageDraw.Draw(sheet) if labels is not None else None
+    font = ImageFont.load_default() if labels is not None else None
+    for i, tile in enumerate(iter_decoded(paths, cell_size, "RGBA", workers)):
+        x, y = (i % columns) * pitch_x, (i // columns) * pitch_y
+        # Centre images smaller than the cell (thumbnail keeps aspect ratio)
+        sheet.paste(tile, (x + (cell_w - tile.width) // 2, y + (cell_h - tile.height) // 2))
+        if draw is not None:
+            draw.text((x + 2, y + cell_h + 1), labels[i], fill=label_color, font=font)
+    if out_path is not None:
+        sheet.save(out_path, format="PNG")
+    return sheet
+
+
+def build_gif(
+    paths: Sequence[Union[str, Path]],
+    out_path: Union[str, Path],
+    duration_ms: int = 100,
+    loop: int = 0,
+    size: Optional[Tuple[int, int]] = None,
+    workers: Optional[int] = None
+) -> Path:
+    """Encode frames as an animated GIF.
+
+    Frames are decoded and palette-quantized in the worker processes, so the
+    parent holds one byte per pixel per frame while Pillow assembles the GIF.
+
+    Args:
+        paths: Frame images in playback order
+        out_path: GIF file to write
+        duration_ms: Display time per frame
+        loop: Loop count (0 = forever)
+        size: Fit frames into (width, height) (default: original size)
+        workers: Decode processes (default: CPU count)
+
+    Returns:
+        out_path as a Path.
+    """
+    _require_pillow()
+    frames = iter_decoded(paths, size, "P", workers)
+    try:
+        first = next(frames)
+    except StopIteration:
+        raise ValueError("build_gif needs at least one frame")
+    out_path = Path(out_path)
+    first.save(
+        out_path, format="GIF", save_all=True, append_images=frames,
+        duration=duration_ms, loop=loop, disposal=2, optimize=False
+    )
+    return out_path
+
+
+def contact_sheet_for_result(
+    output_dir: Union[str, Path],
+    result: RenderResult,
+    out_path: Optional[Union[str, Path]] = None,
+    **kwargs
+):
+    """Build a contact sheet from a result's preview images, labelled by angle.
+
+    Defaults to ``{job_id}/contact_sheet.png`` in output_dir; an existing
+    in-Blender sheet in preview_files is skipped. Other keyword arguments
+    go to build_contact_sheet.
+    """
+    output_dir = Path(output_dir)
+    previews = [p for p in result.preview_files if Path(p).name != SHEET_FILE_NAME]
+    if out_path is None:
+        out_path = output_dir / result.job_id / SHEET_FILE_NAME
+    return build_contact_sheet(
+        [output_dir / p for p in previews],
+        labels=[Path(p).stem for p in previews],
+        out_path=out_path,
+        **kwargs
+    )
+
+
+def animation_frame_paths(output_dir: Union[str, Path], result: RenderResult, angle: str) -> List[Path]:
+    """Frame PNGs of one animation angle, in frame order."""
+    frames = frame_files(Path(output_dir) / result.job_id / f"frames_{angle}")
+    return [frames[n] for n in sorted(frames)]
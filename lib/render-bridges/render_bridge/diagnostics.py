@@ -1,14 +1,100 @@
 """
 Animation diagnostic script for render bridge.
 Checks armature setup, vertex deformation, and action assignment.
+
+The script writes its results to ``diagnostics.json`` in the job's output
+directory (``$RENDER_JOB_OUTPUT_DIR``, set by the watcher). It also prints
+them between markers tagged with the job id, which the bridge only looks
+for in the tail of ``render-watcher.log`` when the file is missing.
+
+Given ``-- --blend-files <list>`` it instead opens each listed file in turn
+in the same Blender session and writes ``diagnostics/{index:05d}.json`` as
+each one finishes (tagged ``{job_id}:{index}`` in the log).
+
+Results can be cached under ``diagnostics_key``: the file's contents plus
+``SCRIPT_VERSION``, so editing this script invalidates every entry.
 """
 
-DIAGNOSTIC_SCRIPT = '''
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .cache import file_digest
+
+DIAGNOSTICS_FILE_NAME = "diagnostics.json"
+# Batch mode (diagnose_many): one file per input, {index:05d}.json, in this subdir
+DIAGNOSTICS_DIR_NAME = "diagnostics"
+
+# How much of the end of render-watcher.log the fallback reads
+LOG_TAIL_BYTES = 1024 * 1024
+
+# Pure NumPy part of the deformation test, kept separate so it can be
+# exercised without Blender
+DEFORMATION_STATS_SOURCE = '''
+import numpy as np
+
+DEFORMATION_SAMPLE_FRAMES = 5
+MOVE_EPSILON = 1e-4
+
+def deformation_stats(local_coords, matrices, vertex_groups, epsilon=MOVE_EPSILON):
+    """Per-vertex displacement over sampled frames, relative to the first one.
+
+    local_coords: (frames, vertices, 3) evaluated object-space coordinates
+    matrices: (frames, 4, 4) object world matrices
+    vertex_groups: {name: vertex indices}
+    """
+    local_coords = np.asarray(local_coords, dtype=np.float32)
+    matrices = np.asarray(matrices, dtype=np.float32)
+    # One batched matmul over every frame: (F, V, 3) @ (F, 3, 3) + (F, 1, 3)
+    world = local_coords @ matrices[:, :3, :3].transpose(0, 2, 1) + matrices[:, None, :3, 3]
+    displacement = np.linalg.norm(world - world[:1], axis=2).max(axis=0)
+
+    groups = {}
+    for name, indices in vertex_groups.items():
+        indices = np.asarray(indices, dtype=np.int64)
+        if indices.size == 0:
+            continue
+        moved = displacement[indices]
+        groups[name] = {
+            "vertices": int(indices.size),
+            "max_displacement": round(float(moved.max()), 6),
+            "mean_displacement": round(float(moved.mean()), 6)
+        }
+
+    stats = {
+        "vertex_count": int(displacement.size),
+        "max_displacement": round(float(displacement.max()), 6) if displacement.size else 0.0,
+        "mean_displacement": round(float(displacement.mean()), 6) if displacement.size else 0.0,
+        "vertices_moved_count": int((displacement > epsilon).sum()),
+        "vertex_groups": groups
+    }
+    return stats, world
+'''
+
+DIAGNOSTIC_SCRIPT = DEFORMATION_STATS_SOURCE + '''
 import bpy
 import json
+import os
+import sys
 from mathutils import Vector
 
-def run_diagnostics():
+def sample_frames(action, count):
+    start, end = int(action.frame_range[0]), int(action.frame_range[1])
+    return sorted({int(round(f)) for f in np.linspace(start, end, max(count, 2))})
+
+def vertex_group_members(mesh_obj):
+    # One pass over the weights; the per-frame work below is all NumPy
+    members = [[] for _ in mesh_obj.vertex_groups]
+    for v in mesh_obj.data.vertices:
+        for g in v.groups:
+            if g.weight > 0 and g.group < len(members):
+                members[g.group].append(v.index)
+    return {vg.name: members[vg.index] for vg in mesh_obj.vertex_groups}
+
+def run_diagnostics(sample_count=DEFORMATION_SAMPLE_FRAMES):
     results = {
         "status": "ok",
         "issues": [],
@@ -111,48 +197,160 @@ def run_diagnostics():
                         track.mute = True
                 
                 scene = bpy.context.scene
-                test_frames = [int(test_action.frame_range[0]), int(test_action.frame_range[1])]
-                
-                vertex_positions = {}
-                for frame in test_frames:
+                test_frames = sample_frames(test_action, sample_count)
+                vertex_count = len(mesh_obj.data.vertices)
+                local_coords = np.empty((len(test_frames), vertex_count, 3), dtype=np.float32)
+                matrices = np.empty((len(test_frames), 4, 4), dtype=np.float32)
+                topology_changed = False
+                for i, frame in enumerate(test_frames):
                     scene.frame_set(frame)
                     bpy.context.view_layer.update()
                     depsgraph = bpy.context.evaluated_depsgraph_get()
                     eval_obj = mesh_obj.evaluated_get(depsgraph)
                     
-                    # Sample first 10 and some leg vertices
-                    positions = []
-                    for i in [0, 1, 2, len(eval_obj.data.vertices)//2]:
-                        if i < len(eval_obj.data.vertices):
-                            v = eval_obj.data.vertices[i]
-                            co = eval_obj.matrix_world @ v.co
-                            positions.append([round(co.x, 4), round(co.y, 4), round(co.z, 4)])
-                    vertex_positions[frame] = positions
-                
-                # Check if vertices moved
-                f1, f2 = test_frames
-                moved = vertex_positions[f1] != vertex_positions[f2]
-                
-                results["vertex_deformation_test"] = {
-                    "action_tested": test_action.name,
-                    "frames_tested": test_frames,
-                    "vertices_moved": moved,
-                    "frame_1_positions": vertex_positions[f1],
-                    "frame_2_positions": vertex_positions[f2]
-                }
+                    # All evaluated coordinates in one call, no per-vertex Python
+                    if len(eval_obj.data.vertices) != vertex_count:
+                        topology_changed = True
+                        break
+                    eval_obj.data.vertices.foreach_get("co", local_coords[i].ravel())
+                    matrices[i] = np.array(eval_obj.matrix_world, dtype=np.float32)
                 
-                if not moved:
-                    results["issues"].append("Vertex deformation test FAILED - vertices not moving between frames")
-                    results["status"] = "error"
+                if topology_changed:
+                    results["warnings"].append(
+                        f"Mesh '{mesh_obj.name}' changes vertex count when evaluated - deformation test skipped")
+                else:
+                    stats, world = deformation_stats(local_coords, matrices, vertex_group_members(mesh_obj))
+                    moved = stats["vertices_moved_count"] > 0
+                    
+                    # Same four sample vertices as before, for existing consumers
+                    sample = [i for i in (0, 1, 2, vertex_count // 2) if i < vertex_count]
+                    results["vertex_deformation_test"] = {
+                        "action_tested": test_action.name,
+                        "frames_tested": test_frames,
+                        "vertices_moved": moved,
+                        "frame_1_positions": np.round(world[0, sample], 4).tolist(),
+                        "frame_2_positions": np.round(world[-1, sample], 4).tolist(),
+                        **stats
+                    }
+                    
+                    if not moved:
+                        results["issues"].append("Vertex deformation test FAILED - vertices not moving between frames")
+                        results["status"] = "error"
             
             # Restore original pose position
             armature.data.pose_position = original_pose
 
     return results
 
+CONTAINER_ROOT = "/workspaces/frontline-forge/"
+
+def script_arg(name):
+    argv = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else []
+    if name in argv and argv.index(name) + 1 < len(argv):
+        return argv[argv.index(name) + 1]
+    return None
+
+def host_path(path):
+    # Same mapping as the watcher's Convert-ContainerPath
+    root = os.environ.get("RENDER_REPO_ROOT")
+    if not root or os.path.exists(path):
+        return path
+    if path.startswith(CONTAINER_ROOT):
+        path = path[len(CONTAINER_ROOT):]
+    return os.path.join(root, *path.strip("/").split("/"))
+
+def write_results(results, name):
+    output_dir = os.environ.get("RENDER_JOB_OUTPUT_DIR")
+    if not output_dir:
+        return
+    path = os.path.join(output_dir, *name.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = os.path.join(os.path.dirname(path), "." + os.path.basename(path) + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    os.replace(tmp_path, path)
+
+def print_results(results, tag):
+    print(f"=== DIAGNOSTIC_JSON_START {tag} ===")
+    print(json.dumps(results, indent=2))
+    print(f"=== DIAGNOSTIC_JSON_END {tag} ===", flush=True)
+
+def diagnose_files(list_file, job_id, sample_count):
+    # Batch mode: one Blender session, each file opened in turn
+    with open(host_path(list_file), encoding="utf-8") as f:
+        blend_files = [line.rstrip("\\n") for line in f if line.strip()]
+    for i, blend_file in enumerate(blend_files):
+        try:
+            bpy.ops.wm.open_mainfile(filepath=host_path(blend_file), load_ui=False)
+            results = run_diagnostics(sample_count)
+        except Exception as e:
+            results = {
+                "status": "error", "issues": [f"Could not diagnose: {e}"], "warnings": [],
+                "armatures": [], "meshes": [], "actions": [], "vertex_deformation_test": None
+            }
+        results["blend_file"] = blend_file
+        write_results(results, f"diagnostics/{i:05d}.json")
+        print_results(results, f"{job_id}:{i}")
+
 # Run and output
-results = run_diagnostics()
-print("=== DIAGNOSTIC_JSON_START ===")
-print(json.dumps(results, indent=2))
-print("=== DIAGNOSTIC_JSON_END ===")
+job_id = script_arg("--job-id") or os.environ.get("RENDER_JOB_ID", "")
+sample_count = int(script_arg("--sample-frames") or DEFORMATION_SAMPLE_FRAMES)
+if script_arg("--blend-files"):
+    diagnose_files(script_arg("--blend-files"), job_id, sample_count)
+else:
+    results = run_diagnostics(sample_count)
+    write_results(results, "diagnostics.json")
+    print_results(results, job_id)
 '''
+
+# Cached diagnostics are only reused with the script that produced them
+SCRIPT_VERSION = hashlib.sha256(DIAGNOSTIC_SCRIPT.encode("utf-8")).hexdigest()
+
+
+def diagnostics_key(blend_file: str, sample_frames: Optional[int] = None) -> Optional[str]:
+    """Cache key for a file's diagnostics, or None if it can't be hashed locally."""
+    try:
+        digest = file_digest(Path(blend_file))
+    except OSError:
+        return None
+    params = {"diagnostics": SCRIPT_VERSION, "blend_file": digest, "sample_frames": sample_frames}
+    canonical = json.dumps(params, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def empty_diagnostics(issue: str) -> Dict[str, Any]:
+    """Error result in the diagnostics schema."""
+    return {
+        "status": "error",
+        "issues": [issue],
+        "warnings": [],
+        "armatures": [],
+        "meshes": [],
+        "actions": [],
+        "vertex_deformation_test": None
+    }
+
+
+def read_log_tail(log_file: Path, max_bytes: int = LOG_TAIL_BYTES) -> str:
+    """Last max_bytes of a log file (seeks instead of reading it all)."""
+    with open(log_file, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(size - max_bytes, 0))
+        return f.read().decode("utf-8", errors="ignore")
+
+
+def parse_diagnostics_log(text: str, job_id: str) -> Optional[Dict[str, Any]]:
+    """The last diagnostics block printed for job_id, if any."""
+    tag = re.escape(job_id)
+    matches = re.findall(
+        rf'=== DIAGNOSTIC_JSON_START {tag} ===\s*\n(.*?)\n=== DIAGNOSTIC_JSON_END {tag} ===',
+        text,
+        re.DOTALL
+    )
+    if not matches:
+        return None
+    try:
+        return json.loads(matches[-1])
+    except json.JSONDecodeError:
+        return None
@@ -0,0 +1,168 @@
+"""
+Structured job events for the render bridges.
+
+RenderBridge reports what it does (submissions, completions, timeouts,
+cache hits...) as events on an EventBus instead of printing. Emitting
+with no subscribers is a single dict lookup, so bulk submission pays
+nothing for it.
+
+Usage:
+    bridge = RenderBridge()
+    bridge.events.on_complete(lambda e: print(e.job_id, e.data["status"]))
+
+    log = EventLog(capacity=1000, path=Path("render-events.jsonl"))
+    bridge.events.subscribe(log)            # every event
+    print(log.to_jsonl())
+
+    bridge.events.subscribe(print_event)    # the old console output
+"""
+
+import collections
+import json
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+# Event names
+SUBMIT = "submit"
+SUBMIT_BATCH = "submit_batch"
+COMPLETE = "complete"  # data["status"]: complete / failed (Blender), success / error (Godot)
+TIMEOUT = "timeout"
+RETRY = "retry"  # result file unreadable for now; re-read on the next poll
+CACHE_HIT = "cache_hit"
+COALESCED = "coalesced"  # joined an identical job already in flight
+ERROR = "error"
+
+Subscriber = Callable[["Event"], None]
+
+
+@dataclass
+class Event:
+    name: str
+    job_id: Optional[str] = None
+    time: float = 0.0
+    data: Dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"event": self.name, "job_id": self.job_id, "time": self.time, **self.data},
+            default=str,
+            separators=(",", ":"),
+        )
+
+
+class EventBus:
+    """Dispatches events to subscribers, synchronously on the emitting thread.
+
+    Subscriber lists are replaced rather than mutated, so emit() never
+    takes a lock. A subscriber that raises is reported on stderr and
+    doesn't affect the bridge or other subscribers.
+    """
+
+    def __init__(self):
+        self._by_name: Dict[str, Tuple[Subscriber, ...]] = {}
+        self._all: Tuple[Subscriber, ...] = ()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Subscriber, *names: str) -> Subscriber:
+        """Call callback for the named events (all events if none are given)."""
+        with self._lock:
+            if not names:
+                self._all = self._all + (callback,)
+            else:
+                by_name = dict(self._by_name)
+                for name in names:
+                    by_name[name] = by_name.get(name, ()) + (callback,)
+                self._by_name = by_name
+        return callback
+
+    def unsubscribe(self, callback: Subscriber):
+        with self._lock:
+            self._all = tuple(cb for cb in self._all if cb != callback)
+            by_name = {}
+            for name, callbacks in self._by_name.items():
+                remaining = tuple(cb for cb in callbacks if cb != callback)
+                if remaining:
+                    by_name[name] = remaining
+            self._by_name = by_name
+
+    def on_submit(self, callback: Subscriber) -> Subscriber:
+        return self.subscribe(callback, SUBMIT, SUBMIT_BATCH)
+
+    def on_complete(self, callback: Subscriber) -> Subscriber:
+        return self.subscribe(callback, COMPLETE)
+
+    def on_timeout(self, callback: Subscriber) -> Subscriber:
+        return self.subscribe(callback, TIMEOUT)
+
+    def on_retry(self, callback: Subscriber) -> Subscriber:
+        return self.subscribe(callback, RETRY)
+
+    def wants(self, name: str) -> bool:
+        """True if emitting name would reach anyone."""
+        return bool(self._all) or name in self._by_name
+
+    def emit(self, name: str, job_id: Optional[str] = None, **data) -> bool:
+        """Deliver an event. Returns False (having built nothing) if nobody listens."""
+        named = self._by_name.get(name, ())
+        everyone = self._all
+        if not named and not everyone:
+            return False
+        event = Event(name, job_id, time.time(), data)
+        for callback in named + everyone:
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"[RenderBridge] Event subscriber failed on {name}: {e}", file=sys.stderr)
+        return True
+
+
+class EventLog:
+    """Ring buffer of the most recent events, optionally appended to a JSON-lines file.
+
+    Args:
+        capacity: Events kept in memory.
+        path: If set, every event is also appended to this file.
+    """
+
+    def __init__(self, capacity: int = 1000, path: Optional[Path] = None):
+        self._events: Deque[Event] = collections.deque(maxlen=capacity)
+        self.path = Path(path) if path else None
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event):
+        with self._lock:
+            self._events.append(event)
+            if self.path is not None:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(event.to_json() + "\n")
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def events(self, name: Optional[str] = None) -> List[Event]:
+        with self._lock:
+            return [e for e in self._events if name is None or e.name == name]
+
+    def to_jsonl(self) -> str:
+        return "".join(e.to_json() + "\n" for e in self.events())
+
+    def clear(self):
+        with self._lock:
+            self._events.clear()
+
+
+def print_event(event: Event):
+    """Console subscriber reproducing the bridge's former print output."""
+    if event.name == SUBMIT:
+        print(f"[RenderBridge] Submitted job {event.job_id}")
+    elif event.name == SUBMIT_BATCH:
+        print(f"[RenderBridge] Submitted batch {event.data.get('batch_id')} ({event.data.get('jobs')} jobs)")
+    elif event.name == ERROR:
+        print(f"[RenderBridge] Error reading result for {event.job_id}: {event.data.get('error')}")
+    else:
+        print(f"[RenderBridge] {event.name} {event.job_id or ''} {event.data or ''}".rstrip())
@@ -0,0 +1,126 @@
+"""
+Filesystem helpers shared by the bridge and its consumers.
+"""
+
+import os
+import shutil
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, List, Tuple
+
+
+def temp_path_for(path: Path) -> Path:
+    """Return a hidden sibling temp path for ``path``.
+
+    The name starts with '.' and ends with '.tmp' so queue and output scans
+    (``*.json``, ``*.result.json``, ``*.batch``) never match it.
+    """
+    path = Path(path)
+    return path.with_name(f".{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+
+
+def atomic_write_text(path: Path, text: str, encoding: str = "utf-8"):
+    """Write text to a temp file in the same directory, then rename it into place.
+
+    Readers either see the previous file (or nothing) or the complete new
+    file, never a partial write.
+    """
+    path = Path(path)
+    tmp_path = temp_path_for(path)
+    try:
+        with open(tmp_path, "w", encoding=encoding) as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def link_or_copy(src: Path, dst: Path):
+    """Hardlink src to dst, falling back to a copy (e.g. across devices)."""
+    dst = Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if dst.exists():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+# ioctl(FICLONE) - copy-on-write clone on btrfs/XFS (Linux only)
+_FICLONE = 0x40049409
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    if sys.platform != "linux":
+        return False
+    try:
+        import fcntl
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        return True
+    except (OSError, ImportError):
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        return False
+
+
+def publish_file(src: Path, dst: Path, move: bool = False) -> str:
+    """Put src at dst without rewriting its bytes when the filesystem allows.
+
+    Tries, in order: rename (``move=True`` only), reflink, hardlink, and
+    finally a copy (e.g. across devices). dst is replaced atomically
+    in every case. With ``move=False`` src is left in place.
+
+    Returns:
+        How the file was published: "moved", "reflinked", "linked" or "copied".
+    """
+    src, dst = Path(src), Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    if move:
+        try:
+            os.replace(src, dst)
+            return "moved"
+        except OSError:
+            pass  # e.g. EXDEV; fall through to a copy
+
+    tmp_path = temp_path_for(dst)
+    try:
+        if _reflink(src, tmp_path):
+            method = "reflinked"
+        else:
+            try:
+                os.link(src, tmp_path)
+                method = "linked"
+            except OSError:
+                shutil.copy2(src, tmp_path)  # sendfile where available
+                method = "copied"
+        os.replace(tmp_path, dst)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    return method
+
+
+def publish_files(
+    pairs: Iterable[Tuple[Path, Path]],
+    move: bool = False,
+    max_workers: int = 8
+) -> List[str]:
+    """publish_file for many (src, dst) pairs in parallel; methods in input order."""
+    pairs = list(pairs)
+    if len(pairs) <= 1:
+        return [publish_file(src, dst, move) for src, dst in pairs]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pairs))) as pool:
+        return list(pool.map(lambda pair: publish_file(pair[0], pair[1], move), pairs))
@@ -0,0 +1,269 @@
+"""
+Load rendered animation frames into NumPy arrays and build sprite sheets.
+
+Animation jobs write ``{job_id}/frames_{angle}/frame_NNNN.png``. Jobs with
+``raw_frames=True`` additionally write each rendered range as one raw
+segment next to the PNGs:
+
+    frames_{angle}/frames_{start:04d}-{end:04d}.rgba   uint8 RGBA, (N, H, W, 4), top row first
+    frames_{angle}/frames_{start:04d}-{end:04d}.json   {"width", "height", "channels", "frame_start", "frame_end"}
+
+A range covered by a single segment is returned as a read-only memory map
+(no decode, no copy). Otherwise frames are copied or decoded into one
+preallocated array. PNG decoding needs Pillow; NumPy is required for all
+of it.
+
+Usage:
+    frames, start, end = load_frames(bridge.output_dir / job_id / "frames_side")
+    sheet = sprite_sheet(frames, columns=8, padding=2)
+    Path("walk_side.png").write_bytes(encode_png(sheet))
+"""
+
+import json
+import math
+import re
+import struct
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+RAW_SUFFIX = ".rgba"
+_FRAME_RE = re.compile(r"^frame_(-?\d+)\.png$")
+_SEGMENT_RE = re.compile(r"^frames_(-?\d+)-(-?\d+)\.json$")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("render_bridge.frames needs numpy")
+
+
+def raw_segment_stem(frame_start: int, frame_end: int) -> str:
+    """File stem of the raw segment holding frame_start..frame_end."""
+    return f"frames_{frame_start:04d}-{frame_end:04d}"
+
+
+def frame_files(frames_dir: Path) -> Dict[int, Path]:
+    """Map frame number to PNG path for a ``frames_{angle}`` directory."""
+    frames = {}
+    for path in Path(frames_dir).glob("frame_*.png"):
+        match = _FRAME_RE.match(path.name)
+        if match:
+            frames[int(match.group(1))] = path
+    return frames
+
+
+def raw_segments(frames_dir: Path) -> List[Dict]:
+    """Headers of the raw segments in a frames directory, by frame_start.
+
+    Each header gets a ``path`` key pointing at its ``.rgba`` file.
+    Segments whose data file is missing or too short are ignored.
+    """
+    segments = []
+    for header_path in Path(frames_dir).glob("frames_*.json"):
+        if not _SEGMENT_RE.match(header_path.name):
+            continue
+        try:
+            header = json.loads(header_path.read_text(encoding="utf-8"))
+            data_path = header_path.with_suffix(RAW_SUFFIX)
+            count = header["frame_end"] - header["frame_start"] + 1
+            expected = count * header["height"] * header["width"] * header.get("channels", 4)
+            if data_path.stat().st_size < expected:
+                continue
+        except (OSError, ValueError, KeyError, TypeError):
+            continue
+        header["path"] = data_path
+        segments.append(header)
+    return sorted(segments, key=lambda s: s["frame_start"])
+
+
+def _map_segment(segment: Dict):
+    count = segment["frame_end"] - segment["frame_start"] + 1
+    shape = (count, segment["height"], segment["width"], segment.get("channels", 4))
+    return np.memmap(segment["path"], dtype=np.uint8, mode="r", shape=shape)
+
+
+def decode_png(path: Path, out=None):
+    """Decode a PNG into an (H, W, 4) uint8 array, writing into ``out`` if given."""
+    _require_numpy()
+    if Image is None:
+        raise ImportError("Decoding PNG frames needs Pillow; render with raw_frames=True to avoid it")
+    with Image.open(path) as image:
+        pixels = np.asarray(image.convert("RGBA"))
+    if out is None:
+        return pixels.copy()
+    out[...] = pixels
+    return out
+
+
+def load_frames(
+    frames_dir: Path,
+    frame_start: Optional[int] = None,
+    frame_end: Optional[int] = None,
+    out=None
+):
+    """Load a frame range from a ``frames_{angle}`` directory.
+
+    Args:
+        frames_dir: Directory holding frame_NNNN.png and/or raw segments
+        frame_start: First frame (default: first frame present)
+        frame_end: Last frame (default: last frame present)
+        out: Optional preallocated (N, H, W, 4) uint8 array to fill
+
+    Returns:
+        Tuple of (frames, frame_start, frame_end). frames is a read-only
+        memory map when one raw segment covers the range and no ``out``
+        was given, otherwise ``out`` or a newly allocated array.
+
+    Raises:
+        FileNotFoundError: If a frame in the range is missing.
+    """
+    _require_numpy()
+    frames_dir = Path(frames_dir)
+    segments = raw_segments(frames_dir)
+    pngs = frame_files(frames_dir)
+
+    present = set(pngs)
+    for segment in segments:
+        present.update(range(segment["frame_start"], segment["frame_end"] + 1))
+    if not present:
+        raise FileNotFoundError(f"No frames in {frames_dir}")
+    start = min(present) if frame_start is None else frame_start
+    end = max(present) if frame_end is None else frame_end
+    count = end - start + 1
+
+    # Zero copy: one segment covers the whole range
+    if out is None:
+        for segment in segments:
+            if segment["frame_start"] <= start and end <= segment["frame_end"]:
+                offset = start - segment["frame_start"]
+                return _map_segment(segment)[offset:offset + count], start, end
+
+    frame = start
+    while frame <= end:
+        segment = next((s for s in segments if s["frame_start"] <= frame <= s["frame_end"]), None)
+        if segment is not None:
+            mapped = _map_segment(segment)
+            if out is None:
+                out = np.empty((count,) + mapped.shape[1:], dtype=np.uint8)
+            stop = min(end, segment["frame_end"])
+            offset = segment["frame_start"]
+            out[frame - start:stop - start + 1] = mapped[frame - offset:stop - offset + 1]
+            frame = stop + 1
+            continue
+
+        path = pngs.get(frame)
+        if path is None:
+            raise FileNotFoundError(f"Frame {frame} missing from {frames_dir}")
+        if out is None:
+            first = decode_png(path)
+            out = np.empty((count,) + first.shape, dtype=np.uint8)
+            out[0] = first
+        else:
+            decode_png(path, out[frame - start])
+        frame += 1
+
+    return out, start, end
+
+
+def _grid(count: int, columns: Optional[int]) -> Tuple[int, int]:
+    columns = max(1, min(columns or math.ceil(math.sqrt(count)), count))
+    return math.ceil(count / columns), columns
+
+
+def sprite_sheet(frames, columns: Optional[int] = None, padding: int = 0, background: int = 0):
+    """Lay out (N, H, W, C) frames row-major in a grid, with one copy.
+
+    Args:
+        frames: Frame array, e.g. from load_frames
+        columns: Frames per row (default: square-ish grid)
+        padding: Pixels between cells
+        background: Fill value for padding and empty cells
+
+    Returns:
+        (rows * (H + padding) - padding, columns * (W + padding) - padding, C) array.
+    """
+    _require_numpy()
+    count, height, width, channels = frames.shape
+    rows, columns = _grid(count, columns)
+    grid = np.full((rows, height + padding, columns, width + padding, channels), background, dtype=frames.dtype)
+
+    full_rows = count // columns
+    if full_rows:
+        grid[:full_rows, :height, :, :width] = (
+            frames[:full_rows * columns].reshape(full_rows, columns, height, width, channels).transpose(0, 2, 1, 3, 4)
+        )
+    rest = count - full_rows * columns
+    if rest:
+        grid[full_rows, :height, :rest, :width] = frames[full_rows * columns:].transpose(1, 0, 2, 3)
+
+    sheet = grid.reshape(rows * (height + padding), columns * (width + padding), channels)
+    return sheet[:sheet.shape[0] - padding, :sheet.shape[1] - padding]
+
+
+def sprite_rects(count: int, height: int, width: int, columns: Optional[int] = None, padding: int = 0) -> List[Tuple[int, int, int, int]]:
+    """(x, y, width, height) of each frame in a sprite_sheet with the same layout."""
+    _, columns = _grid(count, columns)
+    return [
+        ((i % columns) * (width + padding), (i // columns) * (height + padding), width, height)
+        for i in range(count)
+    ]
+
+
+def sprite_atlas(animations: Dict[str, "np.ndarray"], padding: int = 0, background: int = 0):
+    """Pack several animations into one atlas, one animation per row.
+
+    Args:
+        animations: Name -> (N, H, W, C) frames; all must share H, W and C
+        padding: Pixels between cells
+        background: Fill value for padding and empty cells
+
+    Returns:
+        Tuple of (atlas array, {name: [(x, y, width, height), ...]}).
+    """
+    _require_numpy()
+    arrays = list(animations.values())
+    if not arrays:
+        raise ValueError("sprite_atlas needs at least one animation")
+    _, height, width, channels = arrays[0].shape
+    columns = max(len(a) for a in arrays)
+    atlas = np.full(
+        (len(arrays) * (height + padding) - padding, columns * (width + padding) - padding, channels),
+        background, dtype=arrays[0].dtype
+    )
+    rects = {}
+    for row, (name, frames) in enumerate(animations.items()):
+        if frames.shape[1:] != (height, width, channels):
+            raise ValueError(f"Animation {name!r} has frame shape {frames.shape[1:]}, expected {(height, width, channels)}")
+        y = row * (height + padding)
+        strip = sprite_sheet(frames, columns=len(frames), padding=padding, background=background)
+        atlas[y:y + height, :strip.shape[1]] = strip
+        rects[name] = [(x, y, w, h) for x, _, w, h in sprite_rects(len(frames), height, width, len(frames), padding)]
+    return atlas, rects
+
+
+def encode_png(pixels, compress_level: int = 6) -> bytes:
+    """Encode an (H, W, 4) or (H, W, 3) uint8 array as PNG (no Pillow needed)."""
+    _require_numpy()
+    height, width, channels = pixels.shape
+    color_type = {3: 2, 4: 6}[channels]
+    # Filter byte 0 (None) in front of every row
+    raw = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    raw[:, 1:] = np.asarray(pixels, dtype=np.uint8).reshape(height, width * channels)
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw.tobytes(), compress_level)) + chunk(b"IEND", b""))
@@ -0,0 +1,172 @@
+"""
+Persistent job index for the render queue.
+
+Listing jobs by globbing ``temp/render-queue`` and ``temp/render-output``
+costs a walk over every file on the bind mount. The index records submit,
+complete and cleanup events in a small SQLite database instead, so
+listings and age-based cleanup only touch jobs whose state can still
+change (the pending ones).
+
+The Windows watcher never writes the index: completions are discovered by
+checking the result file of each pending job (see RenderBridge.sync_index).
+Jobs submitted by clients that don't use the index are picked up by
+``rebuild()``, which is also run automatically when the database is new.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+
+INDEX_FILE_NAME = "render-index.sqlite"
+SCHEMA_VERSION = 1
+
+PENDING = "pending"
+COMPLETE = "complete"
+
+
+def default_index_path(base_dir: Optional[Path] = None) -> Path:
+    """Index location for a bridge base dir: ``<base_dir>/temp/render-index.sqlite``."""
+    from .bridge import _resolve_base_dir
+
+    return _resolve_base_dir(base_dir) / "temp" / INDEX_FILE_NAME
+
+
+class JobIndex:
+    """SQLite-backed record of job states.
+
+    Safe to share between threads; several processes may use the same file
+    (SQLite serializes writers).
+
+    Args:
+        path: Database file. Created, or recreated if unreadable.
+
+    Attributes:
+        created: True if the database was (re)created by this instance and
+            should be populated with ``rebuild()``.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        try:
+            self._conn = self._open()
+        except sqlite3.DatabaseError:
+            # Corrupt or foreign file: the index is derived data, start over
+            self.path.unlink()
+            self._conn = self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False, isolation_level=None)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        self.created = version != SCHEMA_VERSION
+        if self.created:
+            conn.executescript(f"""
+                DROP TABLE IF EXISTS jobs;
+                CREATE TABLE jobs (
+                    job_id TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    priority TEXT NOT NULL DEFAULT 'normal',
+                    submitted_at REAL,
+                    completed_at REAL
+                );
+                CREATE INDEX jobs_state ON jobs (state, completed_at);
+                PRAGMA user_version = {SCHEMA_VERSION};
+            """)
+        return conn
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _write(self, sql: str, rows: Iterable[tuple]):
+        rows = list(rows)
+        if not rows:
+            return
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(sql, rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # Events
+
+    def record_submit(self, jobs: Iterable[Tuple[str, str]], at: Optional[float] = None):
+        """Record (job_id, priority) pairs as pending (one transaction)."""
+        at = time.time() if at is None else at
+        self._write(
+            "INSERT OR REPLACE INTO jobs (job_id, state, priority, submitted_at, completed_at) "
+            "VALUES (?, 'pending', ?, ?, NULL)",
+            ((job_id, priority, at) for job_id, priority in jobs),
+        )
+
+    def record_complete(self, jobs: Iterable[Tuple[str, float]]):
+        """Record (job_id, completed_at) pairs as complete."""
+        self._write(
+            "INSERT INTO jobs (job_id, state, completed_at) VALUES (?, 'complete', ?) "
+            "ON CONFLICT(job_id) DO UPDATE SET state = 'complete', completed_at = excluded.completed_at",
+            jobs,
+        )
+
+    def record_cleanup(self, job_ids: Iterable[str]):
+        """Forget jobs whose files have been removed."""
+        self._write("DELETE FROM jobs WHERE job_id = ?", ((job_id,) for job_id in job_ids))
+
+    # Queries
+
+    def pending(self) -> List[str]:
+        return [row[0] for row in self._query(
+            "SELECT job_id FROM jobs WHERE state = 'pending' ORDER BY submitted_at, job_id")]
+
+    def completed(self) -> List[str]:
+        return [row[0] for row in self._query(
+            "SELECT job_id FROM jobs WHERE state = 'complete' ORDER BY completed_at, job_id")]
+
+    def completed_before(self, cutoff: float) -> List[str]:
+        """Completed jobs whose result landed before the cutoff timestamp."""
+        return [row[0] for row in self._query(
+            "SELECT job_id FROM jobs WHERE state = 'complete' AND completed_at < ? ORDER BY completed_at",
+            (cutoff,))]
+
+    def state(self, job_id: str) -> Optional[str]:
+        rows = self._query("SELECT state FROM jobs WHERE job_id = ?", (job_id,))
+        return rows[0][0] if rows else None
+
+    def __len__(self) -> int:
+        return self._query("SELECT COUNT(*) FROM jobs")[0][0]
+
+    def replace_all(self, pending: Iterable[Tuple[str, str, float]], complete: Iterable[Tuple[str, float]]):
+        """Replace the whole index in one transaction (used by rebuilds).
+
+        Args:
+            pending: (job_id, priority, submitted_at) triples.
+            complete: (job_id, completed_at) pairs; win over pending entries.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM jobs")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO jobs (job_id, state, priority, submitted_at) VALUES (?, 'pending', ?, ?)",
+                    pending,
+                )
+                self._conn.executemany(
+                    "INSERT INTO jobs (job_id, state, completed_at) VALUES (?, 'complete', ?) "
+                    "ON CONFLICT(job_id) DO UPDATE SET state = 'complete', completed_at = excluded.completed_at",
+                    complete,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            self.created = False
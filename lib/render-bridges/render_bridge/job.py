@@ -2,13 +2,17 @@
 Render job and result data structures.
 """
 
+import hashlib
 import json
+import time
 import uuid
 from dataclasses import dataclass, field, asdict
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from enum import Enum
 from pathlib import Path
 
+from .fileio import atomic_write_text
+
 
 class RenderEngine(Enum):
     EEVEE = "BLENDER_EEVEE"  # Note: was BLENDER_EEVEE_NEXT in Blender 4.x
@@ -29,6 +33,51 @@ class JobStatus(Enum):
     FAILED = "failed"
 
 
+class JobPriority(Enum):
+    INTERACTIVE = "interactive"  # someone is waiting on it (previews, single assets)
+    NORMAL = "normal"
+    BULK = "bulk"  # batch regeneration, long animations
+
+
+# Lower rank is picked first
+PRIORITY_RANK = {
+    JobPriority.INTERACTIVE.value: 0,
+    JobPriority.NORMAL.value: 1,
+    JobPriority.BULK.value: 2,
+}
+
+
+# Job lifecycle timestamps (unix seconds) carried in RenderResult.timestamps:
+# submitted (bridge), claimed / process_started / render_finished /
+# result_written (watcher), observed (bridge, when it reads the result)
+PHASES = ("submitted", "claimed", "process_started", "render_finished", "result_written", "observed")
+
+
+def queue_filename(job_id: str, priority: str = JobPriority.NORMAL.value) -> str:
+    """Queue file name for a job.
+    
+    The priority is encoded in the name so a consumer can order the queue
+    from a directory listing alone. Normal jobs keep the plain
+    ``{job_id}.json`` name; others are ``{job_id}.{priority}.json``.
+    """
+    if priority not in PRIORITY_RANK:
+        raise ValueError(f"Unknown job priority: {priority!r}")
+    if priority == JobPriority.NORMAL.value:
+        return f"{job_id}.json"
+    return f"{job_id}.{priority}.json"
+
+
+def parse_queue_filename(name: str) -> Optional[Tuple[str, str]]:
+    """Return (job_id, priority) for a queue file name, or None if it isn't one."""
+    if not name.endswith(".json") or name.startswith("."):
+        return None
+    stem = name[:-len(".json")]
+    job_id, _, suffix = stem.rpartition(".")
+    if job_id and suffix in PRIORITY_RANK:
+        return job_id, suffix
+    return stem, JobPriority.NORMAL.value
+
+
 @dataclass
 class RenderJob:
     """A render job to be processed by the Windows host."""
@@ -60,7 +109,7 @@ class RenderJob:
         "top", "bottom"
     ])
     preview_resolution: int = 512
-    generate_contact_sheet: bool = False  # Contact sheets generated on Linux side with labels
+    generate_contact_sheet: bool = False  # In-Blender sheet; render_bridge.contact_sheet builds labelled ones on Linux
     
     # Animation options
     render_animation: bool = False
@@ -68,17 +117,90 @@ class RenderJob:
     frame_end: Optional[int] = None
     action_name: Optional[str] = None  # Name of action to play (e.g., "Walk", "Idle")
     animation_angles: List[str] = field(default_factory=lambda: ["front34", "side", "top"])
+    # Also write each angle's frames as a raw RGBA segment (see render_bridge.frames)
+    raw_frames: bool = False
+    
+    # Scheduling class (JobPriority value); encoded in the queue file name
+    priority: str = JobPriority.NORMAL.value
+    
+    # Set by submit_job; the watcher copies it into the result's timestamps
+    submitted_at: Optional[float] = None
     
     def to_json(self) -> str:
         return json.dumps(asdict(self), indent=2)
     
+    def normalized(self) -> Dict[str, Any]:
+        """Fields that determine the job's output (no job_id/priority/submitted_at)."""
+        data = asdict(self)
+        data.pop("job_id")
+        data.pop("priority")
+        data.pop("submitted_at")
+        return data
+    
+    def fingerprint(self) -> str:
+        """Stable hash of normalized() - identical jobs share a fingerprint."""
+        canonical = json.dumps(self.normalized(), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    
+    def split_frames(self, frame_start: int, frame_end: int, chunks: int) -> List['RenderJob']:
+        """Split an animation job into one sub-job per angle and frame chunk.
+        
+        frame_start..frame_end is divided into at most ``chunks`` contiguous,
+        near-equal ranges. Only the first sub-job keeps output_format; the
+        rest use "blend" (no export) so the model is exported once.
+        """
+        total = frame_end - frame_start + 1
+        chunks = max(1, min(chunks, total))
+        ranges = []
+        start = frame_start
+        for i in range(chunks):
+            size = total // chunks + (1 if i < total % chunks else 0)
+            ranges.append((start, start + size - 1))
+            start += size
+        
+        sub_jobs = []
+        for angle in self.animation_angles:
+            for chunk_start, chunk_end in ranges:
+                data = asdict(self)
+                data.update(
+                    job_id=str(uuid.uuid4())[:8],
+                    frame_start=chunk_start,
+                    frame_end=chunk_end,
+                    animation_angles=[angle],
+                    submitted_at=None,
+                )
+                if sub_jobs:
+                    data["output_format"] = OutputFormat.BLEND.value
+                sub_jobs.append(RenderJob(**data))
+        return sub_jobs
+    
+    def split_previews(self, group_size: int = 1) -> List['RenderJob']:
+        """Split a preview job into sub-jobs of ``group_size`` preview angles.
+        
+        Angle order is kept, so the first sub-job renders the first angles.
+        As with split_frames, only the first sub-job keeps output_format.
+        """
+        group_size = max(1, group_size)
+        sub_jobs = []
+        for i in range(0, len(self.preview_angles), group_size):
+            data = asdict(self)
+            data.update(
+                job_id=str(uuid.uuid4())[:8],
+                preview_angles=self.preview_angles[i:i + group_size],
+                submitted_at=None,
+            )
+            if sub_jobs:
+                data["output_format"] = OutputFormat.BLEND.value
+            sub_jobs.append(RenderJob(**data))
+        return sub_jobs
+    
     @classmethod
     def from_json(cls, json_str: str) -> 'RenderJob':
         data = json.loads(json_str)
         return cls(**data)
     
     def save(self, path: Path):
-        path.write_text(self.to_json())
+        atomic_write_text(path, self.to_json())
     
     @classmethod
     def load(cls, path: Path) -> 'RenderJob':
@@ -107,6 +229,9 @@ class RenderResult:
     blender_version: Optional[str] = None
     gpu_used: Optional[str] = None
     
+    # Phase name (see PHASES) -> unix timestamp
+    timestamps: Dict[str, float] = field(default_factory=dict)
+    
     def to_json(self) -> str:
         return json.dumps(asdict(self), indent=2)
     
@@ -120,8 +245,49 @@ class RenderResult:
         return self.status == JobStatus.COMPLETE.value
     
     def save(self, path: Path):
-        path.write_text(self.to_json())
+        atomic_write_text(path, self.to_json())
     
     @classmethod
     def load(cls, path: Path) -> 'RenderResult':
         return cls.from_json(path.read_text(encoding='utf-8-sig'))
+
+
+@dataclass
+class RenderBatch:
+    """Many render jobs submitted as one queue manifest (``{batch_id}.batch``).
+    
+    The watcher expands the manifest into individual job files on the
+    Windows side, so submitting N jobs costs one cross-mount write.
+    """
+    
+    jobs: List[RenderJob] = field(default_factory=list)
+    batch_id: str = field(default_factory=lambda: "batch-" + str(uuid.uuid4())[:8])
+    created_at: float = field(default_factory=time.time)
+    
+    @property
+    def job_ids(self) -> List[str]:
+        return [job.job_id for job in self.jobs]
+    
+    def to_json(self) -> str:
+        # Compact: the manifest can hold hundreds of jobs
+        return json.dumps({
+            "batch_id": self.batch_id,
+            "created_at": self.created_at,
+            "jobs": [asdict(job) for job in self.jobs],
+        }, separators=(",", ":"))
+    
+    @classmethod
+    def from_json(cls, json_str: str) -> 'RenderBatch':
+        data = json.loads(json_str)
+        return cls(
+            jobs=[RenderJob(**job) for job in data.get("jobs", [])],
+            batch_id=data["batch_id"],
+            created_at=data.get("created_at", 0.0),
+        )
+    
+    def save(self, path: Path):
+        atomic_write_text(path, self.to_json())
+    
+    @classmethod
+    def load(cls, path: Path) -> 'RenderBatch':
+        return cls.from_json(path.read_text(encoding='utf-8-sig'))
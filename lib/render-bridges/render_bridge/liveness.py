@@ -0,0 +1,217 @@
+"""
+Watcher liveness: heartbeat files and a cached, read-only status check.
+
+Each watcher rewrites its heartbeat file (``temp/render-watcher-heartbeat``,
+``temp/godot-watcher-heartbeat``) every loop. The file is JSON:
+
+    {"version": 1, "timestamp": "2026-01-01T12:00:00Z", "kind": "blender",
+     "watcher_version": "4.2.0", "gpu": "NVIDIA GeForce RTX 4090",
+     "max_parallel": 4, "active": 1, "free_slots": 3, "pid": 1234, "host": "WIN-PC"}
+
+Older watchers write a bare ISO timestamp; they still count as alive, with
+unknown capacity. Age always comes from the file's mtime.
+
+Checking liveness only stats (and, when the file changed, reads) the
+heartbeat; it never writes to the shared directories. ``watcher_liveness``
+hands out one ``WatcherLiveness`` per heartbeat path, so every caller in a
+process shares its TTL cache.
+
+Usage:
+    status = watcher_liveness(base_dir / "temp" / HEARTBEAT_FILE_NAME).status()
+    if status.has_capacity(1):
+        ...
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .fileio import atomic_write_text
+
+
+HEARTBEAT_FILE_NAME = "render-watcher-heartbeat"
+GODOT_HEARTBEAT_FILE_NAME = "godot-watcher-heartbeat"
+HEARTBEAT_VERSION = 1
+# A heartbeat older than this means the watcher is gone
+HEARTBEAT_MAX_AGE = 10.0
+# How long a status is reused before the heartbeat is stat'ed again
+STATUS_TTL = 2.0
+
+
+@dataclass
+class WatcherStatus:
+    """Snapshot of one watcher's heartbeat. Capacity fields are None when unknown."""
+    alive: bool
+    heartbeat_file: str
+    age_seconds: Optional[float] = None
+    kind: str = ""
+    version: str = ""
+    gpu: str = ""
+    max_parallel: Optional[int] = None
+    active_jobs: Optional[int] = None
+    free_slots: Optional[int] = None
+    pid: Optional[int] = None
+    host: str = ""
+    checked_at: float = 0.0
+
+    def has_capacity(self, min_free_slots: int = 1) -> bool:
+        """Alive and (if the watcher reports it) at least min_free_slots free."""
+        if not self.alive:
+            return False
+        return self.free_slots is None or self.free_slots >= min_free_slots
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def heartbeat_payload(
+    kind: str,
+    version: str = "",
+    gpu: str = "",
+    max_parallel: Optional[int] = None,
+    active: Optional[int] = None
+) -> Dict[str, Any]:
+    """The JSON a watcher writes each loop."""
+    free_slots = None
+    if max_parallel is not None and active is not None:
+        free_slots = max(0, max_parallel - active)
+    return {
+        "version": HEARTBEAT_VERSION,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "kind": kind,
+        "watcher_version": version or "",
+        "gpu": gpu or "",
+        "max_parallel": max_parallel,
+        "active": active,
+        "free_slots": free_slots,
+        "pid": os.getpid(),
+        "host": socket.gethostname(),
+    }
+
+
+def write_heartbeat(path: Path, **fields):
+    """Atomically write a heartbeat (fields as for heartbeat_payload)."""
+    atomic_write_text(Path(path), json.dumps(heartbeat_payload(**fields)))
+
+
+def parse_heartbeat(text: str) -> Dict[str, Any]:
+    """Heartbeat fields from file contents; {} for a legacy bare timestamp."""
+    text = text.lstrip("\ufeff").strip()  # PowerShell may write a BOM
+    if not text.startswith("{"):
+        return {}
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _optional_int(value: Any) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def read_heartbeat(path: Path, max_age: float = HEARTBEAT_MAX_AGE) -> WatcherStatus:
+    """Uncached status of the watcher behind heartbeat file ``path``."""
+    return WatcherLiveness(path, max_age=max_age, ttl=0.0).status()
+
+
+class WatcherLiveness:
+    """TTL-cached status of one watcher heartbeat.
+
+    Args:
+        heartbeat_file: The watcher's heartbeat file.
+        max_age: Seconds after which a heartbeat counts as dead.
+        ttl: Seconds a status is reused before the file is stat'ed again
+            (0 = always re-check).
+
+    Thread-safe. The file is only re-read when its mtime or size changed.
+    """
+
+    def __init__(self, heartbeat_file: Path, max_age: float = HEARTBEAT_MAX_AGE, ttl: float = STATUS_TTL):
+        self.heartbeat_file = Path(heartbeat_file)
+        self.max_age = max_age
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._status: Optional[WatcherStatus] = None
+        self._checked_mono = 0.0
+        self._parsed_key: Optional[Tuple[int, int]] = None
+        self._parsed: Dict[str, Any] = {}
+
+    def status(self, refresh: bool = False) -> WatcherStatus:
+        """The watcher's status, re-checked at most once per ttl unless refresh."""
+        with self._lock:
+            now = time.monotonic()
+            if (not refresh and self._status is not None
+                    and now - self._checked_mono < self.ttl):
+                return self._status
+            self._status = self._check()
+            self._checked_mono = now
+            return self._status
+
+    def invalidate(self):
+        """Drop the cached status; the next status() re-checks."""
+        with self._lock:
+            self._status = None
+
+    def _check(self) -> WatcherStatus:
+        now = time.time()
+        path = str(self.heartbeat_file)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return WatcherStatus(alive=False, heartbeat_file=path, checked_at=now)
+
+        key = (st.st_mtime_ns, st.st_size)
+        if key != self._parsed_key:
+            try:
+                self._parsed = parse_heartbeat(self.heartbeat_file.read_text(encoding="utf-8-sig"))
+            except (OSError, UnicodeDecodeError):
+                self._parsed = {}  # mid-replace on some filesystems; age still counts
+            self._parsed_key = key
+
+        data = self._parsed
+        age = max(0.0, now - st.st_mtime)
+        return WatcherStatus(
+            alive=age < self.max_age,
+            heartbeat_file=path,
+            age_seconds=age,
+            kind=str(data.get("kind") or ""),
+            version=str(data.get("watcher_version") or ""),
+            gpu=str(data.get("gpu") or ""),
+            max_parallel=_optional_int(data.get("max_parallel")),
+            active_jobs=_optional_int(data.get("active")),
+            free_slots=_optional_int(data.get("free_slots")),
+            pid=_optional_int(data.get("pid")),
+            host=str(data.get("host") or ""),
+            checked_at=now,
+        )
+
+
+_registry: Dict[str, WatcherLiveness] = {}
+_registry_lock = threading.Lock()
+
+
+def watcher_liveness(
+    heartbeat_file: Path,
+    max_age: float = HEARTBEAT_MAX_AGE,
+    ttl: float = STATUS_TTL
+) -> WatcherLiveness:
+    """The process-wide WatcherLiveness for heartbeat_file (created on first use).
+
+    max_age and ttl only apply when the instance is created.
+    """
+    key = os.path.abspath(heartbeat_file)
+    with _registry_lock:
+        liveness = _registry.get(key)
+        if liveness is None:
+            liveness = _registry[key] = WatcherLiveness(Path(key), max_age=max_age, ttl=ttl)
+        return liveness
@@ -0,0 +1,168 @@
+"""
+Job lifecycle metrics in Prometheus text format.
+
+Results carry phase timestamps (see ``render_bridge.job.PHASES``) written
+by the watcher, plus ``observed`` added when the bridge picks the result
+up. RenderMetrics turns them into per-phase duration histograms and job
+counters that can be scraped over HTTP or written to a node_exporter
+textfile-collector file.
+
+Usage:
+    metrics = RenderMetrics()
+    bridge = RenderBridge(metrics=metrics)
+    metrics.serve(9464)                          # GET /metrics
+    metrics.write_textfile(Path("/var/lib/node_exporter/render_bridge.prom"))
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .fileio import atomic_write_text
+
+
+# Phase name -> (start timestamp, end timestamp)
+PHASE_DURATIONS = {
+    "queue_wait": ("submitted", "claimed"),
+    "startup": ("claimed", "process_started"),
+    "render": ("process_started", "render_finished"),
+    "result_write": ("render_finished", "result_written"),
+    "pickup": ("result_written", "observed"),
+    "total": ("submitted", "observed"),
+}
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def phase_durations(timestamps: Mapping[str, float]) -> Dict[str, float]:
+    """Seconds spent in each phase whose start and end were both recorded."""
+    durations = {}
+    for phase, (start, end) in PHASE_DURATIONS.items():
+        if timestamps.get(start) is not None and timestamps.get(end) is not None:
+            durations[phase] = max(float(timestamps[end]) - float(timestamps[start]), 0.0)
+    return durations
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class RenderMetrics:
+    """Counters and phase histograms for render jobs.
+
+    Thread-safe; one instance can be shared by several bridges (series are
+    labelled with ``bridge="blender"`` / ``bridge="godot"``).
+
+    Args:
+        buckets: Histogram bucket upper bounds in seconds.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._jobs: Dict[Tuple[str, str], int] = {}
+        self._cache_hits: Dict[str, int] = {}
+        self._phases: Dict[Tuple[str, str], _Histogram] = {}
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def observe(self, bridge: str, status: str, timestamps: Optional[Mapping[str, float]] = None):
+        """Record a finished job and the durations of its recorded phases."""
+        durations = phase_durations(timestamps or {})
+        with self._lock:
+            self._jobs[(bridge, status)] = self._jobs.get((bridge, status), 0) + 1
+            for phase, seconds in durations.items():
+                histogram = self._phases.get((bridge, phase))
+                if histogram is None:
+                    histogram = self._phases[(bridge, phase)] = _Histogram(self.buckets)
+                histogram.observe(seconds)
+
+    def count_cache_hit(self, bridge: str):
+        with self._lock:
+            self._cache_hits[bridge] = self._cache_hits.get(bridge, 0) + 1
+
+    def render(self) -> str:
+        """All series in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP render_bridge_jobs_total Render jobs picked up by the bridge, by final status.",
+                "# TYPE render_bridge_jobs_total counter",
+            ]
+            for (bridge, status), value in sorted(self._jobs.items()):
+                lines.append(f"render_bridge_jobs_total{_labels([('bridge', bridge), ('status', status)])} {value}")
+
+            lines += [
+                "# HELP render_bridge_cache_hits_total Renders served from the local output cache.",
+                "# TYPE render_bridge_cache_hits_total counter",
+            ]
+            for bridge, value in sorted(self._cache_hits.items()):
+                lines.append(f"render_bridge_cache_hits_total{_labels([('bridge', bridge)])} {value}")
+
+            lines += [
+                "# HELP render_bridge_phase_seconds Time spent in each job lifecycle phase.",
+                "# TYPE render_bridge_phase_seconds histogram",
+            ]
+            for (bridge, phase), histogram in sorted(self._phases.items()):
+                base = [("bridge", bridge), ("phase", phase)]
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f"render_bridge_phase_seconds_bucket{_labels(base + [('le', repr(bound))])} {count}")
+                lines.append(f"render_bridge_phase_seconds_bucket{_labels(base + [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"render_bridge_phase_seconds_sum{_labels(base)} {histogram.sum}")
+                lines.append(f"render_bridge_phase_seconds_count{_labels(base)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path):
+        """Write the current metrics atomically (node_exporter textfile collector)."""
+        atomic_write_text(Path(path), self.render())
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``GET /metrics`` from a background thread. Returns the server."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # scrapes every few seconds would flood stderr
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, name="render-metrics", daemon=True).start()
+        return self._server
+
+    def shutdown(self):
+        """Stop the HTTP server started by serve()."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
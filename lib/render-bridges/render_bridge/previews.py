@@ -0,0 +1,133 @@
+"""
+Manifest of published asset previews, for incremental regeneration.
+
+``docs/asset-previews/manifest.json`` records, per asset, the source .blend
+(path, sha256, size, mtime_ns) and the angles/resolution/engine its
+``{asset}_{angle}.png`` files were rendered with. An asset is up to date
+when all of that still matches and the files exist; the sha256 is only
+recomputed when the source's size or mtime changed.
+
+Layout:
+    {"version": 1, "assets": {"crate": {"source": ..., "sha256": ..., "size": ...,
+     "mtime_ns": ..., "angles": [...], "resolution": 512, "render_engine": ...,
+     "files": ["crate_front.png", ...], "rendered_at": ...}}}
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .cache import file_digest
+from .fileio import atomic_write_text
+
+
+MANIFEST_FILE_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def preview_file_name(asset: str, angle: str) -> str:
+    return f"{asset}_{angle}.png"
+
+
+class PreviewManifest:
+    """Asset -> source hash / render settings for a preview directory.
+
+    Args:
+        preview_dir: Directory holding the published previews and the manifest.
+    """
+
+    def __init__(self, preview_dir: Path):
+        self.preview_dir = Path(preview_dir)
+        self.path = self.preview_dir / MANIFEST_FILE_NAME
+        self.assets: Dict[str, Dict[str, Any]] = {}
+        self.dirty = False
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                self.assets = dict(data.get("assets", {}))
+        except (OSError, ValueError, AttributeError):
+            pass  # missing or unreadable: every asset is stale
+
+    def source_state(self, blend_file: str) -> Dict[str, Any]:
+        """Current source fields for blend_file (hashes the file)."""
+        st = os.stat(blend_file)
+        return {
+            "source": str(blend_file),
+            "sha256": file_digest(Path(blend_file)),
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+
+    def is_current(
+        self,
+        asset: str,
+        blend_file: str,
+        angles: List[str],
+        resolution: int,
+        render_engine: str
+    ) -> bool:
+        """True if the asset's previews match its source and settings."""
+        entry = self.assets.get(asset)
+        if entry is None or entry.get("source") != str(blend_file):
+            return False
+        if (entry.get("angles") != list(angles) or entry.get("resolution") != resolution
+                or entry.get("render_engine") != render_engine):
+            return False
+        if not all((self.preview_dir / preview_file_name(asset, angle)).is_file() for angle in angles):
+            return False
+        try:
+            st = os.stat(blend_file)
+            if st.st_size == entry.get("size") and st.st_mtime_ns == entry.get("mtime_ns"):
+                return True
+            if file_digest(Path(blend_file)) != entry.get("sha256"):
+                return False
+        except OSError:
+            return False
+        # Touched but unchanged: remember the new stat so it isn't hashed again
+        entry.update(size=st.st_size, mtime_ns=st.st_mtime_ns)
+        self.dirty = True
+        return True
+
+    def stale(
+        self,
+        assets: Dict[str, str],
+        angles: List[str],
+        resolution: int,
+        render_engine: str
+    ) -> List[str]:
+        """Names of the assets (name -> .blend path) that need re-rendering."""
+        return [
+            asset for asset, blend_file in assets.items()
+            if not self.is_current(asset, blend_file, angles, resolution, render_engine)
+        ]
+
+    def record(
+        self,
+        asset: str,
+        source: Dict[str, Any],
+        angles: List[str],
+        resolution: int,
+        render_engine: str,
+        files: List[str]
+    ):
+        """Store an asset's entry. ``source`` is source_state() taken before rendering."""
+        self.assets[asset] = dict(
+            source,
+            angles=list(angles),
+            resolution=resolution,
+            render_engine=render_engine,
+            files=list(files),
+            rendered_at=time.time(),
+        )
+        self.dirty = True
+
+    def save(self, force: bool = False):
+        """Atomically rewrite the manifest if anything changed."""
+        if not (self.dirty or force):
+            return
+        self.preview_dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self.path, json.dumps(
+            {"version": MANIFEST_VERSION, "assets": self.assets}, indent=1, sort_keys=True))
+        self.dirty = False
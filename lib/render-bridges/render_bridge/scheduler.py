@@ -0,0 +1,122 @@
+"""
+Reference queue consumer ordering for prioritized render jobs.
+
+Jobs are picked by priority class (interactive < normal < bulk), oldest
+first within a class. To keep bulk work from starving behind a steady
+stream of interactive jobs, a job's effective rank improves by one class
+for every ``aging_seconds`` it has waited.
+
+The ordering only needs a directory listing: the priority is part of the
+file name (see ``render_bridge.job.queue_filename``) and the enqueue time
+is the file's mtime, which is fixed because job files are renamed into
+place complete. Claiming uses the same exclusive ``{job_id}.lock`` files
+as the PowerShell watchers, so Python and PowerShell consumers can share
+a queue.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from .job import PRIORITY_RANK, parse_queue_filename
+
+
+DEFAULT_AGING_SECONDS = 120.0
+
+
+def _default_lock_dir(queue_dir: Path) -> Path:
+    # render-queue -> render-locks, godot-render-queue -> godot-render-locks
+    return queue_dir.parent / queue_dir.name.replace("-queue", "-locks")
+
+
+@dataclass
+class QueuedJob:
+    """A job file waiting in the queue."""
+    job_id: str
+    priority: str
+    path: Path
+    enqueued_at: float
+
+    def effective_rank(self, now: float, aging_seconds: float) -> int:
+        waited = max(now - self.enqueued_at, 0.0)
+        promotions = int(waited // aging_seconds) if aging_seconds > 0 else 0
+        return max(PRIORITY_RANK[self.priority] - promotions, 0)
+
+
+class QueueScheduler:
+    """Pick and claim the next jobs from a render queue directory.
+
+    Args:
+        queue_dir: Directory containing job files.
+        lock_dir: Directory for claim locks (default: sibling ``*-locks`` dir,
+            matching the PowerShell watchers).
+        aging_seconds: Waiting this long promotes a job by one priority class.
+    """
+
+    def __init__(
+        self,
+        queue_dir: Path,
+        lock_dir: Optional[Path] = None,
+        aging_seconds: float = DEFAULT_AGING_SECONDS,
+    ):
+        self.queue_dir = Path(queue_dir)
+        self.lock_dir = Path(lock_dir) if lock_dir else _default_lock_dir(self.queue_dir)
+        self.aging_seconds = aging_seconds
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+
+    def pending(self) -> List[QueuedJob]:
+        """All job files in the queue (one directory scan)."""
+        jobs = []
+        with os.scandir(self.queue_dir) as entries:
+            for entry in entries:
+                parsed = parse_queue_filename(entry.name)
+                if parsed is None or not entry.is_file():
+                    continue
+                try:
+                    enqueued_at = entry.stat().st_mtime
+                except FileNotFoundError:
+                    continue  # claimed and removed while scanning
+                jobs.append(QueuedJob(parsed[0], parsed[1], Path(entry.path), enqueued_at))
+        return jobs
+
+    def ordered(self, jobs: Optional[List[QueuedJob]] = None, now: Optional[float] = None) -> List[QueuedJob]:
+        """Jobs in the order they should be started."""
+        jobs = self.pending() if jobs is None else jobs
+        now = time.time() if now is None else now
+        return sorted(
+            jobs,
+            key=lambda job: (job.effective_rank(now, self.aging_seconds), job.enqueued_at, job.job_id),
+        )
+
+    def claim(self, job: QueuedJob) -> bool:
+        """Take the job's exclusive lock. Returns False if another consumer holds it."""
+        lock_file = self.lock_dir / f"{job.job_id}.lock"
+        try:
+            fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        os.close(fd)
+        return True
+
+    def release(self, job_id: str):
+        try:
+            (self.lock_dir / f"{job_id}.lock").unlink()
+        except FileNotFoundError:
+            pass
+
+    def claim_next(self, limit: int = 1, exclude: Iterable[str] = ()) -> List[QueuedJob]:
+        """Claim up to ``limit`` jobs in scheduling order, skipping ``exclude`` IDs."""
+        skip = set(exclude)
+        claimed = []
+        for job in self.ordered():
+            if len(claimed) >= limit:
+                break
+            if job.job_id in skip or not self.claim(job):
+                continue
+            if not job.path.exists():
+                self.release(job.job_id)  # finished by another consumer
+                continue
+            claimed.append(job)
+        return claimed
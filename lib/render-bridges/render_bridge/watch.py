@@ -0,0 +1,151 @@
+"""
+Directory watcher used to wake bridges as soon as a result file lands.
+
+On Linux an inotify watch is placed on the output directory so that a
+result written by the watcher (or renamed into place) wakes the waiter
+immediately. Bind mounts from a Windows host frequently do not deliver
+inotify events, so callers must keep re-checking on every wake-up: the
+watcher always returns after at most ``timeout`` seconds, which keeps the
+old polling behaviour as a safety net.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+_EVENT_HEADER = struct.Struct("iIII")
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        _libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    return _libc
+
+
+def inotify_supported() -> bool:
+    """Return True if inotify can be used on this platform."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = _load_libc()
+        return hasattr(libc, "inotify_init1")
+    except OSError:
+        return False
+
+
+class ResultWatcher:
+    """Block until a file appears in a directory, or a poll interval elapses.
+
+    Usage:
+        with ResultWatcher(output_dir) as watcher:
+            while not done():
+                watcher.wait(poll_interval)
+
+    The watch is registered in ``__init__``, so checking for completion
+    *after* constructing the watcher cannot miss an event.
+    """
+
+    def __init__(self, directory: Path, use_inotify: Optional[bool] = None):
+        self.directory = Path(directory)
+        self._fd: Optional[int] = None
+        if use_inotify is None:
+            use_inotify = inotify_supported()
+        if use_inotify:
+            self._fd = self._open_inotify()
+
+    @property
+    def event_driven(self) -> bool:
+        """True if an inotify watch is active (otherwise pure polling)."""
+        return self._fd is not None
+
+    def fileno(self) -> int:
+        """Return the inotify file descriptor (for select/asyncio readers)."""
+        if self._fd is None:
+            raise ValueError("ResultWatcher is not event-driven")
+        return self._fd
+
+    def _open_inotify(self) -> Optional[int]:
+        try:
+            libc = _load_libc()
+            fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+            if fd < 0:
+                return None
+            wd = libc.inotify_add_watch(fd, os.fsencode(str(self.directory)), _WATCH_MASK)
+            if wd < 0:
+                os.close(fd)
+                return None
+            return fd
+        except (OSError, AttributeError):
+            return None
+
+    def wait(self, timeout: float) -> List[str]:
+        """Wait up to ``timeout`` seconds for files to be created in the directory.
+
+        Returns:
+            Names of the entries that were created/renamed in, or an empty
+            list if the timeout elapsed (or events are unavailable).
+        """
+        timeout = max(timeout, 0.0)
+        if self._fd is None:
+            time.sleep(timeout)
+            return []
+
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        if not poller.poll(timeout * 1000):
+            return []
+        return self.read_events()
+
+    def read_events(self) -> List[str]:
+        """Drain pending inotify events without blocking."""
+        if self._fd is None:
+            return []
+        names = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except OSError:  # includes BlockingIOError once drained
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _wd, _mask, _cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+                if raw_name:
+                    names.append(os.fsdecode(raw_name))
+        return names
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "ResultWatcher":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
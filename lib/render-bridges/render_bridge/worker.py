@@ -0,0 +1,531 @@
+"""
+LocalRenderWorker - pure-Python stand-in for the Windows render watchers.
+
+Implements the same queue/lock/result/heartbeat protocol as
+render_watcher.ps1 (Blender) and godot_render_watcher.ps1 (Godot), so
+RenderBridge and GodotRenderBridge can be exercised end-to-end on Linux.
+
+Modes:
+    fake  - write deterministic placeholder PNG/GLB outputs after a
+            configurable latency (CI, load tests, benchmarks)
+    real  - run Blender or Godot locally when they are installed
+
+Usage:
+    python -m render_bridge.worker --kind blender --fake --latency 0.2
+    python -m render_bridge.worker --kind godot --max-parallel 2
+
+    worker = LocalRenderWorker(kind="blender", base_dir=tmp, fake=True)
+    worker.start()
+    ...
+    worker.stop()
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from .fileio import atomic_write_text
+from .frames import RAW_SUFFIX, raw_segment_stem
+from .liveness import write_heartbeat
+from .job import RenderBatch, RenderJob, RenderResult, JobStatus, queue_filename
+from .scheduler import QueueScheduler, QueuedJob
+from .watch import ResultWatcher
+
+
+BLENDER = "blender"
+GODOT = "godot"
+
+# Queue/output/lock/heartbeat locations under <base_dir>/temp, per kind
+_LAYOUT = {
+    BLENDER: ("render-queue", "render-output", "render-locks", "render-watcher-heartbeat"),
+    GODOT: ("godot-render-queue", "godot-render-output", "godot-render-locks", "godot-watcher-heartbeat"),
+}
+
+FAKE_VERSION = "fake-worker"
+FAKE_GPU = "LocalRenderWorker (fake)"
+# Frame range used by fake animation renders when the job doesn't set one
+FAKE_DEFAULT_FRAMES = (1, 8)
+
+
+# Deterministic placeholder outputs
+
+def fake_pixel(seed: str) -> bytes:
+    """RGBA colour of the fake outputs for seed."""
+    r, g, b = hashlib.sha256(seed.encode("utf-8")).digest()[:3]
+    return bytes((r, g, b, 255))
+
+
+def fake_png(width: int, height: int, seed: str) -> bytes:
+    """Encode a solid-colour RGBA PNG whose colour is derived from seed."""
+    row = b"\x00" + fake_pixel(seed) * width
+    raw = row * height
+
+    def chunk(tag: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header)
+            + chunk(b"IDAT", zlib.compress(raw, 1)) + chunk(b"IEND", b""))
+
+
+def fake_glb(seed: str) -> bytes:
+    """Encode a minimal, valid glTF 2.0 binary with an empty scene."""
+    doc = json.dumps({
+        "asset": {"version": "2.0", "generator": f"render_bridge fake worker {seed}"},
+        "scene": 0,
+        "scenes": [{"nodes": []}],
+    }, separators=(",", ":")).encode("utf-8")
+    doc += b" " * (-len(doc) % 4)
+    total = 12 + 8 + len(doc)
+    return struct.pack("<4sII", b"glTF", 2, total) + struct.pack("<I4s", len(doc), b"JSON") + doc
+
+
+def _write_bytes_atomic(path: Path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class LocalRenderWorker:
+    """Queue consumer for the Blender or Godot render queue.
+
+    Args:
+        kind: "blender" or "godot".
+        base_dir: Directory containing ``temp/`` (as for the bridges).
+        fake: Write placeholder outputs instead of running Blender/Godot.
+            None = fake only if the real executable isn't found.
+        latency: Seconds each fake job takes.
+        max_parallel: Concurrent jobs, like the watchers' -MaxParallel.
+        poll_interval: Queue re-scan interval (inotify wakes earlier).
+        executable: Path to blender/godot (default: looked up on PATH).
+        project_dir: Godot project (default: <base_dir>/project).
+    """
+
+    def __init__(
+        self,
+        kind: str = BLENDER,
+        base_dir: Optional[Path] = None,
+        fake: Optional[bool] = None,
+        latency: float = 0.0,
+        max_parallel: int = 4,
+        poll_interval: float = 0.5,
+        executable: Optional[str] = None,
+        project_dir: Optional[Path] = None,
+        job_timeout: float = 600.0,
+    ):
+        if kind not in _LAYOUT:
+            raise ValueError(f"Unknown worker kind: {kind!r}")
+        from .bridge import _resolve_base_dir
+
+        self.kind = kind
+        self.base_dir = _resolve_base_dir(base_dir)
+        queue_name, output_name, lock_name, heartbeat_name = _LAYOUT[kind]
+        temp_dir = self.base_dir / "temp"
+        self.queue_dir = temp_dir / queue_name
+        self.output_dir = temp_dir / output_name
+        self.heartbeat_file = temp_dir / heartbeat_name
+        self.project_dir = Path(project_dir) if project_dir else self.base_dir / "project"
+        self.latency = latency
+        self.max_parallel = max_parallel
+        self.poll_interval = poll_interval
+        self.job_timeout = job_timeout
+
+        self.executable = executable or shutil.which(kind)
+        self.fake = fake if fake is not None else self.executable is None
+        if not self.fake and not self.executable:
+            raise RuntimeError(f"{kind} not found; pass executable= or use fake=True")
+
+        self.queue_dir.mkdir(parents=True, exist_ok=True)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.scheduler = QueueScheduler(self.queue_dir, temp_dir / lock_name)
+
+        self.jobs_processed = 0
+        self._active: Set[str] = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._version: Optional[str] = None
+
+    # Main loop
+
+    def start(self) -> "LocalRenderWorker":
+        """Run the worker in a background thread."""
+        self._stop.clear()
+        self.write_heartbeat()
+        self._thread = threading.Thread(target=self.serve_forever, name=f"{self.kind}-worker", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 10.0):
+        """Stop the background thread and wait for in-flight jobs."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "LocalRenderWorker":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def serve_forever(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_parallel)
+        try:
+            with ResultWatcher(self.queue_dir) as watcher:
+                while not self._stop.is_set():
+                    self.run_once()
+                    watcher.wait(self.poll_interval)
+        finally:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def run_once(self) -> int:
+        """One watcher tick: heartbeat, expand batches, start jobs up to capacity.
+
+        Returns:
+            Number of jobs started. Without a running executor (i.e. when
+            called directly) jobs are processed synchronously.
+        """
+        self.write_heartbeat()
+        if self.kind == BLENDER:
+            self.expand_batches()
+
+        with self._lock:
+            free = self.max_parallel - len(self._active)
+            active = set(self._active)
+        if free <= 0:
+            return 0
+
+        claimed = self.scheduler.claim_next(free, exclude=active)
+        claimed_at = time.time()
+        for queued in claimed:
+            with self._lock:
+                self._active.add(queued.job_id)
+            if self._executor is not None:
+                self._executor.submit(self._run, queued, claimed_at)
+            else:
+                self._run(queued, claimed_at)
+        return len(claimed)
+
+    def write_heartbeat(self):
+        """Write the JSON heartbeat, including current free capacity."""
+        with self._lock:
+            active = len(self._active)
+        write_heartbeat(
+            self.heartbeat_file,
+            kind=self.kind,
+            version=self._watcher_version(),
+            gpu=FAKE_GPU if self.fake else "",
+            max_parallel=self.max_parallel,
+            active=active,
+        )
+
+    def _watcher_version(self) -> str:
+        if self._version is None:
+            if self.fake:
+                self._version = FAKE_VERSION
+            else:
+                self._version = (self._blender_version() if self.kind == BLENDER else None) or ""
+        return self._version
+
+    def expand_batches(self):
+        """Split ``*.batch`` manifests into individual job files."""
+        for manifest in self.queue_dir.glob("*.batch"):
+            batch_id = manifest.stem
+            if not self.scheduler.claim(QueuedJob(batch_id, "normal", manifest, 0.0)):
+                continue
+            try:
+                batch = RenderBatch.load(manifest)
+                for job in batch.jobs:
+                    job.save(self.queue_dir / queue_filename(job.job_id, job.priority))
+                manifest.unlink()
+            except (OSError, ValueError, KeyError):
+                pass  # removed by another consumer, or unreadable; retry next tick
+            finally:
+                self.scheduler.release(batch_id)
+
+    def _run(self, queued: QueuedJob, claimed_at: float):
+        timestamps = {"claimed": claimed_at}
+        try:
+            if self.kind == BLENDER:
+                self._process_blender_job(queued, timestamps)
+            else:
+                self._process_godot_job(queued, timestamps)
+        finally:
+            try:
+                queued.path.unlink()
+            except FileNotFoundError:
+                pass
+            self.scheduler.release(queued.job_id)
+            with self._lock:
+                self._active.discard(queued.job_id)
+                self.jobs_processed += 1
+
+    # Blender protocol
+
+    def _process_blender_job(self, queued: QueuedJob, timestamps: Dict[str, float]):
+        start = time.time()
+        try:
+            job = RenderJob.load(queued.path)
+        except (OSError, ValueError, TypeError) as e:
+            self._write_blender_result(RenderResult(
+                job_id=queued.job_id, status=JobStatus.FAILED.value, error_message=f"Invalid job file: {e}"),
+                timestamps)
+            return
+        if job.submitted_at is not None:
+            timestamps["submitted"] = job.submitted_at
+
+        job_dir = self.output_dir / job.job_id
+        job_dir.mkdir(parents=True, exist_ok=True)
+        if not Path(job.blend_file).exists():
+            self._write_blender_result(RenderResult(
+                job_id=job.job_id, status=JobStatus.FAILED.value,
+                error_message=f"Blend file not found: {job.blend_file}"), timestamps)
+            return
+
+        timestamps["process_started"] = time.time()
+        try:
+            if self.fake:
+                output_files, preview_files = self._fake_blender_outputs(job, job_dir)
+            else:
+                output_files, preview_files = self._real_blender_outputs(job, job_dir)
+        except Exception as e:
+            timestamps["render_finished"] = time.time()
+            self._write_blender_result(RenderResult(
+                job_id=job.job_id, status=JobStatus.FAILED.value, error_message=str(e)), timestamps)
+            return
+        timestamps["render_finished"] = time.time()
+
+        self._write_blender_result(RenderResult(
+            job_id=job.job_id,
+            status=JobStatus.COMPLETE.value,
+            output_files=output_files,
+            preview_files=preview_files,
+            render_time_seconds=time.time() - start,
+            blender_version=self._watcher_version() or None,
+            gpu_used=FAKE_GPU if self.fake else None,
+        ), timestamps)
+
+    def _write_blender_result(self, result: RenderResult, timestamps: Dict[str, float]):
+        timestamps["result_written"] = time.time()
+        result.timestamps = timestamps
+        result.save(self.output_dir / f"{result.job_id}.result.json")
+
+    def _fake_blender_outputs(self, job: RenderJob, job_dir: Path) -> Tuple[List[str], List[str]]:
+        if self.latency:
+            time.sleep(self.latency)
+        seed = job.fingerprint()
+        output_files: List[str] = []
+        preview_files: List[str] = []
+
+        if not job.script:
+            if job.output_format == "glb":
+                _write_bytes_atomic(job_dir / f"{job.job_id}.glb", fake_glb(seed))
+                output_files.append(f"{job.job_id}/{job.job_id}.glb")
+            elif job.output_format == "png":
+                _write_bytes_atomic(job_dir / f"{job.job_id}.png", fake_png(512, 512, seed))
+                output_files.append(f"{job.job_id}/{job.job_id}.png")
+
+        if job.render_animation:
+            start = job.frame_start if job.frame_start is not None else FAKE_DEFAULT_FRAMES[0]
+            end = job.frame_end if job.frame_end is not None else FAKE_DEFAULT_FRAMES[1]
+            size = job.preview_resolution
+            for angle in job.animation_angles:
+                for frame in range(start, end + 1):
+                    rel = f"frames_{angle}/frame_{frame:04d}.png"
+                    _write_bytes_atomic(job_dir / rel, fake_png(size, size, f"{seed}:{angle}:{frame}"))
+                    output_files.append(f"{job.job_id}/{rel}")
+                if job.raw_frames:
+                    stem = f"frames_{angle}/{raw_segment_stem(start, end)}"
+                    raw = b"".join(fake_pixel(f"{seed}:{angle}:{frame}") * (size * size)
+                                   for frame in range(start, end + 1))
+                    _write_bytes_atomic(job_dir / f"{stem}{RAW_SUFFIX}", raw)
+                    atomic_write_text(job_dir / f"{stem}.json", json.dumps({
+                        "width": size, "height": size, "channels": 4, "frame_start": start, "frame_end": end,
+                    }))
+                    output_files += [f"{job.job_id}/{stem}{RAW_SUFFIX}", f"{job.job_id}/{stem}.json"]
+
+        if job.generate_previews:
+            size = job.preview_resolution
+            for angle in job.preview_angles:
+                _write_bytes_atomic(job_dir / f"{angle}.png", fake_png(size, size, f"{seed}:{angle}"))
+                preview_files.append(f"{job.job_id}/{angle}.png")
+
+        return output_files, preview_files
+
+    def _blender_version(self) -> Optional[str]:
+        try:
+            out = subprocess.run([self.executable, "--version"], capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.SubprocessError):
+            return None
+        first = out.stdout.splitlines()[0] if out.stdout else ""
+        return first.replace("Blender ", "") or None
+
+    def _run_blender(self, job: RenderJob, script_path: str, script_args: List[str]) -> str:
+        args = [self.executable, "--background", job.blend_file, "--python", script_path]
+        if script_args:
+            args += ["--"] + list(script_args)
+        env = dict(os.environ)
+        env.update({
+            "RENDER_JOB_OUTPUT_DIR": str(self.output_dir / job.job_id),
+            "RENDER_JOB_ID": job.job_id,
+            "RENDER_REPO_ROOT": str(self.base_dir),
+        })
+        proc = subprocess.run(args, capture_output=True, text=True, timeout=self.job_timeout, env=env)
+        output = proc.stdout + proc.stderr
+        if proc.returncode != 0:
+            raise RuntimeError(f"Blender failed: {output}")
+        return output
+
+    def _real_blender_outputs(self, job: RenderJob, job_dir: Path) -> Tuple[List[str], List[str]]:
+        if job.render_animation or job.generate_previews:
+            # The preview/animation scripts live in render_watcher.ps1
+            raise RuntimeError("Preview/animation jobs need the Windows watcher or fake mode")
+
+        if job.script:
+            self._run_blender(job, job.script, job.script_args)
+            return [], []
+
+        if job.output_format == "glb":
+            output = job_dir / f"{job.job_id}.glb"
+            script = (
+                "import bpy\n"
+                f"bpy.context.scene.render.engine = {job.render_engine!r}\n"
+                f"bpy.ops.export_scene.gltf(filepath={str(output)!r}, export_format='GLB')\n"
+            )
+        elif job.output_format == "png":
+            output = job_dir / f"{job.job_id}.png"
+            script = (
+                "import bpy\n"
+                "scene = bpy.context.scene\n"
+                f"scene.render.engine = {job.render_engine!r}\n"
+                f"scene.render.filepath = {str(output)!r}\n"
+                "scene.render.image_settings.file_format = 'PNG'\n"
+                "scene.render.film_transparent = True\n"
+                "bpy.ops.render.render(write_still=True)\n"
+            )
+        else:
+            return [], []
+
+        with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+            f.write(script)
+        try:
+            log = self._run_blender(job, f.name, [])
+        finally:
+            os.unlink(f.name)
+        if not output.exists():
+            raise RuntimeError(f"No output: {log}")
+        return [f"{job.job_id}/{output.name}"], []
+
+    # Godot protocol
+
+    def _process_godot_job(self, queued: QueuedJob, timestamps: Dict[str, float]):
+        job_id = queued.job_id
+        output_file = self.output_dir / f"{job_id}.png"
+        start = time.time()
+        try:
+            job = json.loads(queued.path.read_text(encoding="utf-8-sig"))
+            if job.get("submitted_at") is not None:
+                timestamps["submitted"] = job["submitted_at"]
+            timestamps["process_started"] = time.time()
+            if self.fake:
+                if self.latency:
+                    time.sleep(self.latency)
+                params = job.get("params", {})
+                seed = json.dumps([job.get("job_type"), params], sort_keys=True)
+                png = fake_png(int(params.get("output_width", 512)), int(params.get("output_height", 512)), seed)
+                _write_bytes_atomic(output_file, png)
+            else:
+                self._run_godot(queued.path, output_file)
+            timestamps["render_finished"] = time.time()
+            result = {
+                "job_id": job_id,
+                "status": "success",
+                "output_file": output_file.name,
+                "render_time_seconds": round(time.time() - start, 2),
+                "gpu_name": FAKE_GPU if self.fake else None,
+                "error": None,
+            }
+        except Exception as e:
+            timestamps.setdefault("render_finished", time.time())
+            result = {
+                "job_id": job_id,
+                "status": "error",
+                "output_file": None,
+                "render_time_seconds": 0,
+                "gpu_name": FAKE_GPU if self.fake else None,
+                "error": str(e),
+            }
+        timestamps["result_written"] = time.time()
+        result["timestamps"] = timestamps
+        atomic_write_text(self.output_dir / f"{job_id}_result.json", json.dumps(result, indent=2))
+
+    def _run_godot(self, job_file: Path, output_file: Path):
+        args = [
+            self.executable, "--path", str(self.project_dir),
+            "-s", "res://tools/bridge_renderer.gd", "--",
+            f"--job-file={job_file}", f"--output={output_file}",
+        ]
+        if not os.environ.get("DISPLAY") and shutil.which("xvfb-run"):
+            args = ["xvfb-run", "-a"] + args  # SubViewport rendering needs a display
+        proc = subprocess.run(args, capture_output=True, text=True, timeout=self.job_timeout)
+        if not output_file.exists():
+            if proc.returncode != 0:
+                raise RuntimeError(f"Godot exited with code {proc.returncode}: {proc.stderr}")
+            raise RuntimeError(f"Output file not created: {output_file}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Local render worker (stand-in for the Windows watchers)")
+    parser.add_argument("--kind", choices=[BLENDER, GODOT], default=BLENDER)
+    parser.add_argument("--base-dir", type=Path, default=None, help="Directory containing temp/")
+    parser.add_argument("--fake", action="store_true", help="Write placeholder outputs")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per fake job")
+    parser.add_argument("--max-parallel", type=int, default=4)
+    parser.add_argument("--poll-interval", type=float, default=0.5)
+    parser.add_argument("--executable", default=None, help="Path to blender/godot")
+    parser.add_argument("--once", action="store_true", help="Process the current queue and exit")
+    args = parser.parse_args(argv)
+
+    worker = LocalRenderWorker(
+        kind=args.kind,
+        base_dir=args.base_dir,
+        fake=True if args.fake else None,
+        latency=args.latency,
+        max_parallel=args.max_parallel,
+        poll_interval=args.poll_interval,
+        executable=args.executable,
+    )
+    mode = "fake" if worker.fake else worker.executable
+    print(f"[LocalRenderWorker] {worker.kind} queue {worker.queue_dir} ({mode}, max parallel {worker.max_parallel})")
+
+    if args.once:
+        while worker.run_once():
+            pass
+        print(f"[LocalRenderWorker] Processed {worker.jobs_processed} jobs")
+        return 0
+    try:
+        worker.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,8 +7,12 @@ Falls back to local CPU rendering if the bridge is unavailable.
 Usage:
     from render_bridge_integration import (
         render_static_preview_gpu,
+        iter_static_preview_gpu,
+        regenerate_previews,
         render_animation_frames_gpu,
-        is_bridge_available
+        load_animation_frames_gpu,
+        is_bridge_available,
+        get_watcher_status
     )
 
     if is_bridge_available():
@@ -23,7 +27,7 @@ import sys
 import shutil
 import time
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 # Add render_bridge to path
 PYTHON_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -31,7 +35,12 @@ sys.path.insert(0, PYTHON_DIR)
 
 try:
     from render_bridge import RenderBridge
+    from render_bridge.cache import RenderCache
+    from render_bridge.fileio import publish_files
+    from render_bridge.index import JobIndex, default_index_path
     from render_bridge.job import RenderJob
+    from render_bridge.liveness import HEARTBEAT_FILE_NAME, WatcherStatus, watcher_liveness
+    from render_bridge.previews import PreviewManifest, preview_file_name
     BRIDGE_AVAILABLE = True
 except ImportError:
     BRIDGE_AVAILABLE = False
@@ -39,6 +48,10 @@ except ImportError:
 # Output directories
 DEFAULT_BASE_DIR = Path(__file__).resolve().parents[1]
 RENDER_BRIDGE_BASE_ENV = "RENDER_BRIDGE_BASE"
+# Set to a directory to serve repeat renders from a local output cache
+RENDER_BRIDGE_CACHE_ENV = "RENDER_BRIDGE_CACHE"
+# Set to 1 to track jobs in temp/render-index.sqlite instead of scanning the queue dirs
+RENDER_BRIDGE_INDEX_ENV = "RENDER_BRIDGE_INDEX"
 
 
 def _resolve_base_dir(base_dir: Optional[Path] = None) -> Path:
@@ -55,6 +68,8 @@ def _preview_dir_for(base_dir: Path) -> Path:
 BRIDGE_TIMEOUT_STATIC = 120.0  # 2 minutes for static renders
 BRIDGE_TIMEOUT_ANIMATION = 600.0  # 10 minutes for animation renders
 BRIDGE_POLL_INTERVAL = 1.0
+# regenerate_previews rewrites the manifest at most this often while rendering
+MANIFEST_SAVE_INTERVAL = 5.0
 
 
 class BridgeUnavailableError(Exception):
@@ -62,50 +77,63 @@ class BridgeUnavailableError(Exception):
     pass
 
 
-def is_bridge_available(timeout: float = 5.0) -> bool:
-    """Check if the render bridge is available by testing connection.
+def get_watcher_status(base_dir: Optional[Path] = None, refresh: bool = False) -> Optional["WatcherStatus"]:
+    """Cached status of the Blender watcher (alive, free slots, GPU, version).
 
-    This doesn't actually render anything - just checks if the bridge
-    infrastructure exists and the watcher appears to be running.
-
-    Args:
-        timeout: How long to wait for a response.
+    Reads the watcher's heartbeat file at most once per STATUS_TTL seconds
+    per process; never creates or writes anything.
 
     Returns:
-        True if bridge appears available, False otherwise.
+        The WatcherStatus, or None if render_bridge isn't importable.
     """
     if not BRIDGE_AVAILABLE:
-        return False
+        return None
+    heartbeat = _resolve_base_dir(base_dir) / "temp" / HEARTBEAT_FILE_NAME
+    return watcher_liveness(heartbeat).status(refresh=refresh)
 
-    try:
-        bridge = RenderBridge(timeout=timeout, poll_interval=0.5)
 
-        # Check if queue and output dirs exist and are writable
-        if not bridge.queue_dir.exists() or not bridge.output_dir.exists():
-            return False
+def is_bridge_available(
+    timeout: float = 5.0,
+    base_dir: Optional[Path] = None,
+    min_free_slots: int = 0,
+) -> bool:
+    """Check if the render bridge is available from the watcher's heartbeat.
 
-        # Check if we can write to queue (basic connectivity test)
-        test_file = bridge.queue_dir / "_bridge_test.tmp"
-        try:
-            test_file.write_text("test")
-            test_file.unlink()
-        except Exception:
-            return False
+    This doesn't render or write anything - it checks that the Blender
+    watcher's heartbeat is fresh (and, with min_free_slots, that it reports
+    enough idle capacity). Results are cached briefly, so calling this per
+    asset is cheap.
 
-        return True
+    Args:
+        timeout: Unused; kept for compatibility.
+        base_dir: Bridge base directory (default: RENDER_BRIDGE_BASE or repo root).
+        min_free_slots: Also require this many free watcher slots. Watchers
+            that don't report capacity always pass.
 
-    except Exception:
-        return False
+    Returns:
+        True if bridge appears available, False otherwise.
+    """
+    status = get_watcher_status(base_dir)
+    return status is not None and status.has_capacity(min_free_slots)
 
 
 def get_bridge(base_dir: Optional[Path] = None) -> RenderBridge:
-    """Get a configured RenderBridge instance."""
+    """Get a configured RenderBridge instance.
+
+    If RENDER_BRIDGE_CACHE is set, renders are served from/stored in a
+    content-addressed cache in that directory. If RENDER_BRIDGE_INDEX=1,
+    jobs are tracked in a persistent index instead of directory scans.
+    """
     if not BRIDGE_AVAILABLE:
         raise BridgeUnavailableError("render_bridge module not available")
+    cache_dir = os.environ.get(RENDER_BRIDGE_CACHE_ENV)
+    use_index = os.environ.get(RENDER_BRIDGE_INDEX_ENV, "").lower() in ("1", "true", "yes")
     return RenderBridge(
         base_dir=base_dir,
         timeout=BRIDGE_TIMEOUT_STATIC,
-        poll_interval=BRIDGE_POLL_INTERVAL
+        poll_interval=BRIDGE_POLL_INTERVAL,
+        cache=RenderCache(Path(cache_dir)) if cache_dir else None,
+        index=JobIndex(default_index_path(base_dir)) if use_index else None
     )
 
 
@@ -116,6 +144,8 @@ def render_static_preview_gpu(
     resolution: int = 512,
     timeout: Optional[float] = None,
     base_dir: Optional[Path] = None,
+    on_angle: Optional[Callable[[str, str], None]] = None,
+    group_size: int = 1,
 ) -> List[str]:
     """Render static preview images using GPU via the render bridge.
 
@@ -125,9 +155,42 @@ def render_static_preview_gpu(
         angles: List of angles to render (default: front, back, left, right).
         resolution: Output resolution (square).
         timeout: Render timeout in seconds.
+        on_angle: Called with (angle, preview_path) as each angle is published.
+        group_size: Angles rendered per bridge job.
 
     Returns:
-        List of paths to rendered preview images.
+        List of paths to rendered preview images, in ``angles`` order.
+
+    Raises:
+        BridgeUnavailableError: If bridge is not available or times out.
+    """
+    if angles is None:
+        angles = ["front", "back", "left", "right"]
+
+    published = {}
+    for angle, path in iter_static_preview_gpu(
+        blend_path, asset_name, angles, resolution, timeout, base_dir, group_size
+    ):
+        published[angle] = path
+        if on_angle is not None:
+            on_angle(angle, path)
+    return [published[angle] for angle in angles if angle in published]
+
+
+def iter_static_preview_gpu(
+    blend_path: str,
+    asset_name: str,
+    angles: List[str] = None,
+    resolution: int = 512,
+    timeout: Optional[float] = None,
+    base_dir: Optional[Path] = None,
+    group_size: int = 1,
+) -> Iterator[Tuple[str, str]]:
+    """Yield (angle, preview_path) as each angle lands in docs/asset-previews.
+
+    Angles are rendered as separate bridge jobs of ``group_size`` angles
+    (see RenderBridge.iter_previews), the first one at interactive
+    priority, so the first angle is available while the rest render.
 
     Raises:
         BridgeUnavailableError: If bridge is not available or times out.
@@ -136,41 +199,145 @@ def render_static_preview_gpu(
         angles = ["front", "back", "left", "right"]
 
     bridge = get_bridge(base_dir=base_dir)
+    preview_dir = _preview_dir_for(_resolve_base_dir(base_dir))
+    os.makedirs(preview_dir, exist_ok=True)
 
     try:
-        result = bridge.render_blend(
+        for group in bridge.iter_preview_groups(
             blend_file=blend_path,
-            output_format="png",
+            angles=angles,
+            resolution=resolution,
             render_engine="BLENDER_EEVEE",
-            generate_previews=True,
+            group_size=group_size,
             timeout=timeout or BRIDGE_TIMEOUT_STATIC
-        )
+        ):
+            # The job dir is removed once we move on, so take the group's files
+            # (in parallel) before yielding any of them
+            published = [
+                (angle, os.path.join(preview_dir, preview_file_name(asset_name, angle)))
+                for angle, _ in group
+            ]
+            publish_files([(src, dst) for (_, src), (_, dst) in zip(group, published)], move=True)
+            yield from published
+
+    except TimeoutError as e:
+        raise BridgeUnavailableError(f"Render timed out: {e}")
+    except Exception as e:
+        raise BridgeUnavailableError(f"Render error: {e}")
 
-        if result.status != "complete":
-            raise BridgeUnavailableError(f"Render failed: {result.error_message}")
 
-        # Copy preview files to the standard preview directory
-        preview_dir = _preview_dir_for(_resolve_base_dir(base_dir))
-        os.makedirs(preview_dir, exist_ok=True)
-        output_paths = []
+def regenerate_previews(
+    assets: Dict[str, str],
+    angles: List[str] = None,
+    resolution: int = 512,
+    force: bool = False,
+    timeout: Optional[float] = None,
+    base_dir: Optional[Path] = None,
+    on_asset: Optional[Callable[[str, List[str]], None]] = None,
+) -> Dict[str, List[str]]:
+    """Re-render previews only for assets whose .blend or settings changed.
 
-        job_dir = bridge.output_dir / result.job_id
-        for angle in angles:
-            src = job_dir / f"{angle}.png"
-            if src.exists():
-                dst = os.path.join(preview_dir, f"{asset_name}_{angle}.png")
-                shutil.copy2(src, dst)
-                output_paths.append(dst)
+    Up-to-date assets are found through docs/asset-previews/manifest.json
+    (see render_bridge.previews.PreviewManifest). The stale ones are
+    submitted as one bulk-priority batch. The manifest is saved atomically
+    every MANIFEST_SAVE_INTERVAL seconds while results come in, and once
+    more at the end, even on failure.
 
-        # Cleanup job files
-        bridge.cleanup_job(result.job_id)
+    Args:
+        assets: Asset name -> path to its .blend file.
+        angles: Angles to render (default: front, back, left, right).
+        resolution: Output resolution (square).
+        force: Re-render every asset.
+        timeout: Max seconds for the whole batch.
+        on_asset: Called with (asset, preview_paths) as each asset is published.
 
-        return output_paths
+    Returns:
+        Published preview paths of the assets rendered in this run.
 
+    Raises:
+        BridgeUnavailableError: If bridge is not available, times out, or
+            some assets failed (the others are published and recorded).
+    """
+    if angles is None:
+        angles = ["front", "back", "left", "right"]
+    render_engine = "BLENDER_EEVEE"
+
+    preview_dir = _preview_dir_for(_resolve_base_dir(base_dir))
+    manifest = PreviewManifest(preview_dir)
+    stale = list(assets) if force else manifest.stale(assets, angles, resolution, render_engine)
+    if not stale:
+        manifest.save()
+        return {}
+
+    bridge = get_bridge(base_dir=base_dir)
+    failed: List[str] = []
+    jobs: Dict[str, Tuple[str, RenderJob, dict]] = {}
+    for asset in stale:
+        try:
+            # Hash before rendering: an edit made mid-render stays stale
+            source = manifest.source_state(assets[asset])
+        except OSError as e:
+            failed.append(f"{asset}: {e}")
+            continue
+        job = RenderJob(
+            blend_file=assets[asset],
+            output_format="blend",  # previews only, no export
+            render_engine=render_engine,
+            generate_previews=True,
+            preview_angles=list(angles),
+            preview_resolution=resolution,
+            priority="bulk"
+        )
+        jobs[job.job_id] = (asset, job, source)
+    if not jobs:
+        manifest.save()
+        raise BridgeUnavailableError(f"{len(failed)} preview renders failed: {'; '.join(failed)}")
+
+    published: Dict[str, List[str]] = {}
+    os.makedirs(preview_dir, exist_ok=True)
+    handle = bridge.submit_batch([job for _, job, _ in jobs.values()])
+    last_save = time.time()
+    try:
+        for result in handle.as_completed(timeout or BRIDGE_TIMEOUT_STATIC * len(jobs)):
+            asset, job, source = jobs[result.job_id]
+            job_dir = bridge.output_dir / result.job_id
+            rendered = []
+            if result.success:
+                rendered = [angle for angle in angles if (job_dir / f"{angle}.png").exists()]
+            pairs = [
+                (job_dir / f"{angle}.png", os.path.join(preview_dir, preview_file_name(asset, angle)))
+                for angle in rendered
+            ]
+            publish_files(pairs, move=True)
+            paths = [dst for _, dst in pairs]
+            bridge.cleanup_job(result.job_id)
+            if not paths:
+                failed.append(f"{asset}: {result.error_message or 'no previews rendered'}")
+                continue
+            if len(rendered) < len(angles):
+                # Published but not recorded, so the next run renders it again
+                missing = [angle for angle in angles if angle not in rendered]
+                failed.append(f"{asset}: missing previews for {', '.join(missing)}")
+                continue
+
+            published[asset] = paths
+            manifest.record(asset, source, angles, resolution, render_engine,
+                            [os.path.basename(p) for p in paths])
+            if on_asset is not None:
+                on_asset(asset, paths)
+            if time.time() - last_save >= MANIFEST_SAVE_INTERVAL:
+                manifest.save()
+                last_save = time.time()
     except TimeoutError as e:
-        raise BridgeUnavailableError(f"Render timed out: {e}")
-    except Exception as e:
-        raise BridgeUnavailableError(f"Render error: {e}")
+        raise BridgeUnavailableError(f"Preview regeneration timed out: {e}")
+    finally:
+        # Drops the jobs that never finished (finished ones are already gone)
+        handle.cleanup()
+        manifest.save()
+
+    if failed:
+        raise BridgeUnavailableError(f"{len(failed)} preview renders failed: {'; '.join(failed)}")
+    return published
 
 
 def render_animation_frames_gpu(
@@ -180,6 +347,7 @@ def render_animation_frames_gpu(
     resolution: int = 256,
     timeout: Optional[float] = None,
     base_dir: Optional[Path] = None,
+    angle: str = "front34",
 ) -> Tuple[List[str], int, int]:
     """Render animation frames using GPU via the render bridge.
 
@@ -189,6 +357,7 @@ def render_animation_frames_gpu(
         action_name: Name of the animation action to render.
         resolution: Output resolution (square).
         timeout: Render timeout in seconds.
+        angle: Animation angle whose frames are returned.
 
     Returns:
         Tuple of (frame_paths, start_frame, end_frame).
@@ -211,7 +380,7 @@ def render_animation_frames_gpu(
             raise BridgeUnavailableError(f"Animation render failed: {result.error_message}")
 
         # Collect frame paths
-        job_dir = bridge.output_dir / result.job_id / "frames"
+        job_dir = bridge.output_dir / result.job_id / f"frames_{angle}"
         frame_files = sorted(job_dir.glob("frame_*.png"))
 
         if not frame_files:
@@ -240,9 +409,60 @@ def render_animation_frames_gpu(
         raise BridgeUnavailableError(f"Animation render error: {e}")
 
 
+def load_animation_frames_gpu(
+    blend_path: str,
+    action_name: str,
+    angle: str = "front34",
+    resolution: int = 256,
+    timeout: Optional[float] = None,
+    base_dir: Optional[Path] = None,
+    chunks: int = 1,
+):
+    """Render an animation via the bridge and load one angle as a NumPy array.
+
+    The job asks the watcher for raw RGBA frame segments, so the frames
+    are memory-mapped rather than decoded PNG by PNG (see
+    render_bridge.frames). Job outputs are left in place like
+    render_animation_frames_gpu.
+
+    Returns:
+        Tuple of ((N, H, W, 4) uint8 frames, start_frame, end_frame).
+
+    Raises:
+        BridgeUnavailableError: If bridge is not available or times out.
+    """
+    bridge = get_bridge(base_dir=base_dir)
+
+    try:
+        from render_bridge.frames import load_frames
+
+        result = bridge.render_animation(
+            blend_file=blend_path,
+            action_name=action_name,
+            render_engine="BLENDER_EEVEE",
+            resolution=resolution,
+            timeout=timeout or BRIDGE_TIMEOUT_ANIMATION,
+            chunks=chunks,
+            raw_frames=True
+        )
+
+        if result.status != "complete":
+            raise BridgeUnavailableError(f"Animation render failed: {result.error_message}")
+
+        return load_frames(bridge.output_dir / result.job_id / f"frames_{angle}")
+
+    except TimeoutError as e:
+        raise BridgeUnavailableError(f"Animation render timed out: {e}")
+    except Exception as e:
+        raise BridgeUnavailableError(f"Animation render error: {e}")
+
+
 def diagnose_blend_animation(blend_path: str) -> dict:
     """Run animation diagnostics on a blend file via the render bridge.
 
+    With RENDER_BRIDGE_CACHE set, an unchanged file is answered from the
+    cache without a Blender run.
+
     Args:
         blend_path: Path to the .blend file.
 
@@ -267,6 +487,11 @@ def cleanup_old_jobs(max_age_hours: float = 1.0):
 
     try:
         bridge = get_bridge()
+        if bridge.index is not None:
+            # Index knows every job's completion time; no directory walk
+            bridge.cleanup_older_than(max_age_hours * 3600)
+            return
+
         output_dir = bridge.output_dir
 
         cutoff_time = time.time() - (max_age_hours * 3600)
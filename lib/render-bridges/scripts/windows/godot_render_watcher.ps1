@@ -19,6 +19,11 @@
 .PARAMETER MaxParallel
     Maximum concurrent Godot instances. Default: 4
 
+.PARAMETER AgingSeconds
+    Job files are {job_id}.json (normal) or {job_id}.{priority}.json
+    (interactive/bulk). Interactive jobs start first; a waiting job is
+    promoted one priority class every AgingSeconds. Default: 120
+
 .EXAMPLE
     .\godot_render_watcher.ps1
     .\godot_render_watcher.ps1 -MaxParallel 6
@@ -30,7 +35,8 @@ param(
     [string]$ProjectPath = "",
     [int]$PollInterval = 1,
     [int]$JobTimeout = 120,
-    [int]$MaxParallel = 4
+    [int]$MaxParallel = 4,
+    [int]$AgingSeconds = 120
 )
 
 $ErrorActionPreference = "Stop"
@@ -148,9 +154,55 @@ function Release-JobLock {
     Remove-Item $lockFile -Force -ErrorAction SilentlyContinue
 }
 
+# Priority classes encoded in queue file names (lower rank starts first)
+$PriorityRank = @{ "interactive" = 0; "normal" = 1; "bulk" = 2 }
+
+# Strip the optional .{priority} suffix from a queue file's base name
+function Get-QueueJobId {
+    param([string]$FileName)
+    $stem = [System.IO.Path]::GetFileNameWithoutExtension($FileName)
+    $dot = $stem.LastIndexOf(".")
+    if ($dot -gt 0 -and $PriorityRank.ContainsKey($stem.Substring($dot + 1))) {
+        return $stem.Substring(0, $dot)
+    }
+    return $stem
+}
+
+# Effective rank: priority class, promoted one class per $AgingSeconds waited
+function Get-QueueJobRank {
+    param([System.IO.FileInfo]$File)
+    $stem = [System.IO.Path]::GetFileNameWithoutExtension($File.Name)
+    $priority = $stem.Substring($stem.LastIndexOf(".") + 1)
+    $rank = if ($PriorityRank.ContainsKey($priority)) { $PriorityRank[$priority] } else { 1 }
+    $waited = ((Get-Date) - $File.LastWriteTime).TotalSeconds
+    return [math]::Max(0, $rank - [math]::Floor($waited / $AgingSeconds))
+}
+
+# Write a file via temp + rename so readers never see a partial write
+function Write-FileAtomic {
+    param([string]$Path, [string]$Value)
+    $tmpPath = Join-Path (Split-Path -Parent $Path) ".$(Split-Path -Leaf $Path).tmp"
+    Set-Content -Path $tmpPath -Value $Value
+    Move-Item -Path $tmpPath -Destination $Path -Force
+}
+
+# Heartbeat JSON with free capacity (see render_bridge/liveness.py)
 function Update-Heartbeat {
     param([string]$HeartbeatPath)
-    Set-Content -Path $HeartbeatPath -Value (Get-Date -Format "o")
+    $active = $script:ActiveJobs.Count
+    $heartbeat = @{
+        version = 1
+        timestamp = (Get-Date).ToUniversalTime().ToString("o")
+        kind = "godot"
+        watcher_version = $GodotVersion
+        gpu = $GpuName
+        max_parallel = $MaxParallel
+        active = $active
+        free_slots = [math]::Max(0, $MaxParallel - $active)
+        pid = $PID
+        host = $env:COMPUTERNAME
+    }
+    Write-FileAtomic -Path $HeartbeatPath -Value ($heartbeat | ConvertTo-Json -Compress)
 }
 
 # Script block to process a single job (runs in background)
@@ -160,9 +212,15 @@ $ProcessJobScript = {
         [string]$GodotExe,
         [string]$ProjectPath,
         [string]$OutputDir,
-        [int]$JobTimeout
+        [int]$JobTimeout,
+        [double]$ClaimedAt
     )
 
+    # Unix time in seconds; phase timestamps are compared with the container's clock
+    function Get-UnixTime {
+        return [DateTimeOffset]::UtcNow.ToUnixTimeMilliseconds() / 1000.0
+    }
+
     function Get-GpuName {
         try {
             $gpu = Get-WmiObject Win32_VideoController | Select-Object -First 1
@@ -172,11 +230,15 @@ $ProcessJobScript = {
         }
     }
 
+    # {job_id}.json or {job_id}.{priority}.json
     $jobId = [System.IO.Path]::GetFileNameWithoutExtension($JobFile)
+    if ($jobId -match '^(.+)\.(interactive|normal|bulk)$') { $jobId = $Matches[1] }
+    $timestamps = @{ claimed = $ClaimedAt }
 
     try {
         # Read job configuration
         $job = Get-Content $JobFile -Raw | ConvertFrom-Json
+        if ($job.submitted_at) { $timestamps.submitted = [double]$job.submitted_at }
 
         # Build output path
         $outputFile = Join-Path $OutputDir "$jobId.png"
@@ -195,6 +257,7 @@ $ProcessJobScript = {
         )
 
         $startTime = Get-Date
+        $timestamps.process_started = Get-UnixTime
 
         # Run Godot with timeout
         $stdoutFile = Join-Path $OutputDir "${jobId}_stdout.txt"
@@ -206,6 +269,7 @@ $ProcessJobScript = {
         $completed = $process.WaitForExit($JobTimeout * 1000)
 
         $endTime = Get-Date
+        $timestamps.render_finished = Get-UnixTime
         $renderTime = ($endTime - $startTime).TotalSeconds
 
         if (-not $completed) {
@@ -232,7 +296,8 @@ $ProcessJobScript = {
             throw "Output file not created: $outputFile"
         }
 
-        # Write success result
+        # Write success result (temp file + rename: the container never sees a partial file)
+        $timestamps.result_written = Get-UnixTime
         $result = @{
             job_id = $jobId
             status = "success"
@@ -240,9 +305,12 @@ $ProcessJobScript = {
             render_time_seconds = [math]::Round($renderTime, 2)
             gpu_name = Get-GpuName
             error = $null
+            timestamps = $timestamps
         }
 
-        $result | ConvertTo-Json | Set-Content $resultFile
+        $tmpResultFile = Join-Path $OutputDir ".${jobId}_result.json.tmp"
+        $result | ConvertTo-Json | Set-Content $tmpResultFile
+        Move-Item -Path $tmpResultFile -Destination $resultFile -Force
 
         # Keep temp files for debugging animation captures
         # Remove-Item $stdoutFile -Force -ErrorAction SilentlyContinue
@@ -255,6 +323,8 @@ $ProcessJobScript = {
 
     } catch {
         # Write error result
+        if (-not $timestamps.render_finished) { $timestamps.render_finished = Get-UnixTime }
+        $timestamps.result_written = Get-UnixTime
         $result = @{
             job_id = $jobId
             status = "error"
@@ -262,10 +332,13 @@ $ProcessJobScript = {
             render_time_seconds = 0
             gpu_name = Get-GpuName
             error = $_.ToString()
+            timestamps = $timestamps
         }
 
         $resultFile = Join-Path $OutputDir "${jobId}_result.json"
-        $result | ConvertTo-Json | Set-Content $resultFile
+        $tmpResultFile = Join-Path $OutputDir ".${jobId}_result.json.tmp"
+        $result | ConvertTo-Json | Set-Content $tmpResultFile
+        Move-Item -Path $tmpResultFile -Destination $resultFile -Force
 
         # Remove failed job from queue
         Remove-Item $JobFile -Force -ErrorAction SilentlyContinue
@@ -294,6 +367,7 @@ if (-not $GodotPath) {
 }
 
 $GpuName = Get-GpuName
+$GodotVersion = "$(& $GodotPath --version 2>&1 | Select-Object -First 1)".Trim()
 
 Write-Log "Godot found: $GodotPath"
 Write-Log "Project path: $ProjectPath"
@@ -345,17 +419,18 @@ while ($true) {
         $activeCount = $script:ActiveJobs.Count
         if ($activeCount -lt $MaxParallel) {
             $jobs = Get-ChildItem -Path $QueueDir -Filter "*.json" -ErrorAction SilentlyContinue |
-                    Sort-Object CreationTime |
+                    Sort-Object @{ Expression = { Get-QueueJobRank $_ } }, LastWriteTime |
                     Select-Object -First ($MaxParallel - $activeCount)
 
             foreach ($jobFile in $jobs) {
-                $jobId = [System.IO.Path]::GetFileNameWithoutExtension($jobFile.Name)
+                $jobId = Get-QueueJobId $jobFile.Name
 
                 # Skip if already processing
                 if ($script:ActiveJobs.ContainsKey($jobId)) { continue }
 
                 # Try to acquire lock
                 if (-not (Acquire-JobLock $jobId)) { continue }
+                $claimedAt = [DateTimeOffset]::UtcNow.ToUnixTimeMilliseconds() / 1000.0
 
                 Write-Log "[$jobId] Starting..." "INFO"
 
@@ -365,7 +440,8 @@ while ($true) {
                     $GodotPath,
                     $ProjectPath,
                     $OutputDir,
-                    $JobTimeout
+                    $JobTimeout,
+                    $claimedAt
                 )
 
                 $script:ActiveJobs[$jobId] = $psJob
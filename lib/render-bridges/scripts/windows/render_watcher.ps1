@@ -7,12 +7,18 @@
 #   .\scripts\windows\render_watcher.ps1 -MaxParallel 4
 #   .\scripts\windows\render_watcher.ps1 -BlenderPath "C:\Custom\Blender\blender.exe"
 #   .\scripts\windows\render_watcher.ps1 -Once  # Process once and exit
+#
+# Job files are {job_id}.json (normal priority) or {job_id}.{priority}.json
+# with priority interactive/bulk. Interactive jobs start first, bulk last;
+# every -AgingSeconds a waiting job is promoted one class so bulk work
+# can't starve.
 
 param(
     [string]$BlenderPath = "",
     [switch]$Once = $false,
     [int]$PollInterval = 1,
-    [int]$MaxParallel = 8  # Default to 8 concurrent Blender instances
+    [int]$MaxParallel = 8,  # Default to 8 concurrent Blender instances
+    [int]$AgingSeconds = 120
 )
 
 $ErrorActionPreference = "Stop"
@@ -25,6 +31,7 @@ $QueueDir = Join-Path $TempDir "render-queue"
 $OutputDir = Join-Path $TempDir "render-output"
 $LogFile = Join-Path $TempDir "render-watcher.log"
 $LockDir = Join-Path $TempDir "render-locks"
+$HeartbeatFile = Join-Path $TempDir "render-watcher-heartbeat"
 
 # Track active jobs
 $script:ActiveJobs = @{}
@@ -132,6 +139,89 @@ function Release-JobLock {
     Remove-Item $lockFile -Force -ErrorAction SilentlyContinue
 }
 
+# Priority classes encoded in queue file names (lower rank starts first)
+$PriorityRank = @{ "interactive" = 0; "normal" = 1; "bulk" = 2 }
+
+# Split a queue file name into job id and priority
+function Get-QueueJobInfo {
+    param([System.IO.FileInfo]$File)
+    $stem = [System.IO.Path]::GetFileNameWithoutExtension($File.Name)
+    $dot = $stem.LastIndexOf(".")
+    if ($dot -gt 0 -and $PriorityRank.ContainsKey($stem.Substring($dot + 1))) {
+        return @{ JobId = $stem.Substring(0, $dot); Priority = $stem.Substring($dot + 1) }
+    }
+    return @{ JobId = $stem; Priority = "normal" }
+}
+
+# Effective rank: priority class, promoted one class per $AgingSeconds waited
+function Get-QueueJobRank {
+    param([System.IO.FileInfo]$File)
+    $info = Get-QueueJobInfo $File
+    $waited = ((Get-Date) - $File.LastWriteTime).TotalSeconds
+    return [math]::Max(0, $PriorityRank[$info.Priority] - [math]::Floor($waited / $AgingSeconds))
+}
+
+# Queue file name for a job (normal priority keeps the plain name)
+function Get-QueueFileName {
+    param([string]$JobId, [string]$Priority)
+    if (-not $Priority -or $Priority -eq "normal") { return "$JobId.json" }
+    return "$JobId.$Priority.json"
+}
+
+# Expand batch manifests ({batch_id}.batch) into individual job files.
+# The container writes one manifest per batch; splitting it here keeps
+# the per-job writes on the local filesystem instead of the bind mount.
+function Expand-BatchManifests {
+    $manifests = Get-ChildItem -Path $QueueDir -Filter "*.batch" -ErrorAction SilentlyContinue
+    foreach ($manifest in $manifests) {
+        $batchId = [System.IO.Path]::GetFileNameWithoutExtension($manifest.Name)
+        if (-not (Acquire-JobLock $batchId)) { continue }
+        try {
+            $batch = Get-Content $manifest.FullName -Raw | ConvertFrom-Json
+            foreach ($job in $batch.jobs) {
+                $jobFile = Join-Path $QueueDir (Get-QueueFileName $job.job_id $job.priority)
+                $tmpFile = Join-Path $QueueDir ".$($job.job_id).json.tmp"
+                $job | ConvertTo-Json -Depth 10 | Out-File -FilePath $tmpFile -Encoding utf8
+                Move-Item -Path $tmpFile -Destination $jobFile -Force
+            }
+            Remove-Item $manifest.FullName -Force
+            Write-Host "[$batchId] Expanded batch ($(@($batch.jobs).Count) jobs)" -ForegroundColor Cyan
+        }
+        catch {
+            Write-Log "[$batchId] Failed to expand batch: $_" "Red"
+        }
+        finally {
+            Release-JobLock $batchId
+        }
+    }
+}
+
+# Unix time in seconds; phase timestamps are compared with the container's clock
+function Get-UnixTime {
+    return [DateTimeOffset]::UtcNow.ToUnixTimeMilliseconds() / 1000.0
+}
+
+# Heartbeat JSON (see render_bridge/liveness.py); rewritten every loop so the
+# container can check liveness and free capacity without touching the queue
+function Update-Heartbeat {
+    $active = $script:ActiveJobs.Count
+    $heartbeat = @{
+        version = 1
+        timestamp = (Get-Date).ToUniversalTime().ToString("o")
+        kind = "blender"
+        watcher_version = $BlenderVersion
+        gpu = $GpuName
+        max_parallel = $MaxParallel
+        active = $active
+        free_slots = [math]::Max(0, $MaxParallel - $active)
+        pid = $PID
+        host = $env:COMPUTERNAME
+    }
+    $tmpFile = Join-Path $TempDir ".render-watcher-heartbeat.tmp"
+    $heartbeat | ConvertTo-Json -Compress | Out-File -FilePath $tmpFile -Encoding utf8
+    Move-Item -Path $tmpFile -Destination $HeartbeatFile -Force
+}
+
 # Write result JSON
 function Write-RenderResult {
     param(
@@ -142,9 +232,11 @@ function Write-RenderResult {
         [string[]]$PreviewFiles = @(),
         [double]$RenderTime = 0,
         [string]$BlenderVer = "",
-        [string]$Gpu = ""
+        [string]$Gpu = "",
+        [hashtable]$Timestamps = @{}
     )
 
+    $Timestamps.result_written = Get-UnixTime
     $result = @{
         job_id = $JobId
         status = $Status
@@ -154,10 +246,14 @@ function Write-RenderResult {
         error_message = $ErrorMessage
         blender_version = $BlenderVer
         gpu_used = $Gpu
+        timestamps = $Timestamps
     }
 
+    # Write-then-rename so the container never reads a partial result
     $resultFile = Join-Path $OutputDir "$JobId.result.json"
-    $result | ConvertTo-Json -Depth 10 | Out-File -FilePath $resultFile -Encoding utf8
+    $tmpFile = Join-Path $OutputDir ".$JobId.result.json.tmp"
+    $result | ConvertTo-Json -Depth 10 | Out-File -FilePath $tmpFile -Encoding utf8
+    Move-Item -Path $tmpFile -Destination $resultFile -Force
 }
 
 # Process a single render job (runs in background)
@@ -169,9 +265,14 @@ $ProcessJobScript = {
         [string]$LogFile,
         [string]$BlenderVersion,
         [string]$GpuName,
-        [string]$RepoRoot
+        [string]$RepoRoot,
+        [double]$ClaimedAt
     )
 
+    function Get-UnixTime {
+        return [DateTimeOffset]::UtcNow.ToUnixTimeMilliseconds() / 1000.0
+    }
+
     # Helper: Convert container path
     function Convert-ContainerPath {
         param([string]$Path)
@@ -183,21 +284,27 @@ $ProcessJobScript = {
         return Join-Path $RepoRoot $Path.Replace("/", "\")
     }
 
-    # Helper: Write result
+    # Helper: Write result ($timestamps is the job's phase record below)
     function Write-RenderResult {
         param($JobId, $Status, $OutputFiles, $ErrorMessage = "", $PreviewFiles = @(), $RenderTime = 0)
+        $timestamps.result_written = Get-UnixTime
         $result = @{
             job_id = $JobId; status = $Status; output_files = $OutputFiles
             preview_files = $PreviewFiles; render_time_seconds = $RenderTime
             error_message = $ErrorMessage; blender_version = $BlenderVersion; gpu_used = $GpuName
+            timestamps = $timestamps
         }
         $resultFile = Join-Path $OutputDir "$JobId.result.json"
-        $result | ConvertTo-Json -Depth 10 | Out-File -FilePath $resultFile -Encoding utf8
+        $tmpFile = Join-Path $OutputDir ".$JobId.result.json.tmp"
+        $result | ConvertTo-Json -Depth 10 | Out-File -FilePath $tmpFile -Encoding utf8
+        Move-Item -Path $tmpFile -Destination $resultFile -Force
     }
 
     $job = Get-Content $JobFilePath | ConvertFrom-Json
     $jobId = $job.job_id
     $startTime = Get-Date
+    $timestamps = @{ claimed = $ClaimedAt }
+    if ($job.submitted_at) { $timestamps.submitted = [double]$job.submitted_at }
 
     # Create job output directory
     $jobOutputDir = Join-Path $OutputDir $jobId
@@ -212,6 +319,7 @@ $ProcessJobScript = {
         return @{ JobId = $jobId; Status = "failed"; Error = "Blend file not found" }
     }
 
+    $timestamps.process_started = Get-UnixTime
     try {
         $outputFiles = @()
         $previewFiles = @()
@@ -222,8 +330,22 @@ $ProcessJobScript = {
             $args = @("--background", $blendFile, "--python", $scriptPath)
             if ($job.script_args) { $args += "--"; $args += $job.script_args }
 
+            # Scripts write structured output (e.g. diagnostics.json) into the job dir
+            $env:RENDER_JOB_OUTPUT_DIR = $jobOutputDir
+            $env:RENDER_JOB_ID = $jobId
+            $env:RENDER_REPO_ROOT = $RepoRoot
+
             $blenderOutput = & $Blender @args 2>&1 | Out-String
-            if ($LASTEXITCODE -ne 0) {
+            $scriptExitCode = $LASTEXITCODE
+
+            # Log for the diagnostics fallback (read_log_tail). Parallel jobs
+            # share the log file, so a sharing violation must not fail the job.
+            $separator = "=" * 60
+            try {
+                Add-Content -Path $LogFile -Value "`n$separator`nJOB: $jobId @ $(Get-Date -Format "yyyy-MM-dd HH:mm:ss")`n$separator`n$blenderOutput`n$separator`n" -Encoding UTF8 -ErrorAction Stop
+            } catch { }
+
+            if ($scriptExitCode -ne 0) {
                 throw "Script failed: $blenderOutput"
             }
         }
@@ -323,12 +445,14 @@ bpy.ops.render.render(write_still=True)
         # Render animation if requested (renders from multiple angles)
         if ($job.render_animation) {
             $actionName = if ($job.action_name) { "'$($job.action_name)'" } else { "None" }
-            $frameStartParam = if ($job.frame_start) { $job.frame_start } else { "None" }
-            $frameEndParam = if ($job.frame_end) { $job.frame_end } else { "None" }
+            # Explicit null checks: frame 0 is a valid chunk start
+            $frameStartParam = if ($null -ne $job.frame_start) { $job.frame_start } else { "None" }
+            $frameEndParam = if ($null -ne $job.frame_end) { $job.frame_end } else { "None" }
 
             # Get animation angles (default to front34, side, top)
             $animAngles = if ($job.animation_angles) { $job.animation_angles } else { @("front34", "side", "top") }
             $animAnglesJson = $animAngles | ConvertTo-Json -Compress
+            $rawFramesParam = if ($job.raw_frames) { "True" } else { "False" }
 
             $animScript = @"
 import bpy
@@ -338,6 +462,9 @@ scene = bpy.context.scene
 scene.render.engine = '$($job.render_engine)'
 scene.render.resolution_x = $($job.preview_resolution)
 scene.render.resolution_y = $($job.preview_resolution)
+# The .blend may be saved at another percentage; the raw frame segments
+# are sized from resolution_x/y
+scene.render.resolution_percentage = 100
 scene.render.film_transparent = True
 scene.render.image_settings.file_format = 'PNG'
 scene.render.image_settings.color_mode = 'RGBA'
@@ -524,6 +651,11 @@ def get_view_frame(cam_dir, verts, bbox_center, padding=1.5):
 
 # Render frames for each requested angle
 requested_angles = $animAnglesJson
+# Raw RGBA segment per angle (render_bridge.frames): frames_{start:04d}-{end:04d}.rgba + .json
+write_raw = $rawFramesParam
+if write_raw:
+    import json
+    import numpy as np
 scene.frame_start = frame_start
 scene.frame_end = frame_end
 cam_obj.rotation_mode = 'QUATERNION'
@@ -547,12 +679,32 @@ for angle_name in requested_angles:
 
     print(f'Rendering {angle_name}: frames {frame_start}-{frame_end}')
 
+    raw_stem = os.path.join(angle_frames_dir, f'frames_{frame_start:04d}-{frame_end:04d}')
+    if write_raw:
+        res_x, res_y = scene.render.resolution_x, scene.render.resolution_y
+        raw = np.memmap(raw_stem + '.rgba', dtype=np.uint8, mode='w+',
+                        shape=(frame_end - frame_start + 1, res_y, res_x, 4))
+        pixels = np.empty(res_x * res_y * 4, dtype=np.float32)
+
     # Render all frames for this angle
     for frame in range(frame_start, frame_end + 1):
         scene.frame_set(frame)
         bpy.context.view_layer.update()
         scene.render.filepath = os.path.join(angle_frames_dir, f'frame_{frame:04d}.png')
         bpy.ops.render.render(write_still=True)
+        if write_raw:
+            # Read the written PNG back; Blender stores rows bottom-up
+            image = bpy.data.images.load(scene.render.filepath)
+            image.pixels.foreach_get(pixels)
+            raw[frame - frame_start] = (pixels.reshape(res_y, res_x, 4)[::-1] * 255.0 + 0.5).astype(np.uint8)
+            bpy.data.images.remove(image)
+
+    if write_raw:
+        raw.flush()
+        del raw
+        with open(raw_stem + '.json', 'w') as f:
+            json.dump({'width': res_x, 'height': res_y, 'channels': 4,
+                       'frame_start': frame_start, 'frame_end': frame_end}, f)
 
     print(f'  Completed {angle_name}: {frame_end - frame_start + 1} frames')
 "@
@@ -570,6 +722,10 @@ for angle_name in requested_angles:
                     foreach ($frame in $frameFiles) {
                         $outputFiles += "$jobId/frames_$angle/$($frame.Name)"
                     }
+                    $rawFiles = Get-ChildItem -Path $angleFramesDir -Filter "frames_*" -ErrorAction SilentlyContinue
+                    foreach ($rawFile in $rawFiles) {
+                        $outputFiles += "$jobId/frames_$angle/$($rawFile.Name)"
+                    }
                     $totalFrames += $frameFiles.Count
                 }
             }
@@ -860,12 +1016,14 @@ if generate_sheet and len(rendered_images) > 1:
             if (Test-Path $sheetPath) { $previewFiles += "$jobId/contact_sheet.png" }
         }
 
+        $timestamps.render_finished = Get-UnixTime
         $elapsed = ((Get-Date) - $startTime).TotalSeconds
         Write-RenderResult $jobId "complete" $outputFiles "" $previewFiles $elapsed
         return @{ JobId = $jobId; Status = "complete"; Time = $elapsed }
     }
     catch {
         $errorMsg = $_.ToString()
+        $timestamps.render_finished = Get-UnixTime
         Write-RenderResult $jobId "failed" @() $errorMsg
         return @{ JobId = $jobId; Status = "failed"; Error = $errorMsg }
     }
@@ -930,22 +1088,27 @@ do {
     foreach ($jobId in $completedJobs) {
         $script:ActiveJobs.Remove($jobId)
     }
+    Update-Heartbeat
+
+    # Split any batch manifests into job files before scanning the queue
+    Expand-BatchManifests
 
     # Check for new jobs if we have capacity
     $activeCount = $script:ActiveJobs.Count
     if ($activeCount -lt $MaxParallel) {
         $jobs = Get-ChildItem -Path $QueueDir -Filter "*.json" -ErrorAction SilentlyContinue |
-                Sort-Object CreationTime |
+                Sort-Object @{ Expression = { Get-QueueJobRank $_ } }, LastWriteTime |
                 Select-Object -First ($MaxParallel - $activeCount)
 
         foreach ($jobFile in $jobs) {
-            $jobId = [System.IO.Path]::GetFileNameWithoutExtension($jobFile.Name)
+            $jobId = (Get-QueueJobInfo $jobFile).JobId
 
             # Skip if already processing
             if ($script:ActiveJobs.ContainsKey($jobId)) { continue }
 
             # Try to acquire lock
             if (-not (Acquire-JobLock $jobId)) { continue }
+            $claimedAt = Get-UnixTime
 
             Write-Host "[$jobId] Starting..." -ForegroundColor Cyan
 
@@ -957,7 +1120,8 @@ do {
                 $LogFile,
                 $BlenderVersion,
                 $GpuName,
-                $RepoRoot
+                $RepoRoot,
+                $claimedAt
             )
 
             $script:ActiveJobs[$jobId] = $psJob
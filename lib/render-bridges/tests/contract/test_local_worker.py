@@ -0,0 +1,217 @@
+import json
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from render_bridge.bridge import RenderBridge
+from render_bridge.frames import load_frames
+from render_bridge.job import RenderJob
+from render_bridge.worker import LocalRenderWorker, fake_glb, fake_png
+import godot_render_bridge as godot_bridge
+import render_bridge_integration as integration
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class FakeOutputTests(unittest.TestCase):
+    def test_fake_png_is_deterministic_and_valid(self):
+        png = fake_png(4, 3, "seed")
+        self.assertEqual(png, fake_png(4, 3, "seed"))
+        self.assertNotEqual(png, fake_png(4, 3, "other"))
+        self.assertTrue(png.startswith(b"\x89PNG\r\n\x1a\n"))
+        self.assertEqual(struct.unpack(">II", png[16:24]), (4, 3))
+
+    def test_fake_glb_header(self):
+        glb = fake_glb("seed")
+        magic, version, length = struct.unpack("<4sII", glb[:12])
+        self.assertEqual((magic, version, length), (b"glTF", 2, len(glb)))
+        self.assertEqual(len(glb) % 4, 0)
+
+
+class LocalWorkerEndToEndTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.blend = self.base / "asset.blend"
+        self.blend.write_bytes(b"BLENDER")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_blender_render_with_previews(self):
+        bridge = RenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, poll_interval=0.05):
+            result = bridge.render_blend(
+                str(self.blend), generate_previews=True, preview_angles=["front", "top"], preview_resolution=16
+            )
+        self.assertTrue(result.success)
+        self.assertEqual(result.output_files, [f"{result.job_id}/{result.job_id}.glb"])
+        self.assertEqual(len(result.preview_files), 2)
+        for rel in result.output_files + result.preview_files:
+            self.assertTrue((bridge.output_dir / rel).is_file(), rel)
+        self.assertEqual(bridge.list_pending_jobs(), [])
+        self.assertEqual(list((self.base / "temp" / "render-locks").iterdir()), [])
+        stamps = result.timestamps
+        self.assertLessEqual(stamps["submitted"], stamps["claimed"])
+        self.assertLessEqual(stamps["process_started"], stamps["render_finished"])
+        self.assertLessEqual(stamps["result_written"], stamps["observed"])
+
+    def test_missing_blend_file_fails(self):
+        bridge = RenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, poll_interval=0.05):
+            with self.assertRaises(RuntimeError):
+                bridge.render_blend(str(self.base / "missing.blend"))
+
+    def test_batch_is_expanded_and_completed(self):
+        bridge = RenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        jobs = [RenderJob(blend_file=str(self.blend), output_format="png", job_id=f"b{i}") for i in range(5)]
+        batch = bridge.submit_batch(jobs)
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, max_parallel=2, poll_interval=0.05):
+            results = batch.wait(timeout=10)
+        self.assertEqual(sorted(results), [job.job_id for job in jobs])
+        self.assertTrue(all(r.success for r in results.values()))
+
+    def test_chunked_animation_is_merged(self):
+        bridge = RenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, max_parallel=3, poll_interval=0.05):
+            result = bridge.render_animation(str(self.blend), frame_start=1, frame_end=7, resolution=8, chunks=3)
+        self.assertTrue(result.success, result.error_message)
+        frames = [f for f in result.output_files if "/frames_" in f]
+        self.assertEqual(len(frames), 7 * 3)
+        self.assertIn(f"{result.job_id}/frames_side/frame_0007.png", frames)
+        self.assertIn(f"{result.job_id}/{result.job_id}.glb", result.output_files)
+        for rel in result.output_files:
+            self.assertTrue((bridge.output_dir / rel).is_file(), rel)
+        self.assertEqual(bridge.get_result(result.job_id).output_files, result.output_files)
+        self.assertEqual(sorted(p.name for p in bridge.output_dir.iterdir() if p.is_dir()), [result.job_id])
+
+    def test_chunked_animation_without_bounds_reads_range_first(self):
+        bridge = RenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, max_parallel=3, poll_interval=0.05):
+            result = bridge.render_animation(str(self.blend), resolution=8, chunks=3)
+            self.assertTrue(result.success, result.error_message)
+            # The diagnostic job is gone; only the animation's files remain
+            self.assertEqual(sorted(p.name for p in bridge.output_dir.iterdir()),
+                             sorted([result.job_id, f"{result.job_id}.result.json"]))
+
+            with mock.patch.object(bridge, "diagnose_blend", side_effect=RuntimeError("script failed")):
+                fallback = bridge.render_animation(str(self.blend), resolution=8, chunks=3)
+        self.assertTrue(fallback.success, fallback.error_message)
+
+    def test_previews_stream_per_angle_group(self):
+        bridge = RenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        angles = ["front", "back", "left", "right", "top"]
+        streamed = []
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, poll_interval=0.05):
+            for angle, path in bridge.iter_previews(str(self.blend), angles, resolution=8, group_size=2):
+                self.assertTrue(path.is_file())
+                streamed.append(angle)
+        self.assertEqual(sorted(streamed), sorted(angles))
+        self.assertEqual([p for p in bridge.output_dir.iterdir()], [])
+
+    def test_preview_groups_arrive_whole(self):
+        bridge = RenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        angles = ["front", "back", "left", "right", "top"]
+        groups = []
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, poll_interval=0.05):
+            for group in bridge.iter_preview_groups(str(self.blend), angles, resolution=8, group_size=2):
+                self.assertTrue(all(path.is_file() for _, path in group))
+                groups.append([angle for angle, _ in group])
+        self.assertEqual(sorted(len(g) for g in groups), [1, 2, 2])
+        self.assertEqual(sorted(a for g in groups for a in g), sorted(angles))
+
+    def test_static_preview_gpu_publishes_each_angle(self):
+        seen = []
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, max_parallel=2, poll_interval=0.05):
+            paths = integration.render_static_preview_gpu(
+                str(self.blend), "crate", angles=["front", "top"], resolution=8, timeout=10,
+                base_dir=self.base, on_angle=lambda angle, path: seen.append(angle),
+            )
+        preview_dir = self.base / "docs" / "asset-previews"
+        self.assertEqual(paths, [str(preview_dir / "crate_front.png"), str(preview_dir / "crate_top.png")])
+        self.assertEqual(sorted(seen), ["front", "top"])
+        self.assertTrue(all(Path(p).is_file() for p in paths))
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_raw_frames_load_across_chunks(self):
+        bridge = RenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, max_parallel=2, poll_interval=0.05):
+            result = bridge.render_animation(
+                str(self.blend), frame_start=1, frame_end=6, resolution=4, chunks=2, raw_frames=True
+            )
+        frames_dir = bridge.output_dir / result.job_id / "frames_side"
+        frames, start, end = load_frames(frames_dir)
+        self.assertEqual((frames.shape, start, end), ((6, 4, 4, 4), 1, 6))
+        # Each fake frame is one solid colour; raw segments match the PNGs
+        pngs = sorted(p.read_bytes() for p in frames_dir.glob("frame_*.png"))
+        self.assertEqual(len(set(pngs)), 6)
+        self.assertEqual(len({frames[i].tobytes() for i in range(6)}), 6)
+        self.assertTrue((frames[..., 3] == 255).all())
+
+    def test_regenerate_previews_skips_unchanged_assets(self):
+        other = self.base / "other.blend"
+        other.write_bytes(b"BLENDER other")
+        assets = {"crate": str(self.blend), "barrel": str(other)}
+        preview_dir = self.base / "docs" / "asset-previews"
+        run = lambda **kw: integration.regenerate_previews(
+            assets, angles=["front", "top"], resolution=8, timeout=10, base_dir=self.base, **kw)
+
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, max_parallel=2, poll_interval=0.05):
+            self.assertEqual(sorted(run()), ["barrel", "crate"])
+            self.assertEqual(run(), {})
+            os.utime(other)  # touched, same contents
+            self.assertEqual(run(), {})
+            other.write_bytes(b"BLENDER other, edited")
+            (preview_dir / "crate_top.png").unlink()
+            self.assertEqual(sorted(run()), ["barrel", "crate"])
+            self.assertEqual(sorted(run(force=True)), ["barrel", "crate"])
+
+        manifest = json.loads((preview_dir / "manifest.json").read_text())
+        self.assertEqual(manifest["assets"]["crate"]["files"], ["crate_front.png", "crate_top.png"])
+        output_dir = self.base / "temp" / "render-output"
+        self.assertEqual([p for p in output_dir.iterdir() if p.is_dir()], [])
+
+    def test_regenerate_previews_timeout_drops_unfinished_jobs(self):
+        with self.assertRaises(integration.BridgeUnavailableError):
+            integration.regenerate_previews({"crate": str(self.blend)}, timeout=0.05, base_dir=self.base)
+        self.assertEqual(list((self.base / "temp" / "render-queue").glob("*.*")), [])
+
+    def test_run_once_processes_synchronously(self):
+        bridge = RenderBridge(base_dir=self.base)
+        job_id = bridge.submit_job(RenderJob(blend_file=str(self.blend), job_id="sync1"))
+        worker = LocalRenderWorker(kind="blender", base_dir=self.base, fake=True)
+        self.assertEqual(worker.run_once(), 1)
+        self.assertTrue(bridge.get_result(job_id).success)
+
+    def test_bridge_availability_reads_worker_heartbeat(self):
+        self.assertFalse(integration.is_bridge_available(base_dir=self.base))
+        with LocalRenderWorker(kind="blender", base_dir=self.base, fake=True, max_parallel=3):
+            status = integration.get_watcher_status(base_dir=self.base, refresh=True)
+            self.assertTrue(status.alive)
+            self.assertEqual((status.kind, status.max_parallel, status.free_slots), ("blender", 3, 3))
+            self.assertTrue(integration.is_bridge_available(base_dir=self.base, min_free_slots=3))
+            self.assertFalse(integration.is_bridge_available(base_dir=self.base, min_free_slots=4))
+
+    def test_godot_single_asset(self):
+        bridge = godot_bridge.GodotRenderBridge(base_dir=self.base, timeout=10, poll_interval=0.05)
+        with LocalRenderWorker(kind="godot", base_dir=self.base, fake=True, poll_interval=0.05):
+            self.assertTrue(bridge.is_watcher_running())
+            result = bridge.render_single_asset(
+                "res://assets/tree.glb", "forest", output_width=8, output_height=8
+            )
+        self.assertEqual(result.status, "success", result.error)
+        self.assertTrue(Path(result.output_file).is_file())
+
+
+if __name__ == "__main__":
+    unittest.main()
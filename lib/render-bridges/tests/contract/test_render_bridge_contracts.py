@@ -1,16 +1,53 @@
+import asyncio
+import contextlib
+import errno
+import io
 import json
 import os
+import struct
 import tempfile
+import threading
+import time
 import unittest
+from unittest import mock
+import zlib
 from pathlib import Path
 import sys
 
 ROOT = Path(__file__).resolve().parents[2]
 sys.path.insert(0, str(ROOT))
 
-from render_bridge.job import RenderJob, RenderResult, JobStatus
+from render_bridge.job import RenderJob, RenderResult, RenderBatch, JobStatus
 import render_bridge.bridge as bridge_module
 import godot_render_bridge as godot_bridge
+from render_bridge.aio import AsyncRenderBridge
+from render_bridge import cache as cache_module
+from render_bridge.cache import RenderCache
+from render_bridge.coalesce import InflightRegistry
+from render_bridge.previews import PreviewManifest
+from render_bridge.diagnostics import DIAGNOSTIC_SCRIPT, DIAGNOSTICS_FILE_NAME, DEFORMATION_STATS_SOURCE
+from render_bridge.job import queue_filename, parse_queue_filename
+from render_bridge import events as ev
+from render_bridge import fileio
+from render_bridge import contact_sheet as contact_sheet_module
+from render_bridge import frames as frames_module
+from render_bridge import liveness
+from render_bridge.worker import fake_png
+from render_bridge.events import EventBus, EventLog
+from render_bridge.index import JobIndex
+from render_bridge.metrics import RenderMetrics, phase_durations
+from render_bridge.scheduler import QueueScheduler
+from render_bridge.watch import inotify_supported
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
 
 class RenderBridgeContractTests(unittest.TestCase):
     def test_render_job_schema(self):
@@ -49,6 +86,8 @@ class RenderBridgeContractTests(unittest.TestCase):
             "frame_end",
             "action_name",
             "animation_angles",
+            "priority",
+            "submitted_at",
         }
         self.assertTrue(expected_keys.issubset(data.keys()))
 
@@ -79,6 +118,7 @@ class RenderBridgeContractTests(unittest.TestCase):
             "error_traceback",
             "blender_version",
             "gpu_used",
+            "timestamps",
         }
         self.assertTrue(expected_keys.issubset(data.keys()))
 
@@ -159,5 +199,995 @@ class RenderBridgeContractTests(unittest.TestCase):
             self.assertFalse(job_file.exists())
 
 
+class ResultWatcherTests(unittest.TestCase):
+    def _write_later(self, path: Path, content: str, delay: float = 0.05):
+        def write():
+            time.sleep(delay)
+            path.write_text(content)
+        thread = threading.Thread(target=write)
+        thread.start()
+        return thread
+
+    @unittest.skipUnless(inotify_supported(), "inotify not available")
+    def test_wait_for_result_wakes_on_result_event(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir), poll_interval=30.0)
+            result = RenderResult(job_id="fast", status=JobStatus.COMPLETE.value)
+            writer = self._write_later(bridge.output_dir / "fast.result.json", result.to_json())
+
+            start = time.time()
+            loaded = bridge.wait_for_result("fast", timeout=10.0)
+            writer.join()
+
+            self.assertEqual(loaded.job_id, "fast")
+            self.assertLess(time.time() - start, 5.0)
+
+    def test_godot_wait_for_result_polling_fallback(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = godot_bridge.GodotRenderBridge(
+                timeout=5.0, poll_interval=0.01, base_dir=Path(temp_dir), use_inotify=False
+            )
+            (bridge.output_dir / "slow.png").write_bytes(b"png")
+            writer = self._write_later(
+                bridge.output_dir / "slow_result.json", json.dumps({"status": "success"})
+            )
+
+            result = bridge.wait_for_result("slow")
+            writer.join()
+
+            self.assertEqual(result.status, "success")
+
+
+class MultiJobWaitTests(unittest.TestCase):
+    def test_render_bridge_as_completed_streams_results(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir), poll_interval=0.01)
+            for job_id, status in [("a", JobStatus.COMPLETE.value), ("b", JobStatus.FAILED.value)]:
+                RenderResult(job_id=job_id, status=status).save(
+                    bridge.output_dir / f"{job_id}.result.json"
+                )
+
+            results = bridge.wait_for_many(["a", "b"], timeout=1.0)
+            self.assertEqual(set(results), {"a", "b"})
+            self.assertFalse(results["b"].success)
+
+            with self.assertRaises(TimeoutError):
+                list(bridge.as_completed(["a", "missing"], timeout=0.05))
+
+    def test_godot_wait_for_many_reports_timeouts(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = godot_bridge.GodotRenderBridge(
+                timeout=0.05, poll_interval=0.01, base_dir=Path(temp_dir)
+            )
+            (bridge.output_dir / "done.png").write_bytes(b"png")
+            (bridge.output_dir / "done_result.json").write_text(json.dumps({"status": "success"}))
+
+            results = bridge.wait_for_many(["done", "missing"])
+            self.assertEqual(results["done"].status, "success")
+            self.assertEqual(results["missing"].status, "timeout")
+
+
+class AsyncRenderBridgeTests(unittest.TestCase):
+    def test_submit_and_stream_results(self):
+        async def scenario(base: Path):
+            bridge = AsyncRenderBridge(base_dir=base, poll_interval=0.01)
+            job_ids = [await bridge.submit(RenderJob(blend_file=f"/tmp/{i}.blend")) for i in range(3)]
+            self.assertEqual(len(list(bridge.bridge.queue_dir.glob("*.json"))), 3)
+
+            async def complete_later():
+                await asyncio.sleep(0.02)
+                for job_id in reversed(job_ids):
+                    RenderResult(job_id=job_id, status=JobStatus.COMPLETE.value).save(
+                        bridge.bridge.output_dir / f"{job_id}.result.json"
+                    )
+
+            writer = asyncio.create_task(complete_later())
+            single = asyncio.create_task(bridge.wait_for_result(job_ids[0], timeout=2.0))
+            streamed = [result.job_id async for result in bridge.as_completed(job_ids, timeout=2.0)]
+            await writer
+            self.assertEqual(sorted(streamed), sorted(job_ids))
+            self.assertEqual((await single).job_id, job_ids[0])
+
+            with self.assertRaises(TimeoutError):
+                await bridge.wait_for_result("missing", timeout=0.05)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            asyncio.run(scenario(Path(temp_dir)))
+
+    def test_watcher_failure_reaches_waiters_and_restarts(self):
+        async def scenario(base: Path):
+            bridge = AsyncRenderBridge(base_dir=base, poll_interval=0.01)
+            broken = OSError(errno.EIO, "output dir unreadable")
+            with mock.patch.object(bridge.bridge, "_scan_completed", side_effect=broken):
+                single = asyncio.create_task(bridge.wait_for_result("job1", timeout=5.0))
+                with self.assertRaises(OSError):
+                    async for _ in bridge.as_completed(["job1", "job2"], timeout=5.0):
+                        pass
+                with self.assertRaises(OSError):
+                    await single
+            self.assertEqual(bridge._waiters, {})
+
+            RenderResult(job_id="job1", status=JobStatus.COMPLETE.value).save(
+                bridge.bridge.output_dir / "job1.result.json"
+            )
+            self.assertEqual((await bridge.wait_for_result("job1", timeout=2.0)).job_id, "job1")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            asyncio.run(scenario(Path(temp_dir)))
+
+
+class BatchSubmissionTests(unittest.TestCase):
+    def test_submit_batch_writes_single_manifest(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir), poll_interval=0.01)
+            jobs = [RenderJob(blend_file=f"/tmp/{i}.blend") for i in range(5)]
+            handle = bridge.submit_batch(jobs, batch_id="batch-test")
+
+            entries = list(bridge.queue_dir.iterdir())
+            self.assertEqual([e.name for e in entries], ["batch-test.batch"])
+            manifest = RenderBatch.load(entries[0])
+            self.assertEqual(manifest.job_ids, handle.job_ids)
+            self.assertEqual(sorted(bridge.list_pending_jobs()), sorted(handle.job_ids))
+
+            self.assertEqual(handle.progress(), (0, 5))
+            for job in jobs[:2]:
+                RenderResult(job_id=job.job_id, status=JobStatus.COMPLETE.value).save(
+                    bridge.output_dir / f"{job.job_id}.result.json"
+                )
+            self.assertEqual(handle.progress(), (2, 5))
+            self.assertEqual(set(handle.results()), {jobs[0].job_id, jobs[1].job_id})
+
+            for job in jobs[2:]:
+                RenderResult(job_id=job.job_id, status=JobStatus.FAILED.value).save(
+                    bridge.output_dir / f"{job.job_id}.result.json"
+                )
+            results = handle.wait(timeout=1.0)
+            self.assertEqual(len(results), 5)
+            self.assertEqual(len(handle.failed()), 3)
+
+
+class AtomicWriteTests(unittest.TestCase):
+    def test_job_and_result_saves_leave_no_temp_files(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir))
+            bridge.submit_job(RenderJob(blend_file="/tmp/a.blend", job_id="atomic"))
+            RenderResult(job_id="atomic", status=JobStatus.COMPLETE.value).save(
+                bridge.output_dir / "atomic.result.json"
+            )
+            self.assertEqual([p.name for p in bridge.queue_dir.iterdir()], ["atomic.json"])
+            self.assertEqual([p.name for p in bridge.output_dir.iterdir()], ["atomic.result.json"])
+
+    def test_get_result_does_not_sleep_on_partial_legacy_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir))
+            (bridge.output_dir / "torn.result.json").write_text('{"job_id": "torn", "sta')
+
+            start = time.time()
+            self.assertIsNone(bridge.get_result("torn"))
+            self.assertLess(time.time() - start, 0.1)
+            self.assertIsNone(bridge.get_result("absent"))
+
+
+class PublishTests(unittest.TestCase):
+    def test_same_device_publish_does_not_copy(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            srcs = []
+            for name in ("front", "back", "top"):
+                (base / "job").mkdir(exist_ok=True)
+                (base / "job" / f"{name}.png").write_bytes(name.encode())
+                srcs.append(base / "job" / f"{name}.png")
+            (base / "out").mkdir()
+            (base / "out" / "crate_front.png").write_bytes(b"old")
+
+            pairs = [(src, base / "out" / f"crate_{src.stem}.png") for src in srcs]
+            self.assertEqual(fileio.publish_files(pairs, move=True), ["moved"] * 3)
+            self.assertFalse(any(src.exists() for src in srcs))
+            self.assertEqual((base / "out" / "crate_front.png").read_bytes(), b"front")
+
+            method = fileio.publish_file(base / "out" / "crate_top.png", base / "again.png")
+            self.assertIn(method, ("reflinked", "linked"))
+            self.assertEqual((base / "again.png").read_bytes(), b"top")
+            self.assertTrue((base / "out" / "crate_top.png").exists())
+
+    def test_cross_device_falls_back_to_copy(self):
+        cross_device = OSError(errno.EXDEV, "Invalid cross-device link")
+        real_replace = os.replace
+
+        def replace(src, dst):
+            if not Path(src).name.startswith("."):
+                raise cross_device  # the rename of src itself, not of the temp file
+            real_replace(src, dst)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            src, dst = Path(temp_dir) / "front.png", Path(temp_dir) / "out" / "front.png"
+            src.write_bytes(b"pixels")
+            with mock.patch.object(fileio.os, "replace", replace), \
+                    mock.patch.object(fileio.os, "link", side_effect=cross_device), \
+                    mock.patch.object(fileio, "_reflink", return_value=False):
+                self.assertEqual(fileio.publish_file(src, dst, move=True), "copied")
+            self.assertEqual(dst.read_bytes(), b"pixels")
+            self.assertEqual([p.name for p in dst.parent.iterdir()], ["front.png"])
+
+
+class RenderCacheTests(unittest.TestCase):
+    def _rendered_job(self, bridge, blend: Path, job_id: str) -> RenderJob:
+        job = RenderJob(blend_file=str(blend), job_id=job_id, generate_previews=True)
+        job_dir = bridge.output_dir / job_id
+        job_dir.mkdir()
+        (job_dir / f"{job_id}.glb").write_bytes(b"glb")
+        (job_dir / "front.png").write_bytes(b"png")
+        result = RenderResult(
+            job_id=job_id,
+            status=JobStatus.COMPLETE.value,
+            output_files=[f"{job_id}/{job_id}.glb"],
+            preview_files=[f"{job_id}/front.png"],
+        )
+        self.assertTrue(bridge.cache.store(job, result, bridge.output_dir))
+        return job
+
+    def test_render_blend_served_from_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            blend = base / "asset.blend"
+            blend.write_bytes(b"blend-v1")
+            bridge = bridge_module.RenderBridge(base_dir=base, cache=RenderCache(base / "cache"))
+            self._rendered_job(bridge, blend, "first")
+
+            result = bridge.render_blend(str(blend), generate_previews=True,
+                                         render_engine="BLENDER_EEVEE", timeout=0.01)
+            self.assertTrue(result.success)
+            self.assertEqual(bridge.list_pending_jobs(), [])
+
+    def test_cache_hit_materializes_outputs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            blend = base / "asset.blend"
+            blend.write_bytes(b"blend-v1")
+            bridge = bridge_module.RenderBridge(base_dir=base, cache=RenderCache(base / "cache"))
+            job = self._rendered_job(bridge, blend, "first")
+
+            repeat = RenderJob(**{**job.normalized(), "job_id": "second"})
+            result = bridge._run_job(repeat, timeout=0.01)
+            self.assertEqual(result.output_files, ["second/second.glb"])
+            self.assertEqual(result.preview_files, ["second/front.png"])
+            self.assertEqual((bridge.output_dir / "second" / "front.png").read_bytes(), b"png")
+            self.assertEqual(bridge.list_pending_jobs(), [])
+            self.assertEqual(bridge.cache.stats()["hits"], 1)
+
+            blend.write_bytes(b"blend-v2")  # content change -> new key
+            self.assertIsNone(bridge.cache.lookup(RenderJob(**{**job.normalized(), "job_id": "third"}),
+                                                  bridge.output_dir))
+
+    def test_failed_materialization_is_a_miss(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            blend = base / "asset.blend"
+            blend.write_bytes(b"blend-v1")
+            bridge = bridge_module.RenderBridge(base_dir=base, cache=RenderCache(base / "cache"))
+            job = self._rendered_job(bridge, blend, "first")
+
+            repeat = RenderJob(**{**job.normalized(), "job_id": "second"})
+            with mock.patch.object(cache_module, "link_or_copy", side_effect=OSError("evicted")):
+                self.assertIsNone(bridge.cache.lookup(repeat, bridge.output_dir))
+            stats = bridge.cache.stats()
+            self.assertEqual((stats["hits"], stats["misses"]), (0, 1))
+
+    def test_digest_memo_is_bounded(self):
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                mock.patch.object(cache_module, "DIGEST_MEMO_SIZE", 2), \
+                mock.patch.object(cache_module, "_digest_memo", cache_module.OrderedDict()):
+            for i in range(5):
+                path = Path(temp_dir) / f"{i}.blend"
+                path.write_bytes(str(i).encode())
+                cache_module.file_digest(path)
+            self.assertEqual(len(cache_module._digest_memo), 2)
+
+    def test_cache_evicts_least_recently_used(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = RenderCache(Path(temp_dir), max_bytes=10)
+            src = Path(temp_dir) / "out.bin"
+            src.write_bytes(b"123456")
+            cache.put("aa01", {"out.bin": src}, {})
+            cache.put("bb02", {"out.bin": src}, {})
+            self.assertIsNone(cache.get("aa01"))
+            self.assertIsNotNone(cache.get("bb02"))
+            self.assertEqual(cache.stats()["evictions"], 1)
+
+
+class GodotRenderCacheTests(unittest.TestCase):
+    def test_repeat_biome_showcase_served_from_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            bridge = godot_bridge.GodotRenderBridge(
+                timeout=1.0, poll_interval=0.01, base_dir=base,
+                cache=RenderCache(base / "godot-cache"), asset_revision="rev1",
+            )
+            job = godot_bridge.GodotRenderJob.biome_showcase(biome="forest", seed=7)
+            (bridge.output_dir / f"{job.job_id}.png").write_bytes(b"png")
+            (bridge.output_dir / f"{job.job_id}_result.json").write_text(
+                json.dumps({"status": "success", "render_time_seconds": 3.5})
+            )
+            first = bridge._run_job(job)
+            self.assertEqual(first.status, "success")
+
+            repeat = bridge.render_biome_showcase(biome="forest", seed=7)
+            self.assertEqual(repeat.status, "success")
+            self.assertNotEqual(repeat.job_id, job.job_id)
+            self.assertEqual(repeat.output_file.read_bytes(), b"png")
+            self.assertEqual(repeat.render_time_seconds, 3.5)
+            self.assertEqual(bridge.list_pending_jobs(), [job.job_id])
+            self.assertEqual(bridge.cache_stats()["hits"], 1)
+
+            bridge.asset_revision = "rev2"  # asset change -> miss
+            self.assertIsNone(bridge.cache.get(bridge._cache_key(job)))
+
+    def test_cache_expires_by_age(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache = RenderCache(Path(temp_dir), max_age_seconds=0.0)
+            src = Path(temp_dir) / "out.png"
+            src.write_bytes(b"png")
+            cache.put("cc03", {"out.png": src}, {})
+            self.assertIsNone(cache.get("cc03"))
+            self.assertEqual(cache.stats()["entries"], 0)
+
+
+class CoalescingTests(unittest.TestCase):
+    def test_identical_concurrent_jobs_share_one_submission(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            bridges = [
+                bridge_module.RenderBridge(base_dir=base, poll_interval=0.01, coalesce=True)
+                for _ in range(3)
+            ]
+            results = []
+            threads = [
+                threading.Thread(target=lambda b=b: results.append(
+                    b.render_blend("/tmp/shared.blend", generate_previews=True, timeout=5.0)))
+                for b in bridges
+            ]
+            for thread in threads:
+                thread.start()
+
+            queue_dir, output_dir = bridges[0].queue_dir, bridges[0].output_dir
+            deadline = time.time() + 5.0
+            # Wait until all three callers hold a ref on the shared job
+            while len(list((queue_dir / "_inflight").glob("*.ref"))) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+            submitted = [p.stem for p in queue_dir.glob("*.json")]
+            self.assertEqual(len(submitted), 1)
+            (output_dir / submitted[0]).mkdir()
+            RenderResult(job_id=submitted[0], status=JobStatus.COMPLETE.value).save(
+                output_dir / f"{submitted[0]}.result.json"
+            )
+            for thread in threads:
+                thread.join()
+
+            self.assertEqual({r.job_id for r in results}, {submitted[0]})
+            for bridge in bridges[:2]:
+                bridge.cleanup_job(submitted[0])
+                self.assertTrue((output_dir / submitted[0]).exists())
+            bridges[2].cleanup_job(submitted[0])
+            self.assertFalse((output_dir / submitted[0]).exists())
+
+    def test_marker_staleness_uses_the_leaders_timeout(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            registry = InflightRegistry(Path(temp_dir), stale_after=1.0)
+            self.assertEqual(registry.claim("key", "leader", stale_after=600.0)[::2], ("leader", True))
+            old = time.time() - 60
+            os.utime(Path(temp_dir) / "key.inflight", (old, old))
+            self.assertEqual(registry.claim("key", "follower")[::2], ("leader", False))
+
+            registry.complete("key", "leader")
+            self.assertEqual(registry.claim("key", "short", stale_after=1.0)[::2], ("short", True))
+            os.utime(Path(temp_dir) / "key.inflight", (old, old))
+            self.assertEqual(registry.claim("key", "next")[::2], ("next", True))
+
+    def test_cleanup_older_than_prunes_abandoned_refs(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir), coalesce=True)
+            registry = bridge.inflight
+            registry.add_ref("abandoned")
+            registry.add_ref("live")
+            old = time.time() - 3600
+            for ref in registry.directory.glob("abandoned.*.ref"):
+                os.utime(ref, (old, old))
+            result_file = bridge.output_dir / "abandoned.result.json"
+            RenderResult(job_id="abandoned", status=JobStatus.COMPLETE.value).save(result_file)
+            (bridge.output_dir / "abandoned").mkdir()
+            os.utime(result_file, (old, old))
+
+            self.assertEqual(bridge.cleanup_older_than(600), ["abandoned"])
+            self.assertFalse(result_file.exists())
+            self.assertFalse((bridge.output_dir / "abandoned").exists())
+            self.assertFalse(registry.has_refs("abandoned"))
+            self.assertTrue(registry.has_refs("live"))
+
+    def test_follower_timeout_releases_its_ref(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            leader = bridge_module.RenderBridge(base_dir=base, poll_interval=0.01, coalesce=True)
+            follower = bridge_module.RenderBridge(base_dir=base, poll_interval=0.01, coalesce=True)
+            job = RenderJob(blend_file="/tmp/shared.blend", job_id="lead")
+            leader.inflight.claim(job.fingerprint(), "lead", stale_after=60.0)
+            with self.assertRaises(TimeoutError):
+                follower._run_coalesced(RenderJob(**{**job.normalized(), "job_id": "mine"}), timeout=0.05)
+            self.assertEqual(follower._inflight_refs, {})
+            self.assertEqual(len(list(leader.inflight.directory.glob("lead.*.ref"))), 1)
+
+
+class PrioritySchedulingTests(unittest.TestCase):
+    def test_queue_filename_round_trip(self):
+        self.assertEqual(queue_filename("abc"), "abc.json")
+        self.assertEqual(queue_filename("abc", "bulk"), "abc.bulk.json")
+        self.assertEqual(parse_queue_filename("abc.interactive.json"), ("abc", "interactive"))
+        self.assertEqual(parse_queue_filename("abc.json"), ("abc", "normal"))
+        self.assertIsNone(parse_queue_filename(".abc.json.1234.tmp"))
+        with self.assertRaises(ValueError):
+            queue_filename("abc", "urgent")
+
+    def test_bridges_encode_priority_in_queue_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            bridge = bridge_module.RenderBridge(base_dir=base)
+            bridge.submit_job(RenderJob(blend_file="/tmp/a.blend", job_id="bulk1", priority="bulk"))
+            self.assertTrue((bridge.queue_dir / "bulk1.bulk.json").exists())
+            self.assertEqual(bridge.list_pending_jobs(), ["bulk1"])
+            bridge.cleanup_job("bulk1")
+            self.assertEqual(bridge.list_pending_jobs(), [])
+
+            godot = godot_bridge.GodotRenderBridge(base_dir=base)
+            job_id = godot.submit_single_asset("res://a.glb", "test", priority="interactive")
+            self.assertTrue((godot.queue_dir / f"{job_id}.interactive.json").exists())
+            self.assertEqual(godot.list_pending_jobs(), [job_id])
+
+    def test_scheduler_orders_by_priority_with_aging(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            queue_dir = Path(temp_dir) / "render-queue"
+            queue_dir.mkdir()
+            now = time.time()
+            for job_id, priority, age in [("old_bulk", "bulk", 300), ("new_bulk", "bulk", 0),
+                                          ("normal", "normal", 10), ("click", "interactive", 0)]:
+                path = queue_dir / queue_filename(job_id, priority)
+                path.write_text("{}")
+                os.utime(path, (now - age, now - age))
+
+            scheduler = QueueScheduler(queue_dir, aging_seconds=120)
+            self.assertEqual(scheduler.lock_dir, Path(temp_dir) / "render-locks")
+            order = [job.job_id for job in scheduler.ordered(now=now)]
+            # old_bulk waited 2.5 aging periods -> promoted to interactive class
+            self.assertEqual(order, ["old_bulk", "click", "normal", "new_bulk"])
+
+            claimed = scheduler.claim_next(limit=2)
+            self.assertEqual([job.job_id for job in claimed], ["old_bulk", "click"])
+            self.assertEqual([job.job_id for job in scheduler.claim_next(limit=5)], ["normal", "new_bulk"])
+            scheduler.release("click")
+            self.assertEqual([job.job_id for job in scheduler.claim_next()], ["click"])
+
+
+class JobIndexTests(unittest.TestCase):
+    def _complete(self, bridge, job_id, age=0.0):
+        result_file = bridge.output_dir / f"{job_id}.result.json"
+        RenderResult(job_id=job_id, status=JobStatus.COMPLETE.value).save(result_file)
+        stamp = time.time() - age
+        os.utime(result_file, (stamp, stamp))
+        for path in bridge.queue_dir.glob(f"{job_id}*.json"):
+            path.unlink()
+
+    def test_index_tracks_submit_complete_cleanup(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            index = JobIndex(base / "temp" / "render-index.sqlite")
+            bridge = bridge_module.RenderBridge(base_dir=base, index=index)
+            bridge.submit_job(RenderJob(blend_file="/tmp/a.blend", job_id="one"))
+            bridge.submit_batch([RenderJob(blend_file="/tmp/a.blend", job_id=f"b{i}") for i in range(2)])
+            self.assertEqual(sorted(bridge.list_pending_jobs()), ["b0", "b1", "one"])
+
+            self._complete(bridge, "one", age=7200)
+            self._complete(bridge, "b0")
+            self.assertEqual(bridge.list_pending_jobs(), ["b1"])
+            self.assertEqual(bridge.list_completed_jobs(), ["one", "b0"])
+
+            self.assertEqual(bridge.cleanup_older_than(3600), ["one"])
+            self.assertFalse((bridge.output_dir / "one.result.json").exists())
+            self.assertIsNone(index.state("one"))
+            self.assertEqual(index.state("b0"), "complete")
+
+    def test_new_index_is_rebuilt_from_directories(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            plain = bridge_module.RenderBridge(base_dir=base)
+            plain.submit_job(RenderJob(blend_file="/tmp/a.blend", job_id="queued", priority="bulk"))
+            plain.submit_job(RenderJob(blend_file="/tmp/a.blend", job_id="done"))
+            self._complete(plain, "done")
+
+            index = JobIndex(base / "temp" / "render-index.sqlite")
+            self.assertTrue(index.created)
+            indexed = bridge_module.RenderBridge(base_dir=base, index=index)
+            self.assertFalse(index.created)
+            self.assertEqual(indexed.list_pending_jobs(), ["queued"])
+            self.assertEqual(indexed.list_completed_jobs(), ["done"])
+
+            # Reopening an existing index doesn't rescan
+            self.assertFalse(JobIndex(index.path).created)
+
+    def test_corrupt_index_is_recreated(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "render-index.sqlite"
+            path.write_bytes(b"not a database" * 100)
+            index = JobIndex(path)
+            self.assertTrue(index.created)
+            self.assertEqual(len(index), 0)
+
+
+class PhaseMetricsTests(unittest.TestCase):
+    def test_phase_durations(self):
+        stamps = {"submitted": 100.0, "claimed": 101.0, "process_started": 101.5,
+                  "render_finished": 104.5, "result_written": 104.6, "observed": 105.0}
+        durations = phase_durations(stamps)
+        self.assertAlmostEqual(durations["queue_wait"], 1.0)
+        self.assertAlmostEqual(durations["render"], 3.0)
+        self.assertAlmostEqual(durations["pickup"], 0.4)
+        self.assertAlmostEqual(durations["total"], 5.0)
+        self.assertEqual(phase_durations({"claimed": 1.0}), {})
+
+    def test_bridge_records_phases_and_exports_prometheus_text(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            metrics = RenderMetrics()
+            bridge = bridge_module.RenderBridge(base_dir=base, timeout=5, poll_interval=0.01, metrics=metrics)
+            job = RenderJob(blend_file="/tmp/a.blend", job_id="timed")
+            bridge.submit_job(job)
+            self.assertIsNotNone(RenderJob.load(bridge.queue_dir / "timed.json").submitted_at)
+
+            stamps = {"submitted": job.submitted_at, "claimed": job.submitted_at + 0.2,
+                      "process_started": job.submitted_at + 0.3, "render_finished": job.submitted_at + 2.3,
+                      "result_written": job.submitted_at + 2.4}
+            RenderResult(job_id="timed", status=JobStatus.COMPLETE.value, timestamps=stamps).save(
+                bridge.output_dir / "timed.result.json")
+            result = bridge.wait_for_result("timed")
+            self.assertIn("observed", result.timestamps)
+
+            text = metrics.render()
+            self.assertIn('render_bridge_jobs_total{bridge="blender",status="complete"} 1', text)
+            self.assertIn('render_bridge_phase_seconds_bucket{bridge="blender",phase="render",le="2.5"} 1', text)
+            self.assertIn('render_bridge_phase_seconds_bucket{bridge="blender",phase="render",le="1.0"} 0', text)
+            self.assertIn('render_bridge_phase_seconds_count{bridge="blender",phase="total"} 1', text)
+
+            textfile = base / "render_bridge.prom"
+            metrics.write_textfile(textfile)
+            self.assertEqual(textfile.read_text(), metrics.render())
+
+    def test_godot_timeout_is_counted(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            metrics = RenderMetrics()
+            bridge = godot_bridge.GodotRenderBridge(
+                base_dir=Path(temp_dir), timeout=0.05, poll_interval=0.01, use_inotify=False, metrics=metrics
+            )
+            self.assertEqual(bridge.wait_for_result("never").status, "timeout")
+            self.assertIn('render_bridge_jobs_total{bridge="godot",status="timeout"} 1', metrics.render())
+
+
+class EventStreamTests(unittest.TestCase):
+    def test_emit_without_subscribers_is_a_no_op(self):
+        bus = EventBus()
+        self.assertFalse(bus.wants(ev.SUBMIT))
+        self.assertFalse(bus.emit(ev.SUBMIT, "job1"))
+
+        seen = []
+        bus.on_complete(seen.append)
+        self.assertFalse(bus.emit(ev.SUBMIT, "job1"))
+        self.assertTrue(bus.emit(ev.COMPLETE, "job1", status="complete"))
+        self.assertEqual([(e.name, e.job_id, e.data) for e in seen], [("complete", "job1", {"status": "complete"})])
+
+        bus.unsubscribe(seen.append)
+        self.assertFalse(bus.wants(ev.COMPLETE))
+
+    def test_failing_subscriber_does_not_break_emit(self):
+        bus = EventBus()
+        log = EventLog()
+        bus.subscribe(lambda e: 1 / 0, ev.SUBMIT)
+        bus.subscribe(log)
+        with contextlib.redirect_stderr(io.StringIO()):
+            bus.emit(ev.SUBMIT, "job1")
+        self.assertEqual(len(log), 1)
+
+    def test_bridge_emits_events_instead_of_printing(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            jsonl = base / "events.jsonl"
+            log = EventLog(capacity=2, path=jsonl)
+            bridge = bridge_module.RenderBridge(base_dir=base, timeout=0.05, poll_interval=0.01)
+            bridge.events.subscribe(log)
+
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                bridge.submit_job(RenderJob(blend_file="/tmp/a.blend", job_id="e1"))
+                bridge.submit_batch([RenderJob(blend_file="/tmp/a.blend", job_id="e2")], batch_id="batch-e")
+                with self.assertRaises(TimeoutError):
+                    bridge.wait_for_result("e1", timeout=0.05)
+            self.assertEqual(stdout.getvalue(), "")
+
+            # Ring buffer keeps the newest events; the file has all of them
+            self.assertEqual([e.name for e in log.events()], [ev.SUBMIT_BATCH, ev.TIMEOUT])
+            lines = [json.loads(line) for line in jsonl.read_text().splitlines()]
+            self.assertEqual([line["event"] for line in lines], [ev.SUBMIT, ev.SUBMIT_BATCH, ev.TIMEOUT])
+            self.assertEqual(lines[0]["job_id"], "e1")
+            self.assertEqual(lines[1]["batch_id"], "batch-e")
+
+
+class DiagnosticsOutputTests(unittest.TestCase):
+    def test_reads_per_job_diagnostics_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir))
+            job_dir = bridge.output_dir / "diag1"
+            job_dir.mkdir()
+            (job_dir / DIAGNOSTICS_FILE_NAME).write_text(json.dumps({"status": "ok", "issues": []}))
+            # A log block for the same job is ignored when the file exists
+            (bridge.output_dir.parent / "render-watcher.log").write_text(
+                '=== DIAGNOSTIC_JSON_START diag1 ===\n{"status": "error"}\n=== DIAGNOSTIC_JSON_END diag1 ===\n')
+
+            self.assertEqual(bridge.read_diagnostics("diag1"), {"status": "ok", "issues": []})
+
+    def test_log_fallback_only_matches_own_job_in_tail(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir))
+            log_file = bridge.output_dir.parent / "render-watcher.log"
+
+            def block(job_id, status):
+                return (f"=== DIAGNOSTIC_JSON_START {job_id} ===\n"
+                        f'{{"status": "{status}"}}\n'
+                        f"=== DIAGNOSTIC_JSON_END {job_id} ===\n")
+
+            with open(log_file, "w") as f:
+                f.write(block("old", "ok"))
+                f.write("x" * (2 * 1024 * 1024) + "\n")  # pushed out of the tail window
+                f.write(block("mine", "ok"))
+                f.write(block("other", "error"))
+
+            self.assertEqual(bridge.read_diagnostics("mine"), {"status": "ok"})
+            self.assertEqual(bridge.read_diagnostics("old")["status"], "error")
+            self.assertEqual(bridge.read_diagnostics("missing")["issues"], ["Could not read diagnostic output"])
+
+    def test_diagnose_many_streams_per_file_results(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir), poll_interval=0.02)
+            blend_files = ["/tmp/a.blend", "/tmp/b.blend", "/tmp/c.blend"]
+
+            def watcher():
+                # Stand-in for one Blender session that crashes on the last file
+                while not list(bridge.queue_dir.glob("*.json")):
+                    time.sleep(0.01)
+                queue_file = next(bridge.queue_dir.glob("*.json"))
+                job = RenderJob.load(queue_file)
+                list_file = Path(job.script_args[job.script_args.index("--blend-files") + 1])
+                self.assertEqual(list_file.read_text().split(), blend_files)
+                results_dir = bridge.output_dir / job.job_id / "diagnostics"
+                for i, blend_file in enumerate(blend_files[:2]):
+                    (results_dir / f"{i:05d}.json").write_text(
+                        json.dumps({"status": "ok", "blend_file": blend_file}))
+                    time.sleep(0.05)
+                RenderResult(job_id=job.job_id, status=JobStatus.FAILED.value,
+                             error_message="Blender crashed").save(
+                    bridge.output_dir / f"{job.job_id}.result.json")
+                queue_file.unlink()
+
+            thread = threading.Thread(target=watcher)
+            thread.start()
+            streamed = []
+            results = bridge.diagnose_many(blend_files, timeout=5, on_result=lambda f, r: streamed.append(f))
+            thread.join()
+
+            self.assertEqual(streamed, blend_files)
+            self.assertEqual(results["/tmp/a.blend"]["status"], "ok")
+            self.assertEqual(results["/tmp/b.blend"]["blend_file"], "/tmp/b.blend")
+            self.assertEqual(results["/tmp/c.blend"]["status"], "error")
+            self.assertIn("Blender crashed", results["/tmp/c.blend"]["issues"][0])
+            self.assertEqual(list(bridge.queue_dir.glob("_diagnostic_*")), [])
+
+
+class DiagnosticScriptTests(unittest.TestCase):
+    def test_script_compiles(self):
+        compile(DIAGNOSTIC_SCRIPT, "diagnostic_script.py", "exec")
+
+    @unittest.skipUnless(numpy, "numpy not installed")
+    def test_deformation_stats_cover_every_vertex(self):
+        namespace = {}
+        exec(DEFORMATION_STATS_SOURCE, namespace)
+
+        # Six vertices; only the "leg" group (4, 5) moves, by 0.5 then 2.0
+        rest = numpy.zeros((6, 3), dtype=numpy.float32)
+        coords = numpy.stack([rest, rest.copy(), rest.copy()])
+        coords[1, 4:, 2] = 0.5
+        coords[2, 4:, 2] = 2.0
+        # World matrix doubles and offsets every frame alike
+        matrix = numpy.diag([2.0, 2.0, 2.0, 1.0]).astype(numpy.float32)
+        matrix[:3, 3] = (1.0, 0.0, 0.0)
+        matrices = numpy.stack([matrix] * 3)
+
+        stats, world = namespace["deformation_stats"](
+            coords, matrices, {"torso": [0, 1, 2, 3], "leg": [4, 5], "empty": []})
+
+        self.assertEqual(world.shape, (3, 6, 3))
+        self.assertEqual(world[0, 0].tolist(), [1.0, 0.0, 0.0])
+        self.assertEqual(stats["vertex_count"], 6)
+        self.assertEqual(stats["vertices_moved_count"], 2)
+        self.assertAlmostEqual(stats["max_displacement"], 4.0)
+        self.assertEqual(stats["vertex_groups"]["torso"]["max_displacement"], 0.0)
+        self.assertAlmostEqual(stats["vertex_groups"]["leg"]["mean_displacement"], 4.0)
+        self.assertNotIn("empty", stats["vertex_groups"])
+
+
+class DiagnosticsCacheTests(unittest.TestCase):
+    def _serve(self, bridge, stop, dispatched):
+        # Stand-in watcher answering diagnostic jobs, recording the files each one got
+        while not stop.is_set():
+            for queue_file in list(bridge.queue_dir.glob("*.json")):
+                job = RenderJob.load(queue_file)
+                job_dir = bridge.output_dir / job.job_id
+                if "--blend-files" in job.script_args:
+                    list_file = Path(job.script_args[job.script_args.index("--blend-files") + 1])
+                    files = list_file.read_text().split()
+                    for i, blend_file in enumerate(files):
+                        (job_dir / "diagnostics" / f"{i:05d}.json").write_text(
+                            json.dumps({"status": "ok", "blend_file": blend_file}))
+                else:
+                    files = [job.blend_file]
+                    job_dir.mkdir(parents=True, exist_ok=True)
+                    (job_dir / DIAGNOSTICS_FILE_NAME).write_text(json.dumps({"status": "ok"}))
+                dispatched.append(files)
+                RenderResult(job_id=job.job_id, status=JobStatus.COMPLETE.value).save(
+                    bridge.output_dir / f"{job.job_id}.result.json")
+                queue_file.unlink()
+            time.sleep(0.01)
+
+    def test_unchanged_files_are_answered_locally(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            bridge = bridge_module.RenderBridge(
+                base_dir=base, poll_interval=0.02, cache=RenderCache(base / "cache"))
+            a, b = str(base / "a.blend"), str(base / "b.blend")
+            Path(a).write_bytes(b"rig a")
+            Path(b).write_bytes(b"rig b")
+
+            stop, dispatched = threading.Event(), []
+            thread = threading.Thread(target=self._serve, args=(bridge, stop, dispatched))
+            thread.start()
+            try:
+                self.assertEqual(bridge.stale_diagnostics([a, b]), [a, b])
+                self.assertEqual(sorted(bridge.diagnose_many([a, b], timeout=5)), [a, b])
+                self.assertEqual(bridge.stale_diagnostics([a, b]), [])
+
+                Path(b).write_bytes(b"rig b, edited")
+                self.assertEqual(bridge.stale_diagnostics([a, b]), [b])
+                results = bridge.diagnose_many([a, b], timeout=5)
+                self.assertEqual(results[a], {"status": "ok", "blend_file": a})
+
+                self.assertEqual(bridge.diagnose_blend(a, timeout=5)["status"], "ok")
+                # Another sample count is a different diagnosis
+                self.assertEqual(bridge.diagnose_blend(a, timeout=5, sample_frames=9), {"status": "ok"})
+            finally:
+                stop.set()
+                thread.join()
+
+            self.assertEqual(dispatched, [[a, b], [b], [a]])
+            self.assertEqual(bridge.stale_diagnostics([a, b], sample_frames=9), [b])
+
+    def test_missing_output_is_not_cached(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            bridge = bridge_module.RenderBridge(
+                base_dir=base, poll_interval=0.02, cache=RenderCache(base / "cache"))
+            blend_file = base / "a.blend"
+            blend_file.write_bytes(b"rig")
+
+            def watcher():
+                while not list(bridge.queue_dir.glob("*.json")):
+                    time.sleep(0.01)
+                queue_file = next(bridge.queue_dir.glob("*.json"))
+                job = RenderJob.load(queue_file)
+                RenderResult(job_id=job.job_id, status=JobStatus.COMPLETE.value).save(
+                    bridge.output_dir / f"{job.job_id}.result.json")
+                queue_file.unlink()
+
+            thread = threading.Thread(target=watcher)
+            thread.start()
+            results = bridge.diagnose_many([str(blend_file)], timeout=5)
+            thread.join()
+
+            self.assertEqual(results[str(blend_file)]["status"], "error")
+            self.assertEqual(bridge.stale_diagnostics([str(blend_file)]), [str(blend_file)])
+
+
+class ChunkedAnimationTests(unittest.TestCase):
+    def test_split_frames_covers_range_per_angle(self):
+        job = RenderJob(blend_file="/tmp/walk.blend", render_animation=True,
+                        animation_angles=["front", "side"], output_format="glb")
+        subs = job.split_frames(1, 10, 3)
+        self.assertEqual([(s.animation_angles, s.frame_start, s.frame_end) for s in subs], [
+            (["front"], 1, 4), (["front"], 5, 7), (["front"], 8, 10),
+            (["side"], 1, 4), (["side"], 5, 7), (["side"], 8, 10),
+        ])
+        self.assertEqual([s.output_format for s in subs], ["glb"] + ["blend"] * 5)
+        self.assertEqual(len({s.job_id for s in subs}), 6)
+        # Never more chunks than frames
+        self.assertEqual(len(job.split_frames(0, 1, 8)), 4)
+
+    def test_timeout_cleans_up_sub_jobs_and_records_failure(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir), poll_interval=0.01)
+            with self.assertRaises(TimeoutError):
+                bridge.render_animation("/tmp/walk.blend", frame_start=1, frame_end=8, chunks=2, timeout=0.05)
+            self.assertEqual([p.name for p in bridge.queue_dir.iterdir()], [])
+            results = list(bridge.output_dir.glob("*.result.json"))
+            self.assertEqual(len(results), 1)
+            failed = RenderResult.load(results[0])
+            self.assertEqual(failed.status, JobStatus.FAILED.value)
+            self.assertIn("timed out", failed.error_message)
+
+
+class PreviewFanOutTests(unittest.TestCase):
+    def test_first_angle_group_is_interactive(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            bridge = bridge_module.RenderBridge(base_dir=Path(temp_dir), poll_interval=0.02)
+            previews = bridge.iter_previews("/tmp/crate.blend", ["front", "back", "top"], group_size=2, timeout=0.1)
+            with self.assertRaises(TimeoutError):
+                next(previews)
+            manifest = RenderBatch.load(next(bridge.queue_dir.glob("*.batch")))
+            self.assertEqual([job.preview_angles for job in manifest.jobs], [["front", "back"], ["top"]])
+            self.assertEqual([job.priority for job in manifest.jobs], ["interactive", "normal"])
+            self.assertTrue(all(job.generate_previews and job.output_format == "blend" for job in manifest.jobs))
+
+
+@unittest.skipUnless(numpy, "numpy not installed")
+class FrameArrayTests(unittest.TestCase):
+    def _write_segment(self, frames_dir, start, frames):
+        stem = frames_dir / frames_module.raw_segment_stem(start, start + len(frames) - 1)
+        frames_dir.mkdir(parents=True, exist_ok=True)
+        stem.with_suffix(".rgba").write_bytes(frames.tobytes())
+        stem.with_suffix(".json").write_text(json.dumps({
+            "width": frames.shape[2], "height": frames.shape[1], "channels": 4,
+            "frame_start": start, "frame_end": start + len(frames) - 1}))
+
+    def test_single_segment_is_memory_mapped(self):
+        frames = numpy.arange(5 * 2 * 3 * 4, dtype=numpy.uint8).reshape(5, 2, 3, 4)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            frames_dir = Path(temp_dir) / "frames_side"
+            self._write_segment(frames_dir, 1, frames)
+            loaded, start, end = frames_module.load_frames(frames_dir, 2, 4)
+            self.assertIsInstance(loaded, numpy.memmap)
+            self.assertEqual((start, end), (2, 4))
+            numpy.testing.assert_array_equal(loaded, frames[1:4])
+
+    def test_chunk_segments_fill_one_preallocated_array(self):
+        frames = numpy.random.default_rng(0).integers(0, 255, (6, 2, 2, 4), dtype=numpy.uint8)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            frames_dir = Path(temp_dir) / "frames_side"
+            self._write_segment(frames_dir, 0, frames[:4])
+            self._write_segment(frames_dir, 4, frames[4:])
+            out = numpy.zeros_like(frames)
+            loaded, start, end = frames_module.load_frames(frames_dir, out=out)
+            self.assertIs(loaded, out)
+            self.assertEqual((start, end), (0, 5))
+            numpy.testing.assert_array_equal(out, frames)
+            with self.assertRaises(FileNotFoundError):
+                frames_module.load_frames(frames_dir, 0, 6)
+
+    def test_sprite_sheet_layout_and_png(self):
+        frames = numpy.stack([numpy.full((2, 3, 4), i, dtype=numpy.uint8) for i in range(1, 6)])
+        sheet = frames_module.sprite_sheet(frames, columns=2, padding=1, background=0)
+        self.assertEqual(sheet.shape, (3 * 3 - 1, 2 * 4 - 1, 4))
+        for i, (x, y, w, h) in enumerate(frames_module.sprite_rects(5, 2, 3, columns=2, padding=1)):
+            self.assertTrue((sheet[y:y + h, x:x + w] == i + 1).all())
+        self.assertTrue((sheet[6:, 4:] == 0).all())  # empty last cell
+
+        atlas, rects = frames_module.sprite_atlas({"walk": frames, "idle": frames[:2]})
+        self.assertEqual(atlas.shape, (4, 15, 4))
+        self.assertEqual(rects["idle"], [(0, 2, 3, 2), (3, 2, 3, 2)])
+
+        png = frames_module.encode_png(sheet)
+        self.assertEqual(struct.unpack(">II", png[16:24]), (7, 8))
+        idat_length = struct.unpack(">I", png[33:37])[0]
+        rows = numpy.frombuffer(zlib.decompress(png[41:41 + idat_length]), dtype=numpy.uint8).reshape(8, -1)
+        numpy.testing.assert_array_equal(rows[:, 1:].reshape(sheet.shape), sheet)
+
+
+class PreviewManifestTests(unittest.TestCase):
+    def test_asset_missing_a_requested_angle_is_stale(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            preview_dir = Path(temp_dir) / "previews"
+            preview_dir.mkdir()
+            blend = Path(temp_dir) / "crate.blend"
+            blend.write_bytes(b"blend")
+            (preview_dir / "crate_front.png").write_bytes(b"png")
+            manifest = PreviewManifest(preview_dir)
+            manifest.record("crate", manifest.source_state(str(blend)), ["front", "back"],
+                            512, "BLENDER_EEVEE", ["crate_front.png"])
+
+            stale = lambda: manifest.stale({"crate": str(blend)}, ["front", "back"], 512, "BLENDER_EEVEE")
+            self.assertEqual(stale(), ["crate"])
+            (preview_dir / "crate_back.png").write_bytes(b"png")
+            self.assertEqual(stale(), [])
+
+
+@unittest.skipUnless(Image, "Pillow not installed")
+class ContactSheetTests(unittest.TestCase):
+    def _previews(self, job_dir, names):
+        job_dir.mkdir(parents=True, exist_ok=True)
+        for name in names:
+            (job_dir / f"{name}.png").write_bytes(fake_png(8, 8, name))
+
+    def test_labelled_grid_from_result_previews(self):
+        names = ["front", "back", "left", "right", "top"]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_dir = Path(temp_dir)
+            self._previews(output_dir / "job1", names + ["contact_sheet"])
+            result = RenderResult(job_id="job1", status="complete",
+                                  preview_files=[f"job1/{n}.png" for n in names + ["contact_sheet"]])
+            sheet = contact_sheet_module.contact_sheet_for_result(output_dir, result, columns=3, padding=1, workers=2)
+
+            pitch_y = 8 + contact_sheet_module.LABEL_HEIGHT + 1
+            self.assertEqual(sheet.size, (3 * 9 - 1, 2 * pitch_y - 1))
+            for i, name in enumerate(names):
+                expected = Image.open(output_dir / "job1" / f"{name}.png").convert("RGBA").getpixel((4, 4))
+                self.assertEqual(sheet.getpixel(((i % 3) * 9 + 4, (i // 3) * pitch_y + 4)), expected)
+            self.assertEqual(Image.open(output_dir / "job1" / "contact_sheet.png").size, sheet.size)
+
+    def test_gif_keeps_every_frame(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            frames_dir = Path(temp_dir) / "job1" / "frames_side"
+            self._previews(frames_dir, [f"frame_{i:04d}" for i in range(1, 7)])
+            result = RenderResult(job_id="job1", status="complete")
+            paths = contact_sheet_module.animation_frame_paths(temp_dir, result, "side")
+            self.assertEqual([p.name for p in paths], [f"frame_{i:04d}.png" for i in range(1, 7)])
+            gif = contact_sheet_module.build_gif(paths, Path(temp_dir) / "side.gif", workers=2)
+            with Image.open(gif) as image:
+                self.assertEqual((image.n_frames, image.size), (6, (8, 8)))
+
+
+class WatcherLivenessTests(unittest.TestCase):
+    def test_capacity_from_json_heartbeat(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            heartbeat = Path(temp_dir) / liveness.HEARTBEAT_FILE_NAME
+            liveness.write_heartbeat(heartbeat, kind="blender", version="4.2.0", gpu="RTX",
+                                     max_parallel=4, active=3)
+            status = liveness.read_heartbeat(heartbeat)
+            self.assertTrue(status.alive)
+            self.assertEqual((status.version, status.gpu, status.max_parallel, status.free_slots),
+                             ("4.2.0", "RTX", 4, 1))
+            self.assertTrue(status.has_capacity(1))
+            self.assertFalse(status.has_capacity(2))
+
+            old = time.time() - 60
+            os.utime(heartbeat, (old, old))
+            self.assertFalse(liveness.read_heartbeat(heartbeat).alive)
+            self.assertFalse(liveness.read_heartbeat(Path(temp_dir) / "missing").alive)
+
+    def test_legacy_timestamp_heartbeat_is_alive_with_unknown_capacity(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            heartbeat = Path(temp_dir) / liveness.GODOT_HEARTBEAT_FILE_NAME
+            heartbeat.write_text("\ufeff2026-01-01T12:00:00.0000000+00:00\n", encoding="utf-8")
+            status = liveness.read_heartbeat(heartbeat)
+            self.assertTrue(status.alive)
+            self.assertIsNone(status.free_slots)
+            self.assertTrue(status.has_capacity(8))
+
+    def test_status_is_cached_and_shared(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            base = Path(temp_dir)
+            bridge = bridge_module.RenderBridge(base_dir=base)
+            self.assertIs(bridge.liveness, bridge_module.RenderBridge(base_dir=base).liveness)
+            self.assertFalse(bridge.is_watcher_running())
+
+            liveness.write_heartbeat(bridge.heartbeat_file, kind="blender", max_parallel=2, active=0)
+            with mock.patch.object(liveness.WatcherLiveness, "_check", side_effect=AssertionError("not cached")):
+                self.assertFalse(bridge.is_watcher_running())
+            self.assertTrue(bridge.watcher_status(refresh=True).alive)
+
+            before = sorted(p.name for p in base.rglob("*"))
+            bridge.liveness.invalidate()
+            self.assertTrue(bridge.is_watcher_running())
+            self.assertEqual(sorted(p.name for p in base.rglob("*")), before)
+
 if __name__ == "__main__":
     unittest.main()